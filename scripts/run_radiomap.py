@@ -2,11 +2,16 @@
 """Generate radio coverage map using Sionna RT"""
 import argparse
 import json
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
 import os
-from typing import List
-from sionna.rt import load_scene, Transmitter, Receiver, PlanarArray, RadioMapSolver
+import sys
+import numpy as np
+from sionna.rt import load_scene, Transmitter, Receiver, PlanarArray, PathSolver, RadioMapSolver
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+import radio_maps
+from artifact_store import artifact_key, default_artifact_store
 
 
 def _ensure_position_list(positions):
@@ -19,110 +24,136 @@ def _ensure_position_list(positions):
     return positions
 
 
-def _positions_slug(prefix: str, positions: List[List[float]]) -> str:
-    parts = ["{}_{}_{}".format(pos[0], pos[1], pos[2]) for pos in positions]
-    return f"{prefix}{'__'.join(parts)}"
+_SCENE = None
 
 
-def generate_radio_map(tx_positions=None, rx_positions=None, metric="rss"):
-    tx_positions = _ensure_position_list(tx_positions)
-    rx_positions = _ensure_position_list(rx_positions)
+def get_scene():
+    """Scene shared by all jobs of this process, loaded on first use"""
+    global _SCENE
+    if _SCENE is None:
+        _SCENE = load_scene()
+        _SCENE.tx_array = PlanarArray(num_rows=1, num_cols=1, vertical_spacing=0.5,
+                                      horizontal_spacing=0.5, pattern="tr38901", polarization="V")
+        _SCENE.rx_array = PlanarArray(num_rows=1, num_cols=1, vertical_spacing=0.5,
+                                      horizontal_spacing=0.5, pattern="dipole", polarization="cross")
+    return _SCENE
+
 
-    scene = load_scene()
-    
-    scene.tx_array = PlanarArray(num_rows=1, num_cols=1, vertical_spacing=0.5,
-                                 horizontal_spacing=0.5, pattern="tr38901", polarization="V")
-    scene.rx_array = PlanarArray(num_rows=1, num_cols=1, vertical_spacing=0.5,
-                                 horizontal_spacing=0.5, pattern="dipole", polarization="cross")
+def _place_nodes(scene, tx_positions, rx_positions):
+    """Replace the transmitters and receivers left in ``scene`` by a previous job"""
+    for name in list(scene.transmitters) + list(scene.receivers):
+        scene.remove(name)
 
     tx_objects = []
     for idx, tx_pos in enumerate(tx_positions):
         tx = Transmitter(name=f"tx_{idx}", position=tx_pos)
         scene.add(tx)
         tx_objects.append(tx)
-    
+
     rx_objects = []
     for idx, rx_pos in enumerate(rx_positions):
         rx = Receiver(name=f"rx_{idx}", position=rx_pos)
         scene.add(rx)
         rx_objects.append(rx)
-    
+
     if rx_objects:
         for tx in tx_objects:
             tx.look_at(rx_objects[0])
-    
-    # Ensure outputs directory exists at project root
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    outputs_dir = os.path.join(project_root, 'outputs')
-    os.makedirs(outputs_dir, exist_ok=True)
-    
-    # Calculate coverage area to include all TX and RX positions
-    all_points = tx_positions + rx_positions
-    xs = [p[0] for p in all_points]
-    ys = [p[1] for p in all_points]
-    
-    min_x = min(xs) - 50
-    max_x = max(xs) + 50
-    min_y = min(ys) - 50
-    max_y = max(ys) + 50
-    
-    center_x = (min_x + max_x) / 2
-    center_y = (min_y + max_y) / 2
-    size_x = max_x - min_x
-    size_y = max_y - min_y
-    
+
+
+def _scalar(value):
+    return float(np.asarray(value).ravel()[0])
+
+
+def trace_tx_gains(tx_positions, look_at, layout, keys, solver, store=None):
+    """Trace the path gain of each transmitter over ``layout`` in one solver call and store them under ``keys``.
+
+    ``solver`` holds ``max_depth``, ``cell_size``, ``samples_per_tx`` and
+    ``seed``. Gains already stored under a key are refined: the new
+    samples are averaged in, weighted by sample count.
+    """
+    store = store or radio_maps.default_grid_store()
+    scene = get_scene()
+    # A transmitter's path gain does not depend on the others, so the
+    # missing ones of a layout share one trace
+    _place_nodes(scene, tx_positions, [look_at] if look_at is not None else [])
+
     rm_solver = RadioMapSolver()
-    rm = rm_solver(scene, max_depth=3, samples_per_tx=10**6, cell_size=(2, 2),
-                   center=[center_x, center_y, 1.5], size=[size_x, size_y], orientation=[0, 0, 0])
-    
-    rm.show(metric=metric)
-    fig = plt.gcf()
-    ax = plt.gca()
-    fig.set_size_inches(9, 6)
-
-    # Convert world coordinates (meters) into map cell coordinates so markers align with rm.show output.
-    origin_x = center_x - size_x / 2
-    origin_y = center_y - size_y / 2
-    cell_size_x, cell_size_y = 2, 2
-
-    def world_to_cell(position):
-        return (
-            (position[0] - origin_x) / cell_size_x,
-            (position[1] - origin_y) / cell_size_y,
-        )
-
-    legend_entries = []
-    for idx, tx_pos in enumerate(tx_positions):
-        tx_cell = world_to_cell(tx_pos)
-        plt.scatter(tx_cell[0], tx_cell[1], color="blue", marker="^", s=250,
-                    label=f"Transmitter {idx+1}: {tuple(tx_pos)}", edgecolors='white', linewidths=2, zorder=10)
-        legend_entries.append(f"TX{idx+1}: {tuple(tx_pos)}")
-    for idx, rx_pos in enumerate(rx_positions):
-        rx_cell = world_to_cell(rx_pos)
-        plt.scatter(rx_cell[0], rx_cell[1], color="red", marker="o", s=200,
-                    label=f"Receiver {idx+1}: {tuple(rx_pos)}", edgecolors='white', linewidths=2, zorder=10)
-        legend_entries.append(f"RX{idx+1}: {tuple(rx_pos)}")
-
-    # Replace axis labels with world coordinates (meters)
-    ax.set_xlabel("X position (m)")
-    ax.set_ylabel("Y position (m)")
-    ax.xaxis.set_major_formatter(FuncFormatter(lambda val, pos: f"{origin_x + val*cell_size_x:.0f}"))
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda val, pos: f"{origin_y + val*cell_size_y:.0f}"))
-
-    # Reserve space on the right for colorbar + legend
-    plt.subplots_adjust(right=0.7)
-    plt.legend(
-        loc="upper left",
-        bbox_to_anchor=(1.25, 1.0),
-        borderaxespad=0.0,
-        title="Nodes",
-        framealpha=0.95,
-    )
-
-    filename = f"radiomap_{metric}_{_positions_slug('tx', tx_positions)}_{_positions_slug('rx', rx_positions)}.png"
-    output_path = os.path.join(outputs_dir, filename)
-    plt.savefig(output_path)
-    plt.close()
+    rm = rm_solver(scene, max_depth=solver["max_depth"], samples_per_tx=solver["samples_per_tx"],
+                   cell_size=tuple(solver["cell_size"]), center=layout["center"], size=layout["size"],
+                   orientation=[0, 0, 0], seed=solver.get("seed", 42))
+
+    path_gain = np.asarray(rm.path_gain.numpy())
+    tx_power_dbm = _scalar(scene.get("tx_0").power_dbm)
+    noise_power = _scalar(scene.thermal_noise_power)
+    for idx, (tx_pos, key) in enumerate(zip(tx_positions, keys)):
+        gain, samples = path_gain[idx], solver["samples_per_tx"]
+        if store.has_tx(key):
+            stored_meta, stored_gain = store.load_tx(key)
+            stored = stored_meta["samples_per_tx"]
+            gain = (stored * np.asarray(stored_gain, dtype=np.float64) + samples * gain) / (stored + samples)
+            samples += stored
+        meta = dict(layout, scene=radio_maps.SCENE, max_depth=solver["max_depth"], samples_per_tx=samples,
+                    tx_position=tx_pos, look_at=look_at, tx_power_dbm=tx_power_dbm, noise_power=noise_power)
+        store.save_tx(key, meta, gain)
+    return len(keys)
+
+
+def evaluate_links(tx_positions, rx_positions, max_depth=5, samples_per_src=10**6, seed=41):
+    """Path gain and delays of every TX-RX pair from one ``PathSolver`` call.
+
+    Transmitters look at the first receiver, as in the radio maps. Returns
+    ``[num_tx, num_rx]`` arrays: ``path_gain`` (linear, summed over paths
+    and averaged over antenna pairs), ``mean_delay`` and ``delay_spread``
+    (s, power-weighted mean and RMS of the path delays, NaN without paths)
+    and ``num_paths``, plus the scene's transmit and noise power.
+    """
+    scene = get_scene()
+    _place_nodes(scene, tx_positions, rx_positions)
+    paths = PathSolver()(scene=scene, max_depth=max_depth, los=True, specular_reflection=True,
+                         diffuse_reflection=False, refraction=True, synthetic_array=True,
+                         samples_per_src=samples_per_src, seed=seed)
+    # a: [num_rx, num_rx_ant, num_tx, num_tx_ant, num_paths, 1], tau: [num_rx, num_tx, num_paths]
+    a, tau = paths.cir(normalize_delays=False, out_type="numpy")
+    power = np.mean(np.abs(a) ** 2, axis=(1, 3, 5)).transpose(1, 0, 2)
+    tau = np.asarray(tau, dtype=np.float64).transpose(1, 0, 2)
+    path_gain = power.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_delay = (power * tau).sum(axis=-1) / path_gain
+        delay_spread = np.sqrt((power * (tau - mean_delay[..., None]) ** 2).sum(axis=-1) / path_gain)
+    return {
+        "path_gain": path_gain,
+        "mean_delay": mean_delay,
+        "delay_spread": delay_spread,
+        "num_paths": np.count_nonzero(power > 0, axis=-1),
+        "tx_power_dbm": _scalar(scene.get("tx_0").power_dbm),
+        "noise_power": _scalar(scene.thermal_noise_power),
+    }
+
+
+def generate_radio_map(tx_positions=None, rx_positions=None, metric="rss", output_path=None,
+                       tx_power_dbm=None, area=None, quality=radio_maps.DEFAULT_QUALITY, max_cells=None, tiled=None):
+    tx_positions = _ensure_position_list(tx_positions)
+    rx_positions = _ensure_position_list(rx_positions)
+
+    # Only transmitters without a stored path gain are traced; metric
+    # changes and re-plots of a stored layout skip the ray tracer
+    store = radio_maps.default_grid_store()
+    key, _ = radio_maps.assemble(store, tx_positions, rx_positions,
+                                 lambda *args: trace_tx_gains(*args, store=store), tx_power_dbm, area, quality,
+                                 max_cells=max_cells, tiled=tiled)
+    meta, grids = store.load(key)
+
+    if output_path is None:
+        # Default to the artifact store in the outputs directory at project root
+        output_path = default_artifact_store().put(
+            "radiomap", artifact_key("radiomap", {"metric": metric, "grid_key": key}),
+            lambda path: radio_maps.render(meta, grids, metric, path),
+            {"metric": metric, "grid_key": key, "tx_positions": tx_positions, "rx_positions": rx_positions,
+             "tx_power_dbm": tx_power_dbm, "area": area, "quality": quality, "max_cells": max_cells, "tiled": tiled,
+             "rendered_grid_key": key})
+    else:
+        radio_maps.render(meta, grids, metric, output_path)
     print(f"Saved: {output_path}")
     return output_path
 
@@ -138,6 +169,9 @@ if __name__ == "__main__":
     parser.add_argument("metric", nargs="?", default="rss")
     parser.add_argument("legacy_args", nargs="*", help="Legacy single-TX arguments.")
     parser.add_argument("--config", help="Path to JSON config for multi-TX scenarios.")
+    parser.add_argument("--quality", default=radio_maps.DEFAULT_QUALITY, choices=list(radio_maps.QUALITY_TIERS))
+    parser.add_argument("--max-cells", type=int, help="Cell budget of the map; coarser cells are used above it.")
+    parser.add_argument("--tiled", action="store_true", default=None, help="Trace the map tile by tile.")
     args = parser.parse_args()
 
     if args.config:
@@ -147,4 +181,5 @@ if __name__ == "__main__":
         legacy = args.legacy_args
         tx_positions = [list(map(float, legacy[0:3]))] if len(legacy) >= 3 else [[0,0,0]]
         rx_positions = [list(map(float, legacy[3:6]))] if len(legacy) >= 6 else [[100,0,0]]
-    generate_radio_map(tx_positions, rx_positions, metric)
+    generate_radio_map(tx_positions, rx_positions, metric, quality=args.quality, max_cells=args.max_cells,
+                       tiled=args.tiled)
@@ -8,6 +8,7 @@ import time
 from pathlib import Path
 from anthropic import Anthropic
 from task_decomposer import TaskDecomposer
+from array_codec import decode_arrays
 
 try:
     from dotenv import load_dotenv
@@ -40,6 +41,9 @@ Available tools:
 - simulate_ber: Calculate Bit Error Rate for different channels
 - simulate_radio_map: Generate radio coverage maps using ray tracing
 - simulate_multi_radio_map: Generate coverage maps for multiple transmitters simultaneously
+- query_radio_map: Read values at positions, percentiles, CDF and coverage from a computed radio map (pass its grid_key)
+- optimize_tx_placement: Search candidate sites for the best multi-transmitter layout (use this for placement optimization)
+- evaluate_links: Path gain, RSS, SNR and delay spread at specific receiver positions (cheaper than a radio map when only those points matter)
 - simulate_ber_mimo: Simulate BER for MIMO systems with configurable antennas
 - compare_mimo_performance: Compare SISO vs MIMO performance (use this for antenna comparison tasks)
 
@@ -77,13 +81,18 @@ Guidelines:
             stderr=subprocess.PIPE,
         )
 
-        for _ in range(60):
+        # The server imports tools lazily, so /tools answers within a
+        # fraction of a second; poll often and fail fast if it exits.
+        deadline = time.time() + 60
+        while time.time() < deadline:
             try:
                 requests.get(f"{self.mcp_server_url}/tools", timeout=1)
                 print("MCP server started")
                 return
             except:
-                time.sleep(1.0)
+                if self.mcp_process.poll() is not None:
+                    break
+                time.sleep(0.1)
 
         if self.mcp_process.poll() is not None:
             stdout, stderr = self.mcp_process.communicate()
@@ -119,7 +128,7 @@ Guidelines:
         toolset = self.available_tools
         task_type = decomposition.get("task_type")
         if task_type == "multi_tx_optimization":
-            preferred_tool = next((t for t in self.available_tools if t["name"] == "simulate_multi_radio_map"), None)
+            preferred_tool = next((t for t in self.available_tools if t["name"] == "optimize_tx_placement"), None)
             if preferred_tool:
                 toolset = [preferred_tool]
         elif task_type == "antenna_sweep":
@@ -167,14 +176,15 @@ Guidelines:
         """Synchronous wrapper for Gradio UI"""
         return asyncio.run(self.process_query(query))
 
-    def execute_tool(self, tool_name: str, parameters: dict):
-        """Execute tool via MCP HTTP server"""
+    def execute_tool(self, tool_name: str, parameters: dict, compress_arrays: bool = False):
+        """Execute tool via MCP HTTP server; sample arrays come back as NumPy arrays"""
         response = requests.post(
             f"{self.mcp_server_url}/tools/call",
-            json={"name": tool_name, "arguments": parameters},
+            json={"name": tool_name, "arguments": parameters,
+                  "arrays": "zlib" if compress_arrays else "base64"},
         )
         if response.status_code == 200:
-            return response.json()["result"]
+            return decode_arrays(response.json()["result"])
         else:
             raise Exception(
                 f"Tool execution failed: {response.json().get('error', 'Unknown error')}"
@@ -0,0 +1,80 @@
+"""Compact JSON transport for NumPy arrays in tool results.
+
+An array travels as ``{"__ndarray__": {"dtype", "shape", "encoding", "data"}}``
+where ``data`` is the base64 of its raw little-endian buffer, optionally
+zlib-compressed. Complex samples stay complex64, i.e. interleaved
+float32 pairs, and decode with a single ``np.frombuffer`` instead of one
+``complex(re, im)`` per sample.
+"""
+from __future__ import annotations
+
+import base64
+import zlib
+from typing import Any
+
+import numpy as np
+
+# Formats a client can ask for: nested [re, im] lists (the original
+# transport), raw base64 buffers, or zlib-compressed base64 buffers.
+ARRAY_FORMATS = ("lists", "base64", "zlib")
+_TAG = "__ndarray__"
+
+
+def encode_array(array: Any, compress: bool = False) -> dict:
+    """Wrap ``array`` as a JSON-safe dict; complex data is sent as complex64"""
+    array = np.asarray(array)
+    if np.iscomplexobj(array):
+        array = array.astype(np.complex64, copy=False)
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+    data = array.tobytes()
+    if compress:
+        data = zlib.compress(data, 6)
+    return {_TAG: {"dtype": array.dtype.str, "shape": list(array.shape),
+                   "encoding": "base64+zlib" if compress else "base64",
+                   "data": base64.b64encode(data).decode("ascii")}}
+
+
+def is_encoded(value: Any) -> bool:
+    return isinstance(value, dict) and _TAG in value
+
+
+def decode_array(value: dict) -> np.ndarray:
+    """Array view over the decoded buffer of an ``encode_array`` dict (read-only)"""
+    spec = value[_TAG]
+    data = base64.b64decode(spec["data"])
+    if spec["encoding"] == "base64+zlib":
+        data = zlib.decompress(data)
+    return np.frombuffer(data, dtype=np.dtype(spec["dtype"])).reshape(spec["shape"])
+
+
+def _to_lists(array: np.ndarray) -> list:
+    if np.iscomplexobj(array):
+        return np.stack([array.real, array.imag], axis=-1).astype(float).tolist()
+    return array.tolist()
+
+
+def format_arrays(value: Any, array_format: str = "lists") -> Any:
+    """Copy of ``value`` with encoded arrays converted to ``array_format``"""
+    if is_encoded(value):
+        if array_format == "lists":
+            return _to_lists(decode_array(value))
+        compress = array_format == "zlib"
+        if (value[_TAG]["encoding"] == "base64+zlib") == compress:
+            return value
+        return encode_array(decode_array(value), compress)
+    if isinstance(value, dict):
+        return {k: format_arrays(v, array_format) for k, v in value.items()}
+    if isinstance(value, list):
+        return [format_arrays(v, array_format) for v in value]
+    return value
+
+
+def decode_arrays(value: Any) -> Any:
+    """Replace every encoded array in a decoded JSON document with an ndarray"""
+    if is_encoded(value):
+        return decode_array(value)
+    if isinstance(value, dict):
+        return {k: decode_arrays(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_arrays(v) for v in value]
+    return value
@@ -0,0 +1,177 @@
+"""Content-addressed store for output files such as radio-map plots.
+
+Artifacts live under ``<directory>/<kind>/<key><suffix>``, where the key
+is a hash of what the file shows, so names stay short for any number of
+transmitters and equal requests share one file. ``manifest.json`` indexes
+every artifact with its parameters, size, creation and last-access time;
+once the files exceed the quota, the least recently used are deleted.
+Files are written to a temporary name and renamed into place, so readers
+never see a partial plot, and manifest updates are serialized across
+processes with a lock file where ``fcntl`` is available.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest updates are only serialized within a process
+    fcntl = None
+
+_KEY_LENGTH = 32
+# Reads refresh the recorded last access at most this often (s), so a
+# lookup rarely has to rewrite the manifest
+_ACCESS_RESOLUTION = 60.0
+
+
+def artifact_key(kind: str, params: Dict[str, Any]) -> str:
+    """Content address of an artifact of ``kind`` described by ``params``"""
+    payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:_KEY_LENGTH]
+
+
+class ArtifactStore:
+    """Files under ``directory`` indexed by a manifest and capped at ``max_bytes``.
+
+    Eviction only ever deletes files recorded in the manifest, so other
+    files in the directory are left alone.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._manifest_path = os.path.join(directory, "manifest.json")
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, kind: str, key: str, suffix: str = ".png") -> str:
+        return os.path.join(self.directory, kind, f"{key}{suffix}")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            with open(os.path.join(self.directory, "manifest.lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)["artifacts"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"artifacts": entries}, f)
+        os.replace(tmp_path, self._manifest_path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of a stored artifact (with its absolute ``path``), or None"""
+        with self._locked():
+            entries = self._read()
+            entry = entries.get(key)
+            if entry is None or not os.path.exists(os.path.join(self.directory, entry["file"])):
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            now = time.time()
+            if now - entry["last_access"] >= _ACCESS_RESOLUTION:
+                entry["last_access"] = now
+                self._write(entries)
+        return dict(entry, path=os.path.join(self.directory, entry["file"]))
+
+    def touch(self, path: str) -> bool:
+        """Record a use of the artifact at ``path``; False if it is not stored"""
+        key = os.path.splitext(os.path.basename(path))[0]
+        entry = self.get(key)
+        return entry is not None and os.path.abspath(entry["path"]) == os.path.abspath(path)
+
+    def put(self, kind: str, key: str, write: Callable[[str], Any], params: Dict[str, Any],
+            suffix: str = ".png") -> str:
+        """Write an artifact with ``write(path)`` and index it, replacing any earlier version.
+
+        ``write`` fills a temporary file with the final suffix, which is
+        then renamed into place. Returns the artifact's absolute path.
+        """
+        path = self.path(kind, key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=suffix)
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        now = time.time()
+        with self._locked():
+            entries = self._read()
+            created = entries.get(key, {}).get("created", now)
+            entries[key] = {"file": os.path.relpath(path, self.directory), "kind": kind, "params": params,
+                            "size": os.path.getsize(path), "created": created, "last_access": now}
+            self._evict(entries, keep=key)
+            self._write(entries)
+            self.counters["writes"] += 1
+        return os.path.abspath(path)
+
+    def _evict(self, entries: Dict[str, Dict[str, Any]], keep: str) -> None:
+        """Delete least recently used artifacts other than ``keep`` until the rest fit ``max_bytes``"""
+        total = sum(entry["size"] for entry in entries.values())
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(self.directory, entry["file"]))
+            del entries[key]
+            total -= entry["size"]
+            self.counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """Delete every indexed artifact"""
+        with self._locked():
+            for entry in self._read().values():
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.directory, entry["file"]))
+            self._write({})
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the number and total size of stored artifacts"""
+        with self._locked():
+            entries = self._read()
+        return dict(self.counters, artifacts=len(entries), bytes=sum(entry["size"] for entry in entries.values()),
+                    max_bytes=self.max_bytes)
+
+
+_DEFAULT_STORE: Optional[ArtifactStore] = None
+_DEFAULT_STORE_LOCK = threading.Lock()
+
+
+def default_artifact_store() -> ArtifactStore:
+    """Store under ``SIONNA_TOOLS_OUTPUT_DIR`` (default ``outputs`` in the repository)
+    capped at ``SIONNA_TOOLS_OUTPUT_MB`` megabytes (default 1024)"""
+    global _DEFAULT_STORE
+    with _DEFAULT_STORE_LOCK:
+        if _DEFAULT_STORE is None:
+            directory = os.environ.get("SIONNA_TOOLS_OUTPUT_DIR",
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "outputs"))
+            max_bytes = int(float(os.environ.get("SIONNA_TOOLS_OUTPUT_MB", "1024")) * (1 << 20))
+            _DEFAULT_STORE = ArtifactStore(os.path.abspath(directory), max_bytes)
+    return _DEFAULT_STORE
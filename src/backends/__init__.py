@@ -0,0 +1,65 @@
+"""Array backends for the link-level simulation kernels.
+
+Every backend module exposes the same functions: ``constellation_points``,
+``seed_stream``, ``constellation_kernel``, ``constellation_stats_kernel``,
+``ber_kernel``, ``ber_is_kernel``, ``mimo_kernel``, ``detector_kernel`` and
+``warm_kernels``. Kernels take NumPy/Python arguments
+and return NumPy arrays, so ``sionna_tools`` does not depend on which
+backend ran them. Backends are imported on first use, so selecting
+``"numpy"`` never loads TensorFlow.
+"""
+import importlib
+import math
+import os
+
+# Share of importance-sampling draws taken from the nominal distribution
+IS_NOMINAL_FRACTION = 0.2
+# Channel coefficients per MIMO chunk (32 MB of complex64)
+MIMO_CHUNK_ELEMENTS = 1 << 22
+
+BACKENDS = {
+    "tensorflow": "backends.tf_backend",
+    "numpy": "backends.numpy_backend",
+}
+DEFAULT_BACKEND = os.environ.get("SIONNA_TOOLS_BACKEND", "tensorflow")
+
+
+def backend_name(name=None):
+    """Canonical backend name for ``name`` (default ``SIONNA_TOOLS_BACKEND``)"""
+    name = name or DEFAULT_BACKEND
+    if name in ("tf", "sionna"):
+        name = "tensorflow"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name} (choose from {', '.join(BACKENDS)})")
+    return name
+
+
+def get_backend(name=None):
+    """Return the backend module called ``name`` (default ``SIONNA_TOOLS_BACKEND``)"""
+    return importlib.import_module(BACKENDS[backend_name(name)])
+
+
+def is_log_scale(noise_scale):
+    """Log of the weight unit for IS statistics of AWGN with ``noise_scale``-fold noise.
+
+    Kernels accumulate weighted errors in multiples of this unit, the
+    weight of a biased draw at half the minimum distance, so at high SNR
+    the weights (and their squares) of the samples that carry the estimate
+    stay near one instead of underflowing float64.
+    """
+    return min(0.0, math.log(noise_scale) - (noise_scale - 1) / 2)
+
+
+def mimo_chunk_symbols(num_symbols, num_rx_ant, num_tx_ant, chunk_symbols=None, detector="mrc", num_snr=1):
+    """Symbols per MIMO kernel call; bounds the largest per-chunk tensor to about ``MIMO_CHUNK_ELEMENTS``.
+
+    Besides the channel, the batched detectors hold per-SNR received
+    streams and, for ML, one metric per candidate vector and SNR point.
+    """
+    if chunk_symbols is None:
+        elements = num_rx_ant * num_tx_ant
+        if detector != "mrc":
+            width = 4 ** num_tx_ant if detector == "ml" else max(num_rx_ant, num_tx_ant)
+            elements = max(elements, num_snr * width)
+        chunk_symbols = MIMO_CHUNK_ELEMENTS // elements
+    return max(1, min(int(num_symbols), int(chunk_symbols)))
@@ -0,0 +1,325 @@
+"""Pure-NumPy backend: the same kernels as ``tf_backend`` without TensorFlow.
+
+Models, constellations and bit labels match the TensorFlow kernels, so
+results agree statistically; only the random streams differ.
+"""
+import functools
+import math
+
+import numpy as np
+
+from backends import IS_NOMINAL_FRACTION, is_log_scale
+
+_DEMOD_CHUNK = 4096
+
+
+def _pam_gray(bits):
+    """Gray-labelled PAM level of an MSB-first bit list (as in Sionna / 38.211)"""
+    if len(bits) > 1:
+        return (1 - 2 * bits[0]) * (2 ** (len(bits) - 1) - _pam_gray(bits[1:]))
+    return 1 - 2 * bits[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _points(modulation, bits_per_symbol):
+    if modulation == "qam" and (bits_per_symbol <= 0 or bits_per_symbol % 2):
+        raise ValueError("num_bits_per_symbol must be a multiple of 2")
+    if modulation not in ("qam", "pam") or bits_per_symbol <= 0:
+        raise ValueError(f"Unsupported constellation: {modulation} with {bits_per_symbol} bits per symbol")
+    points = np.zeros(2**bits_per_symbol, dtype=np.complex128)
+    for i in range(len(points)):
+        bits = [int(b) for b in np.binary_repr(i, bits_per_symbol)]
+        if modulation == "qam":
+            points[i] = _pam_gray(bits[0::2]) + 1j * _pam_gray(bits[1::2])
+        else:
+            points[i] = _pam_gray(bits)
+    points /= np.sqrt(np.mean(np.abs(points)**2))
+    points = points.astype(np.complex64)
+    points.flags.writeable = False
+    return points
+
+
+def constellation_points(modulation, bits_per_symbol):
+    return _points(modulation, bits_per_symbol).copy()
+
+
+def grid_layout(points):
+    """Per-axis slicing parameters for rectangular grid constellations.
+
+    Returns ``(re_levels, im_levels, table)`` where ``table[i * len(im_levels) + q]``
+    is the index of the point at real level ``i`` and imaginary level ``q``,
+    or None if the points do not form a uniformly spaced full grid.
+    """
+    re_levels = np.unique(np.round(points.real, 6))
+    im_levels = np.unique(np.round(points.imag, 6))
+    if len(re_levels) * len(im_levels) != len(points):
+        return None
+    for levels in (re_levels, im_levels):
+        if len(levels) > 2 and not np.allclose(np.diff(levels), levels[1] - levels[0], atol=1e-5):
+            return None
+    table = np.full(len(points), -1, dtype=np.int32)
+    for i, p in enumerate(points):
+        ri = np.argmin(np.abs(re_levels - p.real))
+        qi = np.argmin(np.abs(im_levels - p.imag))
+        table[ri * len(im_levels) + qi] = i
+    if (table < 0).any():
+        return None
+    return re_levels, im_levels, table
+
+
+def ml_candidates(num_tx_ant):
+    """QPSK index vectors ``[4 ** num_tx_ant, num_tx_ant]`` searched by the ML detector"""
+    codes = np.arange(4 ** num_tx_ant)[:, None]
+    return ((codes >> (2 * np.arange(num_tx_ant))) & 3).astype(np.int32)
+
+
+@functools.lru_cache(maxsize=None)
+def _grid_slicer(modulation, bits_per_symbol):
+    return grid_layout(_points(modulation, bits_per_symbol))
+
+
+def seed_stream(seed):
+    """Yield independent generators; a fixed ``seed`` makes every call reproducible"""
+    sequence = np.random.SeedSequence(seed)
+    while True:
+        yield np.random.default_rng(sequence.spawn(1)[0])
+
+
+def _complex_normal(rng, shape):
+    """Circularly-symmetric complex Gaussian samples with unit variance"""
+    out = np.empty(shape, dtype=np.complex64)
+    out.real = rng.standard_normal(shape, dtype=np.float32)
+    out.imag = rng.standard_normal(shape, dtype=np.float32)
+    out *= np.float32(math.sqrt(0.5))
+    return out
+
+
+def _slice_axis(x, levels):
+    if len(levels) == 1:
+        return np.zeros(x.shape, dtype=np.int32)
+    step = float(levels[1] - levels[0])
+    pos = np.rint((x - float(levels[0])) / step)
+    return np.clip(pos, 0, len(levels) - 1).astype(np.int32)
+
+
+def _demodulate(points, rx, slicer=None):
+    """Minimum-distance detection; see ``tf_backend._demodulate``"""
+    if slicer is not None:
+        re_levels, im_levels, table = slicer
+        return table[_slice_axis(rx.real, re_levels) * len(im_levels) + _slice_axis(rx.imag, im_levels)]
+    flat = rx.reshape(-1)
+    idx = np.empty(flat.shape, dtype=np.int32)
+    for start in range(0, len(flat), _DEMOD_CHUNK):
+        chunk = flat[start:start + _DEMOD_CHUNK]
+        idx[start:start + _DEMOD_CHUNK] = np.argmin(np.abs(chunk[:, None] - points[None, :])**2, axis=-1)
+    return idx.reshape(rx.shape)
+
+
+def _symbol_bit_errors(idx_hat, idx, bits_per_symbol):
+    """Set bits of ``idx_hat XOR idx`` per symbol"""
+    diff = np.bitwise_xor(idx_hat.astype(np.int32), idx.astype(np.int32))
+    return ((diff[..., None] >> np.arange(bits_per_symbol, dtype=np.int32)) & 1).sum(axis=-1)
+
+
+def _bit_errors(idx_hat, idx, bits_per_symbol, valid=None):
+    errors = _symbol_bit_errors(idx_hat, idx, bits_per_symbol)
+    if valid is not None:
+        errors = np.where(valid, errors, 0)
+    return errors.sum(axis=-1)
+
+
+def _is_weighted_errors(errors, log_ratio, valid, log_scale=0.0):
+    """Defensive-mixture IS statistics; see ``tf_backend._is_weighted_errors``"""
+    a = IS_NOMINAL_FRACTION
+    log_ratio = np.asarray(log_ratio, dtype=np.float64)
+    log_weights = -math.log(a) - np.logaddexp(0.0, log_ratio + math.log((1 - a) / a))
+    weights = np.exp(log_weights - np.asarray(log_scale, dtype=np.float64))
+    errors = np.where(valid, errors.astype(np.float64), 0.0)
+    x = errors * weights
+    return np.stack([errors.sum(axis=-1), x.sum(axis=-1), (x**2).sum(axis=-1)])
+
+
+def constellation_kernel(modulation, bits_per_symbol, num_symbols, num_snr):
+    """kernel(sigma[num_snr], seed) -> received symbols [num_snr, num_symbols]"""
+    points = _points(modulation, bits_per_symbol)
+
+    def kernel(sigma, rng):
+        idx = rng.integers(0, len(points), num_symbols)
+        noise = _complex_normal(rng, (num_snr, num_symbols))
+        return points[idx][None, :] + np.asarray(sigma, dtype=np.float32)[:, None] * noise
+    return kernel
+
+
+def constellation_stats_kernel(modulation, bits_per_symbol, num_symbols, num_snr, bins):
+    """Streaming cluster accumulators; see ``tf_backend.constellation_stats_kernel``"""
+    points = _points(modulation, bits_per_symbol)
+    num_points = len(points)
+
+    def kernel(sigma, extent, num_valid, rng):
+        idx = rng.integers(0, num_points, num_symbols)[:num_valid]
+        tx = points[idx]
+        noise = _complex_normal(rng, (num_snr, num_symbols))[:, :num_valid]
+        rx = tx[None, :] + np.asarray(sigma, dtype=np.float32)[:, None] * noise
+        re = rx.real.astype(np.float64)
+        im = rx.imag.astype(np.float64)
+
+        count = np.bincount(idx, minlength=num_points).astype(np.float64)
+        moments = np.stack([re, im, re * re, im * im, re * im], axis=-1)
+        sums = np.stack([[np.bincount(idx, weights=moments[k, :, f], minlength=num_points) for f in range(5)]
+                         for k in range(num_snr)]).transpose(0, 2, 1)
+        error_power = (np.abs(rx - tx[None, :])**2).astype(np.float64).sum(axis=1)
+
+        half = np.asarray(extent, dtype=np.float64)[:, None]
+        scale = bins / (2 * half)
+        bx = np.clip(np.floor((re + half) * scale), 0, bins - 1).astype(np.int64)
+        by = np.clip(np.floor((im + half) * scale), 0, bins - 1).astype(np.int64)
+        cell = np.arange(num_snr)[:, None] * bins * bins + bx * bins + by
+        histogram = np.bincount(cell.reshape(-1), minlength=num_snr * bins * bins).astype(np.float64)
+        return {"count": count, "sums": sums, "error_power": error_power,
+                "histogram": histogram.reshape(num_snr, bins, bins)}
+    return kernel
+
+
+def ber_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels=("awgn", "rayleigh")):
+    """kernel(sigma[num_snr], num_valid, seed) -> bit errors [num_channels, num_snr]"""
+    points = _points(modulation, bits_per_symbol)
+    slicer = _grid_slicer(modulation, bits_per_symbol)
+
+    def kernel(sigma, num_valid, rng):
+        idx = rng.integers(0, len(points), num_symbols)
+        tx = points[idx]
+        noise = np.asarray(sigma, dtype=np.float32)[:, None] * _complex_normal(rng, num_symbols)[None, :]
+        valid = np.arange(num_symbols) < num_valid
+        errors = []
+        if "awgn" in channels:
+            errors.append(_bit_errors(_demodulate(points, tx + noise, slicer), idx, bits_per_symbol, valid))
+        if "rayleigh" in channels:
+            h = _complex_normal(rng, num_symbols)
+            rx = (h * tx + noise) / h
+            errors.append(_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol, valid))
+        return np.stack(errors)
+    return kernel
+
+
+def ber_is_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels=("awgn", "rayleigh")):
+    """Importance-sampling variant of ``ber_kernel``; see ``tf_backend.ber_is_kernel``"""
+    points = _points(modulation, bits_per_symbol)
+    slicer = _grid_slicer(modulation, bits_per_symbol)
+
+    def kernel(sigma, noise_scale, fade_scale, num_valid, rng):
+        sigma = np.asarray(sigma, dtype=np.float32)[:, None]
+        noise_scale = np.asarray(noise_scale, dtype=np.float32)[:, None]
+        fade_scale = np.asarray(fade_scale, dtype=np.float32)[:, None]
+        idx = rng.integers(0, len(points), num_symbols)
+        tx = points[idx]
+        z = _complex_normal(rng, num_symbols)
+        biased = rng.random(num_symbols) >= IS_NOMINAL_FRACTION
+        valid = np.arange(num_symbols) < num_valid
+        z_power = np.abs(z)**2
+        stats = []
+        if "awgn" in channels:
+            std = np.where(biased[None, :], np.sqrt(noise_scale), np.float32(1.0))  # [num_snr, num_symbols]
+            rx = tx + (sigma * std) * z
+            log_ratio = -np.log(noise_scale) + std**2 * z_power * (1 - 1 / noise_scale)
+            errors = _symbol_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol)
+            log_scale = np.array([is_log_scale(float(s)) for s in noise_scale[:, 0]])[:, None]
+            stats.append(_is_weighted_errors(errors, log_ratio, valid, log_scale))
+        if "rayleigh" in channels:
+            g = _complex_normal(rng, num_symbols)
+            amp = np.where(biased[None, :], np.sqrt(1 / fade_scale), np.float32(1.0))
+            h = amp * g
+            rx = (h * tx + sigma * z) / h
+            log_ratio = np.log(fade_scale) + amp**2 * np.abs(g)**2 * (1 - fade_scale)
+            errors = _symbol_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol)
+            stats.append(_is_weighted_errors(errors, log_ratio, valid))
+        return np.stack(stats, axis=1)
+    return kernel
+
+
+def mimo_kernel(num_symbols, num_rx_ant, num_tx_ant, importance=False):
+    """MRC kernel(sigma, fade_scale, noise_scale, num_valid, seed); see ``tf_backend.mimo_kernel``"""
+    const_points = (np.array([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j]) / np.sqrt(2)).astype(np.complex64)
+
+    def kernel(sigma, fade_scale, noise_scale, num_valid, rng):
+        # Random QPSK symbols, repeated on every transmit antenna
+        idx = rng.integers(0, 4, num_symbols)
+        s = const_points[idx]
+
+        # Rayleigh fading channel and AWGN
+        h = _complex_normal(rng, (num_symbols, num_rx_ant, num_tx_ant))
+        z = _complex_normal(rng, (num_symbols, num_rx_ant))
+        if importance:
+            biased = rng.random(num_symbols) >= IS_NOMINAL_FRACTION
+            h[:, :, 0] *= np.where(biased, np.sqrt(1 / fade_scale), 1.0).astype(np.float32)[:, None]
+            u = h[:, :, 0] / np.linalg.norm(h[:, :, 0], axis=1, keepdims=True)
+            z_par = np.sum(np.conj(u) * z, axis=1)
+            z_par_biased = np.where(biased, np.sqrt(noise_scale), 1.0).astype(np.float32) * z_par
+            z = z + u * (z_par_biased - z_par)[:, None]
+        y = h.sum(axis=2) * s[:, None] + np.float32(sigma) * z
+
+        # Maximal Ratio Combining (MRC) on the first transmit antenna
+        h_total = h[:, :, 0]
+        h_power = np.sum(np.abs(h_total)**2, axis=1)
+        combined = np.sum(np.conj(h_total) * y, axis=1) / h_power
+
+        # Hard decision (QPSK): bit labels are (idx // 2, idx % 2)
+        rx_idx = 2 * (combined.real < 0) + (combined.imag < 0)
+        valid = np.arange(num_symbols) < num_valid
+        if importance:
+            log_ratio = (num_rx_ant * np.log(fade_scale) + h_power * (1 - fade_scale)
+                         - np.log(noise_scale) + np.abs(z_par_biased)**2 * (1 - 1 / noise_scale))
+            errors = _symbol_bit_errors(rx_idx, idx, 2)
+            return _is_weighted_errors(errors, log_ratio, valid)
+        return _bit_errors(rx_idx, idx, 2, valid)
+    return kernel
+
+
+def detector_kernel(num_symbols, num_rx_ant, num_tx_ant, detector, num_snr):
+    """kernel(sigma[num_snr], num_valid, seed) -> bit errors [num_snr]; see ``tf_backend.detector_kernel``"""
+    const_points = (np.array([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j]) / np.sqrt(2)).astype(np.complex64)
+    if detector == "ml":
+        cand_idx = ml_candidates(num_tx_ant)
+        candidates = const_points[cand_idx]
+
+    def kernel(sigma, num_valid, rng):
+        # Independent QPSK streams, one per transmit antenna
+        idx = rng.integers(0, 4, (num_symbols, num_tx_ant))
+        x = const_points[idx]
+        h = _complex_normal(rng, (num_symbols, num_rx_ant, num_tx_ant))
+        z = _complex_normal(rng, (num_symbols, num_rx_ant))
+
+        # Matched filter H^H y = G x + sigma H^H z for every SNR point
+        h_adj = np.conj(np.swapaxes(h, 1, 2))
+        gram = h_adj @ h
+        signal = (gram @ x[:, :, None])[:, :, 0]
+        noise = (h_adj @ z[:, :, None])[:, :, 0]
+        sigma = np.asarray(sigma, dtype=np.float32)
+        s = sigma[None, :, None]
+
+        if detector == "zf":
+            w = np.linalg.solve(gram, noise[:, :, None])[:, :, 0]
+            x_hat = x[:, None, :] + s * w[:, None, :]
+        elif detector == "mmse":
+            lam, v = np.linalg.eigh(gram)
+            v_adj = np.conj(np.swapaxes(v, 1, 2))
+            a = (v_adj @ signal[:, :, None])[:, None, :, 0]
+            b = (v_adj @ noise[:, :, None])[:, None, :, 0]
+            x_hat = np.einsum("ntu,nku->nkt", v, (a + s * b) / (lam[:, None, :] + (sigma**2)[None, :, None]))
+        if detector == "ml":
+            r = signal[:, None, :] + s * noise[:, None, :]
+            energy = np.einsum("ct,nts,cs->nc", np.conj(candidates), gram, candidates).real
+            corr = np.einsum("ct,nkt->nkc", np.conj(candidates), r).real
+            rx_idx = cand_idx[np.argmin(energy[:, None, :] - 2 * corr, axis=-1)]
+        else:
+            # Hard decision (QPSK): bit labels are (idx // 2, idx % 2)
+            rx_idx = 2 * (x_hat.real < 0) + (x_hat.imag < 0)
+
+        errors = _symbol_bit_errors(rx_idx, idx[:, None, :], 2).sum(axis=-1)
+        valid = np.arange(num_symbols) < num_valid
+        return np.where(valid[:, None], errors, 0).sum(axis=0)
+    return kernel
+
+
+def warm_kernels(shapes=None):
+    """Nothing is compiled ahead of time on this backend"""
+    return 0
@@ -0,0 +1,466 @@
+"""TensorFlow/Sionna backend: XLA-compiled simulation kernels"""
+import functools
+import math
+import os
+import threading
+
+import numpy as np
+import tensorflow as tf
+from sionna.phy.mapping import Constellation
+
+from backends import IS_NOMINAL_FRACTION, is_log_scale, mimo_chunk_symbols
+from backends.numpy_backend import grid_layout, ml_candidates
+
+_USE_XLA = os.environ.get("SIONNA_TOOLS_XLA", "1") == "1"
+_DEMOD_CHUNK = 4096
+_KERNEL_CACHE = {}
+_KERNEL_LOCK = threading.Lock()
+
+# Shapes compiled by warm_kernels(): the tool defaults and the MIMO
+# configurations used by compare_mimo_performance and sweep_tx_antennas.
+_WARM_SHAPES = [
+    {"kind": "constellation", "modulation": "qam", "bits_per_symbol": 2, "num_symbols": 2000, "num_snr": 2},
+    {"kind": "constellation", "modulation": "qam", "bits_per_symbol": 4, "num_symbols": 2000, "num_snr": 2},
+    {"kind": "constellation", "modulation": "qam", "bits_per_symbol": 6, "num_symbols": 2000, "num_snr": 2},
+    {"kind": "ber", "modulation": "qam", "bits_per_symbol": 2, "num_symbols": 50000, "num_snr": 2},
+    {"kind": "mimo", "num_symbols": 50000, "num_rx_ant": 1, "num_tx_ant": 1},
+    {"kind": "mimo", "num_symbols": 50000, "num_rx_ant": 2, "num_tx_ant": 2},
+] + [
+    {"kind": "mimo", "num_symbols": mimo_chunk_symbols(100000, 16, num_tx), "num_rx_ant": 16, "num_tx_ant": num_tx}
+    for num_tx in [1, 2, 4, 8]
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _points(modulation, bits_per_symbol):
+    return Constellation(modulation, num_bits_per_symbol=bits_per_symbol, normalize=True).points
+
+
+def constellation_points(modulation, bits_per_symbol):
+    return _points(modulation, bits_per_symbol).numpy()
+
+
+def _compiled(key, build):
+    """Return the compiled kernel cached under ``key``, building it on first use.
+
+    Keys carry every shape the kernel depends on (modulation, batch size,
+    number of SNR points, antenna counts), so each entry is traced once.
+    """
+    with _KERNEL_LOCK:
+        kernel = _KERNEL_CACHE.get(key)
+        if kernel is None:
+            kernel = tf.function(build(), jit_compile=_USE_XLA)
+            _KERNEL_CACHE[key] = kernel
+    return kernel
+
+
+def _f32(x):
+    return tf.constant(x, dtype=tf.float32)
+
+
+def seed_stream(seed):
+    """Yield stateless RNG seeds; a fixed ``seed`` makes every call reproducible"""
+    rng = np.random.default_rng(seed)
+    while True:
+        yield tf.constant(rng.integers(0, 2**31 - 1, size=2), dtype=tf.int64)
+
+
+def _complex_normal(shape, seed):
+    """Circularly-symmetric complex Gaussian samples with unit variance"""
+    seeds = tf.random.experimental.stateless_split(seed, num=2)
+    std = math.sqrt(0.5)
+    return tf.complex(tf.random.stateless_normal(shape, seeds[0], stddev=std),
+                      tf.random.stateless_normal(shape, seeds[1], stddev=std))
+
+
+@functools.lru_cache(maxsize=None)
+def _grid_slicer(modulation, bits_per_symbol):
+    return grid_layout(constellation_points(modulation, bits_per_symbol))
+
+
+def _slice_axis(x, levels):
+    """Index of the nearest uniformly spaced level, in O(1) per sample"""
+    if len(levels) == 1:
+        return tf.zeros_like(x, dtype=tf.int32)
+    step = float(levels[1] - levels[0])
+    pos = tf.round((x - float(levels[0])) / step)
+    return tf.cast(tf.clip_by_value(pos, 0, len(levels) - 1), tf.int32)
+
+
+def _demodulate(points, rx, slicer=None):
+    """Minimum-distance detection of ``rx`` (any shape) against ``points``.
+
+    Grid constellations (square QAM, PAM) are sliced per axis in O(1) per
+    symbol. Other constellations fall back to a distance search in chunks
+    of ``_DEMOD_CHUNK`` symbols, so the distance matrix never exceeds
+    ``_DEMOD_CHUNK x num_points``.
+    """
+    if slicer is not None:
+        re_levels, im_levels, table = slicer
+        ri = _slice_axis(tf.math.real(rx), re_levels)
+        qi = _slice_axis(tf.math.imag(rx), im_levels)
+        return tf.gather(tf.constant(table), ri * len(im_levels) + qi)
+
+    shape = tf.shape(rx)
+    flat = tf.reshape(rx, [-1])
+    num = tf.size(flat)
+    num_chunks = (num + _DEMOD_CHUNK - 1) // _DEMOD_CHUNK
+    flat = tf.pad(flat, [[0, num_chunks * _DEMOD_CHUNK - num]])
+
+    def detect(chunk):
+        distances = tf.abs(chunk[:, None] - points[None, :])**2
+        return tf.argmin(distances, axis=-1, output_type=tf.int32)
+
+    idx = tf.map_fn(detect, tf.reshape(flat, [num_chunks, _DEMOD_CHUNK]), fn_output_signature=tf.int32)
+    return tf.reshape(tf.reshape(idx, [-1])[:num], shape)
+
+
+def _symbol_bit_errors(idx_hat, idx, bits_per_symbol):
+    """Bit errors per symbol between detected and transmitted symbol indices.
+
+    Constellation point ``i`` carries the binary label of ``i``, so the bit
+    errors of a symbol are the set bits of ``idx_hat XOR idx``.
+    """
+    diff = tf.bitwise.bitwise_xor(tf.cast(idx_hat, tf.int32), tf.cast(idx, tf.int32))
+    bits = tf.bitwise.bitwise_and(tf.bitwise.right_shift(diff[..., None], tf.range(bits_per_symbol)), 1)
+    return tf.reduce_sum(bits, axis=-1)
+
+
+def _bit_errors(idx_hat, idx, bits_per_symbol, valid=None):
+    """Count bit errors over the last axis, skipping symbols where ``valid`` is False"""
+    errors = _symbol_bit_errors(idx_hat, idx, bits_per_symbol)
+    if valid is not None:
+        errors = tf.where(valid, errors, 0)
+    return tf.reduce_sum(errors, axis=-1)
+
+
+def _is_weighted_errors(errors, log_ratio, valid, log_scale=0.0):
+    """Reweight per-symbol errors drawn from the defensive IS mixture.
+
+    Samples come from ``a * p + (1 - a) * q`` with ``a = IS_NOMINAL_FRACTION``,
+    the nominal density ``p`` and the biased density ``q``; ``log_ratio`` is
+    ``log(q / p)`` per sample. The weights ``p / (a p + (1 - a) q)`` are
+    bounded by ``1 / a``, so the estimator is unbiased and never worse than
+    plain Monte Carlo on the nominal share. Weights are expressed in units
+    of ``exp(log_scale)`` (see ``backends.is_log_scale``). Returns the
+    observed error count and the sums of weighted errors and of their squares.
+    """
+    a = IS_NOMINAL_FRACTION
+    # Weights are formed in the log domain and float64 so the unlikely
+    # biased samples that carry high-SNR estimates neither over- nor underflow
+    log_ratio = tf.cast(log_ratio, tf.float64)
+    log_weights = -math.log(a) - tf.math.softplus(log_ratio + math.log((1 - a) / a))
+    weights = tf.exp(log_weights - tf.cast(log_scale, tf.float64))
+    errors = tf.where(valid, tf.cast(errors, tf.float64), 0.0)
+    x = errors * weights
+    return tf.stack([tf.reduce_sum(errors, axis=-1), tf.reduce_sum(x, axis=-1), tf.reduce_sum(x**2, axis=-1)])
+
+
+def _compiled_constellation_kernel(modulation, bits_per_symbol, num_symbols, num_snr):
+    def build():
+        points = _points(modulation, bits_per_symbol)
+
+        def kernel(sigma, seed):
+            seeds = tf.random.experimental.stateless_split(seed, num=2)
+            idx = tf.random.stateless_uniform([num_symbols], seeds[0], minval=0,
+                                              maxval=points.shape[0], dtype=tf.int32)
+            noise = _complex_normal([num_snr, num_symbols], seeds[1])
+            return tf.gather(points, idx)[None, :] + tf.cast(sigma, tf.complex64)[:, None] * noise
+        return kernel
+    return _compiled(("constellation", modulation, bits_per_symbol, num_symbols, num_snr), build)
+
+
+def constellation_kernel(modulation, bits_per_symbol, num_symbols, num_snr):
+    """kernel(sigma[num_snr], seed) -> received symbols [num_snr, num_symbols]"""
+    kernel = _compiled_constellation_kernel(modulation, bits_per_symbol, num_symbols, num_snr)
+    return lambda sigma, seed: kernel(_f32(sigma), seed).numpy()
+
+
+def _compiled_constellation_stats_kernel(modulation, bits_per_symbol, num_symbols, num_snr, bins):
+    def build():
+        points = _points(modulation, bits_per_symbol)
+        num_points = points.shape[0]
+
+        def kernel(sigma, extent, num_valid, seed):
+            # Same draws as the constellation kernel, reduced to accumulators
+            seeds = tf.random.experimental.stateless_split(seed, num=2)
+            idx = tf.random.stateless_uniform([num_symbols], seeds[0], minval=0, maxval=num_points, dtype=tf.int32)
+            tx = tf.gather(points, idx)
+            rx = tx[None, :] + tf.cast(sigma, tf.complex64)[:, None] * _complex_normal([num_snr, num_symbols], seeds[1])
+            valid = tf.range(num_symbols) < num_valid
+            re = tf.cast(tf.math.real(rx), tf.float64)
+            im = tf.cast(tf.math.imag(rx), tf.float64)
+
+            # Invalid symbols go to an extra segment that is dropped
+            segment = tf.where(valid, idx, num_points)
+            count = tf.math.unsorted_segment_sum(tf.ones([num_symbols], tf.float64), segment, num_points + 1)[:num_points]
+            moments = tf.stack([re, im, re * re, im * im, re * im], axis=-1)  # [num_snr, num_symbols, 5]
+            sums = tf.math.unsorted_segment_sum(tf.transpose(moments, [1, 0, 2]), segment, num_points + 1)[:num_points]
+            error = tf.cast(tf.abs(rx - tx[None, :])**2, tf.float64)
+            error_power = tf.reduce_sum(tf.where(valid[None, :], error, 0.0), axis=1)
+
+            # 2-D histogram over [-extent, extent]^2; outliers land in the edge bins
+            scale = tf.cast(bins / (2 * extent), tf.float64)[:, None]
+            half = tf.cast(extent, tf.float64)[:, None]
+            bx = tf.cast(tf.clip_by_value(tf.floor((re + half) * scale), 0, bins - 1), tf.int32)
+            by = tf.cast(tf.clip_by_value(tf.floor((im + half) * scale), 0, bins - 1), tf.int32)
+            cell = tf.range(num_snr)[:, None] * bins * bins + bx * bins + by
+            cell = tf.where(valid[None, :], cell, num_snr * bins * bins)
+            histogram = tf.math.unsorted_segment_sum(tf.ones_like(re), tf.reshape(cell, [-1]), num_snr * bins * bins + 1)
+            return {
+                "count": count,
+                "sums": tf.transpose(sums, [1, 0, 2]),
+                "error_power": error_power,
+                "histogram": tf.reshape(histogram[:-1], [num_snr, bins, bins]),
+            }
+        return kernel
+    return _compiled(("constellation_stats", modulation, bits_per_symbol, num_symbols, num_snr, bins), build)
+
+
+def constellation_stats_kernel(modulation, bits_per_symbol, num_symbols, num_snr, bins):
+    """kernel(sigma[num_snr], extent[num_snr], num_valid, seed) -> streaming cluster accumulators.
+
+    Returns a dict of float64 arrays over the first ``num_valid`` symbols:
+    ``count`` [num_points] symbols sent per constellation point, ``sums``
+    [num_snr, num_points, 5] sums of re, im, re^2, im^2 and re*im of the
+    received samples per sent point, ``error_power`` [num_snr] summed
+    ``|rx - tx|^2`` and ``histogram`` [num_snr, bins, bins] sample counts
+    over ``[-extent, extent]^2``. Accumulators of several calls add up.
+    """
+    kernel = _compiled_constellation_stats_kernel(modulation, bits_per_symbol, num_symbols, num_snr, bins)
+
+    def run(sigma, extent, num_valid, seed):
+        out = kernel(_f32(sigma), _f32(extent), tf.constant(num_valid, dtype=tf.int32), seed)
+        return {name: value.numpy() for name, value in out.items()}
+    return run
+
+
+def _compiled_ber_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels):
+    def build():
+        points = _points(modulation, bits_per_symbol)
+        slicer = _grid_slicer(modulation, bits_per_symbol)
+
+        def kernel(sigma, num_valid, seed):
+            seeds = tf.random.experimental.stateless_split(seed, num=3)
+            idx = tf.random.stateless_uniform([num_symbols], seeds[0], minval=0,
+                                              maxval=points.shape[0], dtype=tf.int32)
+            tx = tf.gather(points, idx)
+            noise = tf.cast(sigma, tf.complex64)[:, None] * _complex_normal([num_symbols], seeds[1])[None, :]
+            valid = tf.range(num_symbols) < num_valid
+            errors = []
+            if "awgn" in channels:
+                errors.append(_bit_errors(_demodulate(points, tx + noise, slicer), idx, bits_per_symbol, valid))
+            if "rayleigh" in channels:
+                h = _complex_normal([num_symbols], seeds[2])
+                rx = (h * tx + noise) / h
+                errors.append(_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol, valid))
+            return tf.stack(errors)
+        return kernel
+    return _compiled(("ber", modulation, bits_per_symbol, num_symbols, num_snr, tuple(channels)), build)
+
+
+def ber_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels=("awgn", "rayleigh")):
+    """kernel(sigma[num_snr], num_valid, seed) -> bit errors [num_channels, num_snr]"""
+    kernel = _compiled_ber_kernel(modulation, bits_per_symbol, num_symbols, num_snr, tuple(channels))
+    return lambda sigma, num_valid, seed: kernel(_f32(sigma), tf.constant(num_valid, dtype=tf.int32), seed).numpy()
+
+
+def _compiled_ber_is_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels):
+    def build():
+        points = _points(modulation, bits_per_symbol)
+        slicer = _grid_slicer(modulation, bits_per_symbol)
+
+        def kernel(sigma, noise_scale, fade_scale, log_scale, num_valid, seed):
+            seeds = tf.random.experimental.stateless_split(seed, num=4)
+            idx = tf.random.stateless_uniform([num_symbols], seeds[0], minval=0,
+                                              maxval=points.shape[0], dtype=tf.int32)
+            tx = tf.gather(points, idx)
+            z = _complex_normal([num_symbols], seeds[1])
+            biased = tf.random.stateless_uniform([num_symbols], seeds[3]) >= IS_NOMINAL_FRACTION
+            valid = tf.range(num_symbols) < num_valid
+            z_power = tf.abs(z)**2
+            stats = []
+            if "awgn" in channels:
+                std = tf.where(biased[None, :], tf.sqrt(noise_scale)[:, None], 1.0)  # [num_snr, num_symbols]
+                rx = tx + tf.cast(sigma[:, None] * std, tf.complex64) * z
+                log_ratio = -tf.math.log(noise_scale)[:, None] + std**2 * z_power * (1 - 1 / noise_scale)[:, None]
+                errors = _symbol_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol)
+                stats.append(_is_weighted_errors(errors, log_ratio, valid, log_scale[:, None]))
+            if "rayleigh" in channels:
+                g = _complex_normal([num_symbols], seeds[2])
+                amp = tf.where(biased[None, :], tf.sqrt(1 / fade_scale)[:, None], 1.0)
+                h = tf.cast(amp, tf.complex64) * g
+                rx = (h * tx + tf.cast(sigma[:, None], tf.complex64) * z) / h
+                log_ratio = tf.math.log(fade_scale)[:, None] + amp**2 * tf.abs(g)**2 * (1 - fade_scale)[:, None]
+                errors = _symbol_bit_errors(_demodulate(points, rx, slicer), idx, bits_per_symbol)
+                stats.append(_is_weighted_errors(errors, log_ratio, valid))
+            return tf.stack(stats, axis=1)
+        return kernel
+    return _compiled(("ber_is", modulation, bits_per_symbol, num_symbols, num_snr, tuple(channels)), build)
+
+
+def ber_is_kernel(modulation, bits_per_symbol, num_symbols, num_snr, channels=("awgn", "rayleigh")):
+    """Importance-sampling variant of ``ber_kernel``.
+
+    AWGN rows inflate the noise variance by ``noise_scale``; Rayleigh rows
+    keep nominal noise and shrink the fading variance by ``1 / fade_scale``.
+    kernel(sigma, noise_scale, fade_scale, num_valid, seed) returns
+    ``[3, num_channels, num_snr]`` error statistics, see ``_is_weighted_errors``;
+    AWGN rows count weights in units of ``backends.is_log_scale(noise_scale)``.
+    """
+    kernel = _compiled_ber_is_kernel(modulation, bits_per_symbol, num_symbols, num_snr, tuple(channels))
+    return lambda sigma, noise_scale, fade_scale, num_valid, seed: kernel(
+        _f32(sigma), _f32(noise_scale), _f32(fade_scale),
+        tf.constant([is_log_scale(float(s)) for s in np.atleast_1d(noise_scale)], dtype=tf.float64),
+        tf.constant(num_valid, dtype=tf.int32), seed).numpy()
+
+
+def _compiled_mimo_kernel(num_symbols, num_rx_ant, num_tx_ant, importance):
+    def build():
+        const_points = tf.constant([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j], dtype=tf.complex64) / tf.cast(tf.sqrt(2.0), tf.complex64)
+
+        def kernel(sigma, fade_scale, noise_scale, num_valid, seed):
+            seeds = tf.random.experimental.stateless_split(seed, num=4)
+            # Random QPSK symbols, repeated on every transmit antenna
+            idx = tf.random.stateless_uniform([num_symbols], seeds[0], minval=0, maxval=4, dtype=tf.int32)
+            tx = tf.tile(tf.gather(const_points, idx)[:, None], [1, num_tx_ant])  # [num_symbols, num_tx_ant]
+
+            # Rayleigh fading channel and AWGN
+            h = _complex_normal([num_symbols, num_rx_ant, num_tx_ant], seeds[1])
+            z = _complex_normal([num_symbols, num_rx_ant], seeds[2])
+            if importance:
+                biased = tf.random.stateless_uniform([num_symbols], seeds[3]) >= IS_NOMINAL_FRACTION
+                amp = tf.where(biased, tf.sqrt(1 / fade_scale), 1.0)
+                column = tf.cast(tf.one_hot(0, num_tx_ant), tf.bool)
+                h = tf.where(column, tf.cast(amp, tf.complex64)[:, None, None] * h, h)
+                u = h[:, :, 0] / tf.cast(tf.norm(h[:, :, 0], axis=1, keepdims=True), tf.complex64)
+                z_par = tf.reduce_sum(tf.math.conj(u) * z, axis=1)
+                z_par_biased = tf.cast(tf.where(biased, tf.sqrt(noise_scale), 1.0), tf.complex64) * z_par
+                z = z + u * (z_par_biased - z_par)[:, None]
+            noise = z * tf.cast(sigma, tf.complex64)
+            y = tf.squeeze(tf.matmul(h, tx[:, :, None]), axis=-1) + noise
+
+            # Maximal Ratio Combining (MRC) on the first transmit antenna
+            h_total = h[:, :, 0]  # [num_symbols, num_rx_ant]
+            h_power = tf.reduce_sum(tf.abs(h_total)**2, axis=1)
+            combined = tf.reduce_sum(tf.math.conj(h_total) * y, axis=1) / tf.cast(h_power, tf.complex64)
+
+            # Hard decision (QPSK): bit labels are (idx // 2, idx % 2)
+            rx_idx = 2 * tf.cast(tf.math.real(combined) < 0, tf.int32) + tf.cast(tf.math.imag(combined) < 0, tf.int32)
+            valid = tf.range(num_symbols) < num_valid
+            if importance:
+                log_ratio = (num_rx_ant * tf.math.log(fade_scale) + h_power * (1 - fade_scale)
+                             - tf.math.log(noise_scale) + tf.abs(z_par_biased)**2 * (1 - 1 / noise_scale))
+                errors = _symbol_bit_errors(rx_idx, idx, 2)
+                return _is_weighted_errors(errors, log_ratio, valid)
+            return _bit_errors(rx_idx, idx, 2, valid)
+        return kernel
+    return _compiled(("mimo", num_symbols, num_rx_ant, num_tx_ant, importance), build)
+
+
+def mimo_kernel(num_symbols, num_rx_ant, num_tx_ant, importance=False):
+    """MRC kernel(sigma, fade_scale, noise_scale, num_valid, seed) returning the bit-error count.
+
+    Only the first ``num_valid`` symbols are counted, so the last chunk of
+    a streamed run reuses the same compiled shape.
+
+    With ``importance`` the combined channel column is drawn with power
+    ``1 / fade_scale`` and the noise component along it with power
+    ``noise_scale``; ``[3]`` IS error statistics are returned instead
+    (see ``_is_weighted_errors``). Noise orthogonal to the combining
+    direction does not affect the decision and stays nominal.
+    """
+    kernel = _compiled_mimo_kernel(num_symbols, num_rx_ant, num_tx_ant, importance)
+    return lambda sigma, fade_scale, noise_scale, num_valid, seed: kernel(
+        _f32(sigma), _f32(fade_scale), _f32(noise_scale), tf.constant(num_valid, dtype=tf.int32), seed).numpy()
+
+
+def _compiled_detector_kernel(num_symbols, num_rx_ant, num_tx_ant, detector, num_snr):
+    def build():
+        const_points = tf.constant([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j], dtype=tf.complex64) / tf.cast(tf.sqrt(2.0), tf.complex64)
+        if detector == "ml":
+            cand_idx = tf.constant(ml_candidates(num_tx_ant))
+            candidates = tf.gather(const_points, cand_idx)  # [num_candidates, num_tx_ant]
+
+        def kernel(sigma, num_valid, seed):
+            seeds = tf.random.experimental.stateless_split(seed, num=3)
+            # Independent QPSK streams, one per transmit antenna
+            idx = tf.random.stateless_uniform([num_symbols, num_tx_ant], seeds[0], minval=0, maxval=4, dtype=tf.int32)
+            x = tf.gather(const_points, idx)
+            h = _complex_normal([num_symbols, num_rx_ant, num_tx_ant], seeds[1])
+            z = _complex_normal([num_symbols, num_rx_ant], seeds[2])
+
+            # Matched filter H^H y = G x + sigma H^H z for every SNR point
+            h_adj = tf.linalg.adjoint(h)
+            gram = tf.matmul(h_adj, h)  # [num_symbols, num_tx_ant, num_tx_ant]
+            signal = tf.linalg.matvec(gram, x)
+            noise = tf.linalg.matvec(h_adj, z)
+            s = tf.cast(sigma, tf.complex64)[None, :, None]  # [1, num_snr, 1]
+
+            if detector == "zf":
+                # One Cholesky solve per channel; the SNR only scales its result
+                w = tf.linalg.cholesky_solve(tf.linalg.cholesky(gram), noise[:, :, None])[:, :, 0]
+                x_hat = x[:, None, :] + s * w[:, None, :]
+            elif detector == "mmse":
+                # (G + sigma^2 I)^-1 = V (L + sigma^2)^-1 V^H from one eigendecomposition
+                lam, v = tf.linalg.eigh(gram)
+                v_adj = tf.linalg.adjoint(v)
+                a = tf.linalg.matvec(v_adj, signal)[:, None, :]
+                b = tf.linalg.matvec(v_adj, noise)[:, None, :]
+                denom = tf.math.real(lam)[:, None, :] + (sigma**2)[None, :, None]
+                x_hat = tf.einsum("ntu,nku->nkt", v, (a + s * b) / tf.cast(denom, tf.complex64))
+            if detector == "ml":
+                # ||y - H c||^2 = const + c^H G c - 2 Re(c^H H^H y)
+                r = signal[:, None, :] + s * noise[:, None, :]
+                energy = tf.math.real(tf.einsum("ct,nts,cs->nc", tf.math.conj(candidates), gram, candidates))
+                corr = tf.math.real(tf.einsum("ct,nkt->nkc", tf.math.conj(candidates), r))
+                best = tf.argmin(energy[:, None, :] - 2 * corr, axis=-1, output_type=tf.int32)
+                rx_idx = tf.gather(cand_idx, best)  # [num_symbols, num_snr, num_tx_ant]
+            else:
+                # Hard decision (QPSK): bit labels are (idx // 2, idx % 2)
+                rx_idx = 2 * tf.cast(tf.math.real(x_hat) < 0, tf.int32) + tf.cast(tf.math.imag(x_hat) < 0, tf.int32)
+
+            errors = tf.reduce_sum(_symbol_bit_errors(rx_idx, idx[:, None, :], 2), axis=-1)
+            valid = tf.range(num_symbols) < num_valid
+            return tf.reduce_sum(tf.where(valid[:, None], errors, 0), axis=0)
+        return kernel
+    return _compiled(("detector", num_symbols, num_rx_ant, num_tx_ant, detector, num_snr), build)
+
+
+def detector_kernel(num_symbols, num_rx_ant, num_tx_ant, detector, num_snr):
+    """Spatial-multiplexing kernel(sigma[num_snr], num_valid, seed) -> bit errors [num_snr].
+
+    Every transmit antenna sends its own QPSK stream and ``detector``
+    ("zf", "mmse" or "ml") separates them. Channel and noise draws are
+    shared by all SNR points, so each channel is factorized once: a
+    Cholesky solve of the Gram matrix for ZF, its eigendecomposition for
+    MMSE, and the candidate energies ``c^H G c`` for ML.
+    """
+    kernel = _compiled_detector_kernel(num_symbols, num_rx_ant, num_tx_ant, detector, num_snr)
+    return lambda sigma, num_valid, seed: kernel(_f32(sigma), tf.constant(num_valid, dtype=tf.int32), seed).numpy()
+
+
+def warm_kernels(shapes=None):
+    """Trace and compile the simulation kernels for common request shapes.
+
+    Called by the MCP server at startup so the first interactive request
+    does not pay the tracing cost. Returns the number of kernels warmed.
+    """
+    seeds = seed_stream(0)
+    for shape in shapes or _WARM_SHAPES:
+        if shape["kind"] == "constellation":
+            kernel = constellation_kernel(shape["modulation"], shape["bits_per_symbol"],
+                                          shape["num_symbols"], shape["num_snr"])
+            kernel(np.ones(shape["num_snr"]), next(seeds))
+        elif shape["kind"] == "ber":
+            kernel = ber_kernel(shape["modulation"], shape["bits_per_symbol"],
+                                shape["num_symbols"], shape["num_snr"])
+            kernel(np.ones(shape["num_snr"]), shape["num_symbols"], next(seeds))
+        elif shape["kind"] == "mimo":
+            kernel = mimo_kernel(shape["num_symbols"], shape["num_rx_ant"], shape["num_tx_ant"])
+            kernel(1.0, 1.0, 1.0, shape["num_symbols"], next(seeds))
+        elif shape["kind"] == "detector":
+            kernel = detector_kernel(shape["num_symbols"], shape["num_rx_ant"], shape["num_tx_ant"],
+                                     shape["detector"], shape["num_snr"])
+            kernel(np.ones(shape["num_snr"]), shape["num_symbols"], next(seeds))
+    return len(shapes or _WARM_SHAPES)
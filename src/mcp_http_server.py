@@ -1,10 +1,75 @@
 """HTTP wrapper for MCP Server"""
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+import glob
+import importlib
+import inspect
+import threading
+import time
 from flask import Flask, request, jsonify
-import sionna_tools
+from backends import backend_name
+from result_cache import ResultCache, cache_key, code_version
+from array_codec import ARRAY_FORMATS, encode_array, format_arrays
+from radiomap_pool import default_pool
+from artifact_store import default_artifact_store
+from radio_maps import default_grid_store
+from sample_store import default_store
 
 app = Flask(__name__)
+_START_TIME = time.time()
+
+# Tools are served by sionna_tools; the link-level ones also need their
+# simulation backend (TensorFlow by default). Nothing heavy is imported
+# until a tool is first called or the background pre-import reaches it.
+_TOOL_MODULES = {
+    name: "sionna_tools" for name in [
+        "simulate_constellation", "simulate_ber", "simulate_radio_map", "simulate_multi_radio_map", "query_radio_map",
+        "optimize_tx_placement", "evaluate_links",
+        "list_available_tools", "simulate_ber_mimo", "compare_mimo_performance", "sweep_tx_antennas",
+    ]
+}
+_BACKEND_TOOLS = {
+    "simulate_constellation", "simulate_ber", "simulate_ber_mimo", "compare_mimo_performance", "sweep_tx_antennas",
+}
+# Import times are per module and per backend: every tool of a module
+# becomes available with its first import
+_MODULE_STATUS = {}
+_BACKEND_STATUS = {}
+_IMPORT_LOCK = threading.Lock()
+
+# Results of repeated calls are served from a content-addressed cache
+# (MCP_CACHE=0 disables it). Unseeded calls are cached too; a request with
+# "cache": false draws fresh samples. Tools that write a plot only hit
+# when the file still exists.
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+_UNCACHED_TOOLS = {"list_available_tools"}
+_CACHE = None
+if os.environ.get("MCP_CACHE", "1") == "1":
+    _CACHE = ResultCache(
+        os.environ.get("MCP_CACHE_DIR", os.path.join(_SRC_DIR, "..", ".cache", "results")) or None,
+        memory_entries=int(os.environ.get("MCP_CACHE_MEMORY_ENTRIES", "256")),
+        disk_bytes=int(float(os.environ.get("MCP_CACHE_DISK_MB", "512")) * (1 << 20)),
+    )
+_CODE_VERSION = None
+
+
+def _load_tool(name, backend=None):
+    """Import the modules behind ``name`` on first use and record the import time"""
+    module_name = _TOOL_MODULES[name]
+    with _IMPORT_LOCK:
+        start = time.time()
+        module = importlib.import_module(module_name)
+        if module_name not in _MODULE_STATUS:
+            _MODULE_STATUS[module_name] = {"import_seconds": round(time.time() - start, 3),
+                                           "loaded_at": round(time.time() - _START_TIME, 3)}
+        if name in _BACKEND_TOOLS:
+            backend = backend_name(backend)
+            if backend not in _BACKEND_STATUS:
+                start = time.time()
+                module.get_backend(backend)
+                _BACKEND_STATUS[backend] = {"import_seconds": round(time.time() - start, 3),
+                                            "loaded_at": round(time.time() - _START_TIME, 3)}
+    return module
 
 @app.route('/tools', methods=['GET'])
 def list_tools():
@@ -20,7 +85,12 @@ def list_tools():
                         "modulation": {"type": "string", "enum": ["qam", "pam", "psk"], "default": "qam"},
                         "bits_per_symbol": {"type": "integer", "minimum": 1, "maximum": 8, "default": 2},
                         "num_symbols": {"type": "integer", "default": 2000},
-                        "snr_db_list": {"type": "array", "items": {"type": "number"}, "default": [-5, 15]}
+                        "snr_db_list": {"type": "array", "items": {"type": "number"}, "default": [-5, 15]},
+                        "seed": {"type": "integer", "description": "Optional seed for reproducible results"},
+                        "backend": {"type": "string", "enum": ["tensorflow", "numpy"], "description": "Simulation kernels: tensorflow (XLA-compiled) or numpy (no TensorFlow needed); defaults to SIONNA_TOOLS_BACKEND or tensorflow"},
+                        "statistics": {"type": "boolean", "default": False, "description": "Also report EVM, MER, per-point cluster centroid and covariance, and a 2D density histogram, accumulated in fixed-size chunks"},
+                        "return_samples": {"type": "boolean", "default": True, "description": "Include the raw received samples; disable with statistics for large num_symbols"},
+                        "histogram_bins": {"type": "integer", "minimum": 1, "default": 64, "description": "Bins per axis of the statistics density histogram"}
                     }
                 }
             },
@@ -30,11 +100,23 @@ def list_tools():
                 "inputSchema": {
                     "type": "object",
                     "properties": {
+                        "resume": {"type": "boolean", "default": False, "description": "Continue from the error and bit counts stored for this configuration: only missing SNR points and extra bits are simulated, and interrupted runs pick up where they stopped"},
                         "modulation": {"type": "string", "enum": ["qam", "pam", "psk"], "default": "qam"},
                         "bits_per_symbol": {"type": "integer", "minimum": 1, "maximum": 8, "default": 2},
                         "snr_db_list": {"type": "array", "items": {"type": "number"}, "default": [-5, 15]},
                         "num_bits": {"type": "integer", "default": 100000},
-                        "channels": {"type": "array", "items": {"type": "string"}, "default": ["awgn", "rayleigh"]}
+                        "channels": {"type": "array", "items": {"type": "string"}, "default": ["awgn", "rayleigh"]},
+                        "target_errors": {"type": "integer", "description": "Stop each SNR point once this many bit errors were counted"},
+                        "target_ci_width": {"type": "number", "description": "Stop each SNR point once the confidence interval width relative to the BER drops below this value"},
+                        "max_bits": {"type": "integer", "description": "Bit budget per SNR point in early-stopping mode (defaults to num_bits)"},
+                        "batch_bits": {"type": "integer", "default": 10000},
+                        "seed": {"type": "integer", "description": "Optional seed for reproducible results"},
+                        "importance_sampling": {"type": "boolean", "default": False, "description": "Estimate very small BERs by biased sampling and reweighting; reports the estimator variance per point"},
+                        "method": {"type": "string", "enum": ["montecarlo", "analytic", "hybrid"], "default": "montecarlo", "description": "analytic: closed-form BER without simulation (square QAM/PAM); hybrid: Monte Carlo with per-point bit budgets derived from the analytic BER"},
+                        "adaptive_snr": {"type": "boolean", "default": False, "description": "Place SNR points automatically: a coarse grid refined where the BER curve bends, not extended below ber_floor"},
+                        "snr_range": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2, "description": "[min, max] SNR in dB for adaptive_snr (defaults to the span of snr_db_list)"},
+                        "ber_floor": {"type": "number", "default": 1e-5, "description": "adaptive_snr stops extending the grid once every BER is below this value"},
+                        "backend": {"type": "string", "enum": ["tensorflow", "numpy"], "description": "Simulation kernels: tensorflow (XLA-compiled) or numpy (no TensorFlow needed); defaults to SIONNA_TOOLS_BACKEND or tensorflow"}
                     }
                 }
             },
@@ -46,7 +128,11 @@ def list_tools():
                     "properties": {
                         "tx_position": {"type": "array", "items": {"type": "number"}, "default": [0, 0, 0]},
                         "rx_position": {"type": "array", "items": {"type": "number"}, "default": [100, 0, 0]},
-                        "metric": {"type": "string", "enum": ["rss", "path_gain", "sinr"], "default": "rss"}
+                        "metric": {"type": "string", "enum": ["rss", "path_gain", "sinr"], "default": "rss"},
+                        "quality": {"type": "string", "enum": ["preview", "standard", "final"], "default": "standard", "description": "Ray-tracing tier: preview (depth 2, 1e5 samples, 4 m cells), standard (depth 3, 1e6, 2 m) or final (depth 5, 1e7, 1 m)"},
+                        "progressive": {"type": "boolean", "default": False, "description": "Return a low-sample map at once and keep refining the same plot file in the background until the tier's samples are reached (see refining in the result)"},
+                        "max_cells": {"type": "integer", "minimum": 1, "description": "Cell budget of the map (default 4194304); the cell size is doubled until the map fits"},
+                        "tiled": {"type": "boolean", "description": "Trace the map as 512x512-cell tiles in parallel workers, cached per tile and stitched into one map (default: maps larger than one tile)"}
                     }
                 }
             },
@@ -58,10 +144,72 @@ def list_tools():
                     "properties": {
                         "tx_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}, "default": [[0, 0, 0]]},
                         "rx_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}, "default": [[100, 0, 0]]},
-                        "metric": {"type": "string", "enum": ["rss", "path_gain", "sinr"], "default": "rss"}
+                        "metric": {"type": "string", "enum": ["rss", "path_gain", "sinr"], "default": "rss"},
+                        "tx_power_dbm": {"type": ["number", "array"], "items": {"type": "number"}, "description": "Transmit power in dBm, one value for all or one per transmitter (default 44 dBm); changing it needs no ray tracing"},
+                        "area": {"type": "array", "items": {"type": "number"}, "minItems": 4, "maxItems": 4, "description": "Fixed map extent [min_x, min_y, max_x, max_y] in metres; with a fixed area, maps of any subset of already traced transmitters are combined without ray tracing"},
+                        "quality": {"type": "string", "enum": ["preview", "standard", "final"], "default": "standard", "description": "Ray-tracing tier: preview (depth 2, 1e5 samples, 4 m cells), standard (depth 3, 1e6, 2 m) or final (depth 5, 1e7, 1 m)"},
+                        "progressive": {"type": "boolean", "default": False, "description": "Return a low-sample map at once and keep refining the same plot file in the background until the tier's samples are reached (see refining in the result)"},
+                        "max_cells": {"type": "integer", "minimum": 1, "description": "Cell budget of the map (default 4194304); the cell size is doubled until the map fits"},
+                        "tiled": {"type": "boolean", "description": "Trace the map as 512x512-cell tiles in parallel workers, cached per tile and stitched into one map (default: maps larger than one tile)"}
                     }
                 }
             },
+            {
+                "name": "optimize_tx_placement",
+                "description": "Find the transmitter layout that maximizes mean SINR, coverage or throughput by greedy and local search over candidate sites; each site is ray traced once and cached",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "area": {"type": "array", "items": {"type": "number"}, "minItems": 4, "maxItems": 4, "description": "Service area [min_x, min_y, max_x, max_y] in metres"},
+                        "num_tx": {"type": "integer", "minimum": 1, "default": 4, "description": "Most transmitters to place; fewer are placed when another site would lower the objective"},
+                        "objective": {"type": "string", "enum": ["mean_sinr", "coverage", "throughput"], "default": "mean_sinr", "description": "Mean best-server SINR (dB), share of cells with SINR >= sinr_threshold_db, or mean log2(1+SINR)"},
+                        "candidate_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}, "description": "Candidate sites [x, y, z]; default is a grid over area"},
+                        "candidate_spacing": {"type": "number", "default": 50.0, "description": "Spacing of the candidate grid in metres"},
+                        "tx_height": {"type": "number", "default": 10.0},
+                        "rx_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}, "description": "Transmitters point at the first position (default: centre of area)"},
+                        "sinr_threshold_db": {"type": "number", "default": 0.0},
+                        "tx_power_dbm": {"type": "number", "description": "Transmit power per site (default 44 dBm)"},
+                        "max_passes": {"type": "integer", "default": 10, "description": "Local-search swap passes after the greedy start"},
+                        "max_cells": {"type": "integer", "default": 65536, "description": "Map cells scored during the search (strided subset)"},
+                        "num_workers": {"type": "integer", "minimum": 1, "description": "Threads scoring candidates (defaults to SIONNA_TOOLS_WORKERS or 1)"},
+                        "quality": {"type": "string", "enum": ["preview", "standard", "final"], "default": "standard", "description": "Radio-map tier the candidate sites are traced at"}
+                    },
+                    "required": ["area"]
+                }
+            },
+            {
+                "name": "evaluate_links",
+                "description": "Path gain, RSS, SNR, mean delay and RMS delay spread of TX-RX links at specific positions from one batched PathSolver run (much cheaper than a radio map); metrics are [num_tx, num_rx] arrays or one value per pair",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "tx_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}},
+                        "rx_positions": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}},
+                        "pairs": {"type": "array", "items": {"type": "array", "items": {"type": "integer"}, "minItems": 2, "maxItems": 2}, "description": "[tx_index, rx_index] links to report; default every TX-RX combination"},
+                        "tx_power_dbm": {"type": ["number", "array"], "items": {"type": "number"}, "description": "Transmit power in dBm, one value for all or one per transmitter (default 44 dBm)"},
+                        "max_depth": {"type": "integer", "minimum": 0, "default": 5},
+                        "samples_per_src": {"type": "integer", "default": 1000000},
+                        "seed": {"type": "integer", "default": 41}
+                    },
+                    "required": ["tx_positions", "rx_positions"]
+                }
+            },
+            {
+                "name": "query_radio_map",
+                "description": "Values at given positions, percentiles, CDF and threshold coverage of a radio map already computed by simulate_radio_map or simulate_multi_radio_map (no ray tracing)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "grid_key": {"type": "string", "description": "grid_key from a radio-map result"},
+                        "metric": {"type": "string", "enum": ["rss", "path_gain", "sinr"], "default": "sinr"},
+                        "points": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}, "description": "[x, y, z] positions in metres to read the best-server value at"},
+                        "percentiles": {"type": "array", "items": {"type": "number"}, "default": [5, 50, 95]},
+                        "thresholds": {"type": "array", "items": {"type": "number"}, "description": "Coverage thresholds in dB (dBm for rss); reports the fraction of cells at or above each"},
+                        "cdf_points": {"type": "integer", "default": 21}
+                    },
+                    "required": ["grid_key"]
+                }
+            },
             {
                 "name": "list_available_tools",
                 "description": "List all available simulation tools and their descriptions",
@@ -76,9 +224,21 @@ def list_tools():
                 "inputSchema": {
                     "type": "object",
                     "properties": {
+                        "resume": {"type": "boolean", "default": False, "description": "Continue from the error and bit counts stored for this configuration: only missing SNR points and extra bits are simulated, and interrupted runs pick up where they stopped"},
                         "num_tx_ant": {"type": "integer", "minimum": 1, "default": 1},
                         "num_rx_ant": {"type": "integer", "minimum": 1, "default": 1},
-                        "num_bits": {"type": "integer", "default": 100000}
+                        "num_bits": {"type": "integer", "default": 100000},
+                        "seed": {"type": "integer", "description": "Optional seed for reproducible results"},
+                        "importance_sampling": {"type": "boolean", "default": False, "description": "Estimate very small BERs by biased sampling and reweighting; reports the estimator variance per point"},
+                        "method": {"type": "string", "enum": ["montecarlo", "analytic", "hybrid"], "default": "montecarlo", "description": "analytic: closed-form MRC BER (num_tx_ant=1 only); hybrid: Monte Carlo with per-point bit budgets derived from the analytic BER"},
+                        "return_stats": {"type": "boolean", "default": False, "description": "Return {ber, stats} with per-point bit counts and confidence bounds"},
+                        "snr_db_list": {"type": "array", "items": {"type": "number"}, "description": "SNR points in dB (default 0 to 20 in steps of 2)"},
+                        "adaptive_snr": {"type": "boolean", "default": False, "description": "Place SNR points automatically: a coarse grid refined where the BER curve bends, not extended below ber_floor"},
+                        "snr_range": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2, "description": "[min, max] SNR in dB for adaptive_snr (default [0, 20])"},
+                        "ber_floor": {"type": "number", "default": 1e-5, "description": "adaptive_snr stops extending the grid once every BER is below this value"},
+                        "backend": {"type": "string", "enum": ["tensorflow", "numpy"], "description": "Simulation kernels: tensorflow (XLA-compiled) or numpy (no TensorFlow needed); defaults to SIONNA_TOOLS_BACKEND or tensorflow"},
+                        "chunk_symbols": {"type": "integer", "minimum": 1, "description": "Symbols simulated per chunk; bounds peak memory independently of num_bits"},
+                        "detector": {"type": "string", "enum": ["mrc", "zf", "mmse", "ml"], "default": "mrc", "description": "mrc: same symbol on every TX antenna; zf/mmse/ml: one QPSK stream per TX antenna (spatial multiplexing, ml for at most 4 TX antennas)"}
                     }
                 }
             },
@@ -88,9 +248,17 @@ def list_tools():
                 "inputSchema": {
                     "type": "object",
                     "properties": {
+                        "resume": {"type": "boolean", "default": False, "description": "Continue from the error and bit counts stored for this configuration: only missing SNR points and extra bits are simulated, and interrupted runs pick up where they stopped"},
                         "siso_config": {"type": "array", "items": {"type": "integer"}, "default": [1, 1]},
                         "mimo_config": {"type": "array", "items": {"type": "integer"}, "default": [2, 2]},
-                        "num_bits": {"type": "integer", "default": 100000}
+                        "num_bits": {"type": "integer", "default": 100000},
+                        "seed": {"type": "integer", "description": "Optional seed for reproducible results"},
+                        "importance_sampling": {"type": "boolean", "default": False, "description": "Estimate very small BERs by biased sampling and reweighting; reports the estimator variance per point"},
+                        "method": {"type": "string", "enum": ["montecarlo", "analytic", "hybrid"], "default": "montecarlo", "description": "analytic: closed-form MRC BER (num_tx_ant=1 only); hybrid: Monte Carlo with per-point bit budgets derived from the analytic BER"},
+                        "backend": {"type": "string", "enum": ["tensorflow", "numpy"], "description": "Simulation kernels: tensorflow (XLA-compiled) or numpy (no TensorFlow needed); defaults to SIONNA_TOOLS_BACKEND or tensorflow"},
+                        "num_workers": {"type": "integer", "minimum": 1, "description": "Processes to spread the configurations over (results are identical to a serial run for a given seed)"},
+                        "chunk_symbols": {"type": "integer", "minimum": 1, "description": "Symbols simulated per chunk; bounds peak memory per worker independently of num_bits"},
+                        "detector": {"type": "string", "enum": ["mrc", "zf", "mmse", "ml"], "default": "mrc", "description": "mrc: same symbol on every TX antenna; zf/mmse/ml: one QPSK stream per TX antenna (spatial multiplexing, ml for at most 4 TX antennas)"}
                     }
                 }
             },
@@ -100,58 +268,189 @@ def list_tools():
                 "inputSchema": {
                     "type": "object",
                     "properties": {
+                        "resume": {"type": "boolean", "default": False, "description": "Continue from the error and bit counts stored for this configuration: only missing SNR points and extra bits are simulated, and interrupted runs pick up where they stopped"},
                         "tx_antenna_list": {"type": "array", "items": {"type": "integer"}, "default": [1, 2, 4, 8]},
                         "num_rx_ant": {"type": "integer", "default": 16},
-                        "num_bits": {"type": "integer", "default": 200000}
+                        "num_bits": {"type": "integer", "default": 200000},
+                        "seed": {"type": "integer", "description": "Optional seed for reproducible results"},
+                        "importance_sampling": {"type": "boolean", "default": False, "description": "Estimate very small BERs by biased sampling and reweighting; reports the estimator variance per point"},
+                        "method": {"type": "string", "enum": ["montecarlo", "analytic", "hybrid"], "default": "montecarlo", "description": "analytic: closed-form MRC BER (num_tx_ant=1 only); hybrid: Monte Carlo with per-point bit budgets derived from the analytic BER"},
+                        "backend": {"type": "string", "enum": ["tensorflow", "numpy"], "description": "Simulation kernels: tensorflow (XLA-compiled) or numpy (no TensorFlow needed); defaults to SIONNA_TOOLS_BACKEND or tensorflow"},
+                        "num_workers": {"type": "integer", "minimum": 1, "description": "Processes to spread the configurations over (results are identical to a serial run for a given seed)"},
+                        "chunk_symbols": {"type": "integer", "minimum": 1, "description": "Symbols simulated per chunk; bounds peak memory per worker independently of num_bits"},
+                        "detector": {"type": "string", "enum": ["mrc", "zf", "mmse", "ml"], "default": "mrc", "description": "mrc: same symbol on every TX antenna; zf/mmse/ml: one QPSK stream per TX antenna (spatial multiplexing, ml for at most 4 TX antennas)"}
                     }
                 }
             }
         ]
     })
 
+def _code_version():
+    """Hash of the simulation sources; results computed by other code never hit"""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        # Every source file, so new modules cannot be forgotten
+        paths = glob.glob(os.path.join(_SRC_DIR, "*.py"))
+        paths += glob.glob(os.path.join(_SRC_DIR, "backends", "*.py"))
+        paths += glob.glob(os.path.join(_SRC_DIR, "utils", "*.py"))
+        paths += glob.glob(os.path.join(_SRC_DIR, "..", "scripts", "*.py"))
+        _CODE_VERSION = code_version(paths)
+    return _CODE_VERSION
+
+
+def _result_key(tool_name, arguments, module):
+    """Cache key of a call, with defaults filled in so omitted and explicit defaults match"""
+    bound = inspect.signature(getattr(module, tool_name)).bind(**arguments)
+    bound.apply_defaults()
+    normalized = dict(bound.arguments)
+    if "backend" in normalized:
+        normalized["backend"] = backend_name(normalized["backend"])
+    return cache_key(tool_name, normalized, _code_version())
+
+
+def _cached_result_valid(result):
+    """Plots and radio maps referenced by a cached result must still be stored; a hit counts as a use of both"""
+    if not (isinstance(result, dict) and "plot_path" in result):
+        return True
+    if "grid_key" in result and not default_grid_store().touch(result["grid_key"]):
+        return False
+    if "plot_key" in result:
+        return default_artifact_store().touch(result["plot_path"])
+    return os.path.exists(result["plot_path"])
+
+
 @app.route('/tools/call', methods=['POST'])
 def call_tool():
-    """Execute a tool"""
+    """Execute a tool, serving repeated calls from the result cache.
+
+    Sample arrays are returned as nested ``[re, im]`` lists unless the
+    request asks for ``"arrays": "base64"`` or ``"zlib"`` (see ``array_codec``).
+    """
     data = request.json
     tool_name = data.get('name')
     arguments = data.get('arguments', {})
+    array_format = data.get('arrays', 'lists')
     
+    if tool_name not in _TOOL_MODULES:
+        return jsonify({"error": f"Unknown tool: {tool_name}"}), 400
+    if array_format not in ARRAY_FORMATS:
+        return jsonify({"error": f"Unknown array format: {array_format} (choose from {', '.join(ARRAY_FORMATS)})"}), 400
+
     try:
-        if tool_name == "simulate_constellation":
-            result = sionna_tools.simulate_constellation(**arguments)
-            # Convert numpy arrays and complex numbers to lists
-            result["constellation"] = [[float(x.real), float(x.imag)] for x in result["constellation"]]
-            for snr in result["snr_levels"]:
-                result["snr_levels"][snr] = [[float(x.real), float(x.imag)] for x in result["snr_levels"][snr]]
-        elif tool_name == "simulate_ber":
-            result = sionna_tools.simulate_ber(**arguments)
-        elif tool_name == "simulate_radio_map":
-            result = sionna_tools.simulate_radio_map(**arguments)
-        elif tool_name == "simulate_multi_radio_map":
-            result = sionna_tools.simulate_multi_radio_map(**arguments)
-        elif tool_name == "list_available_tools":
-            result = sionna_tools.list_available_tools()
-        elif tool_name == "simulate_ber_mimo":
-            result = sionna_tools.simulate_ber_mimo(**arguments)
-            result = {int(k): float(v) for k, v in result.items()}
-        elif tool_name == "compare_mimo_performance":
-            result = sionna_tools.compare_mimo_performance(**arguments)
-            result["siso"]["ber"] = {int(k): float(v) for k, v in result["siso"]["ber"].items()}
-            result["mimo"]["ber"] = {int(k): float(v) for k, v in result["mimo"]["ber"].items()}
-        elif tool_name == "sweep_tx_antennas":
-            result = sionna_tools.sweep_tx_antennas(**arguments)
-            for config_name in result["results"]:
-                result["results"][config_name]["ber"] = {int(k): float(v) for k, v in result["results"][config_name]["ber"].items()}
-            result["best_ber_at_10dB"] = float(result["best_ber_at_10dB"])
-        else:
+        sionna_tools = _load_tool(tool_name, arguments.get("backend"))
+        key = None
+        # Resumed runs depend on the stored sample counts, not just their
+        # arguments, and progressive maps on the refinement state
+        if (_CACHE is not None and tool_name not in _UNCACHED_TOOLS and data.get("cache", True)
+                and not arguments.get("resume") and not arguments.get("progressive")):
+            key = _result_key(tool_name, arguments, sionna_tools)
+            result = _CACHE.get(key)
+            if result is not None and _cached_result_valid(result):
+                return jsonify({"result": format_arrays(result, array_format), "cached": True})
+        result = _run_tool(sionna_tools, tool_name, arguments)
+        if result is None:
             return jsonify({"error": f"Unknown tool: {tool_name}"}), 400
-        
-        return jsonify({"result": result})
+        if key is not None:
+            _CACHE.put(key, result)
+        return jsonify({"result": format_arrays(result, array_format)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+def _run_tool(sionna_tools, tool_name, arguments):
+    """Call ``tool_name`` and convert its result to JSON-compatible types.
+
+    Arrays are kept as base64 buffers here, which is also what the result
+    cache stores; ``call_tool`` converts them to the client's format.
+    """
+    if tool_name == "simulate_constellation":
+        result = sionna_tools.simulate_constellation(**arguments)
+        result["constellation"] = encode_array(result["constellation"])
+        for snr in result.get("snr_levels", {}):
+            result["snr_levels"][snr] = encode_array(result["snr_levels"][snr])
+        for level in result.get("statistics", {}).values():
+            level["histogram"]["counts"] = encode_array(level["histogram"]["counts"])
+    elif tool_name == "simulate_ber":
+        result = sionna_tools.simulate_ber(**arguments)
+    elif tool_name == "simulate_radio_map":
+        result = sionna_tools.simulate_radio_map(**arguments)
+    elif tool_name == "simulate_multi_radio_map":
+        result = sionna_tools.simulate_multi_radio_map(**arguments)
+    elif tool_name == "optimize_tx_placement":
+        result = sionna_tools.optimize_tx_placement(**arguments)
+    elif tool_name == "query_radio_map":
+        result = sionna_tools.query_radio_map(**arguments)
+    elif tool_name == "evaluate_links":
+        result = sionna_tools.evaluate_links(**arguments)
+        result["links"] = {name: encode_array(values) for name, values in result["links"].items()}
+    elif tool_name == "list_available_tools":
+        result = sionna_tools.list_available_tools()
+    elif tool_name == "simulate_ber_mimo":
+        result = sionna_tools.simulate_ber_mimo(**arguments)
+        if arguments.get("return_stats"):
+            result["ber"] = {k: float(v) for k, v in result["ber"].items()}
+        else:
+            result = {k: float(v) for k, v in result.items()}
+    elif tool_name == "compare_mimo_performance":
+        result = sionna_tools.compare_mimo_performance(**arguments)
+        result["siso"]["ber"] = {int(k): float(v) for k, v in result["siso"]["ber"].items()}
+        result["mimo"]["ber"] = {int(k): float(v) for k, v in result["mimo"]["ber"].items()}
+    elif tool_name == "sweep_tx_antennas":
+        result = sionna_tools.sweep_tx_antennas(**arguments)
+        for config_name in result["results"]:
+            result["results"][config_name]["ber"] = {int(k): float(v) for k, v in result["results"][config_name]["ber"].items()}
+        result["best_ber_at_10dB"] = float(result["best_ber_at_10dB"])
+    else:
+        return None
+    return result
+
+@app.route('/tools/status', methods=['GET'])
+def tools_status():
+    """Report which modules and backends are imported and how long each took"""
+    return jsonify({
+        "uptime_seconds": round(time.time() - _START_TIME, 3),
+        "tools": {name: {"module": module, "loaded": module in _MODULE_STATUS, "needs_backend": name in _BACKEND_TOOLS}
+                  for name, module in _TOOL_MODULES.items()},
+        "modules": _MODULE_STATUS,
+        "backends": _BACKEND_STATUS,
+        "cache": _CACHE.stats() if _CACHE is not None else None,
+        "radio_map_workers": default_pool().stats(),
+        "artifacts": default_artifact_store().stats(),
+        "radio_map_store": default_grid_store().stats(),
+        "sample_store": default_store().stats(),
+    })
+
+@app.route('/cache', methods=['GET', 'DELETE'])
+def cache_status():
+    """Report result-cache counters, or clear the cache with DELETE"""
+    if _CACHE is None:
+        return jsonify({"enabled": False})
+    if request.method == 'DELETE':
+        _CACHE.clear()
+    return jsonify(dict(_CACHE.stats(), enabled=True))
+
+def _background_start(preimport, warm, warm_radio_map):
+    """Import every tool (and compile the common kernels) ahead of the first request"""
+    if warm_radio_map:
+        # Workers load Sionna RT and the scene in their own processes
+        default_pool().start()
+    start = time.time()
+    if preimport or warm:
+        for name in _TOOL_MODULES:
+            _load_tool(name)
+        print(f"Imported {len(_TOOL_MODULES)} tools in {time.time() - start:.1f}s")
+    if warm:
+        start = time.time()
+        count = _load_tool("simulate_ber").warm_kernels()
+        print(f"Warmed {count} simulation kernels in {time.time() - start:.1f}s")
+
+
 if __name__ == '__main__':
     import os
     os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    preimport = os.environ.get("MCP_PREIMPORT", "1") == "1"
+    warm = os.environ.get("MCP_WARM_KERNELS", "1") == "1"
+    warm_radio_map = os.environ.get("MCP_WARM_RADIOMAP", "1") == "1"
+    threading.Thread(target=_background_start, args=(preimport, warm, warm_radio_map), daemon=True).start()
     print("Starting MCP HTTP server on port 5001...")
     app.run(host='127.0.0.1', port=5001, debug=False, use_reloader=False)
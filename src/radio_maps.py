@@ -0,0 +1,746 @@
+"""Numeric radio-map grids: layout, on-disk store and rendering.
+
+``scripts/run_radiomap.py`` saves the path gain, RSS and SINR that
+``RadioMapSolver`` computes for every transmitter as float32 ``.npy``
+files next to a ``meta.json`` header. Entries are keyed by the scene,
+the TX/RX positions and the solver parameters, but not by the metric,
+so a map traced once can be re-rendered as any metric from NumPy alone,
+without Sionna RT. Solver parameters come from a quality tier
+(``QUALITY_TIERS``), and per-transmitter path gains accumulate samples
+across runs, so a progressive map refines its earlier stages instead of
+starting over. ``RadioMapView`` answers point lookups and coverage
+statistics from memory maps of the stored files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+METRICS = ("path_gain", "rss", "sinr")
+# load_scene() without a file loads Sionna's empty scene
+SCENE = "empty"
+# Solver settings per quality tier; "standard" is what every map used
+# before tiers existed
+QUALITY_TIERS = {
+    "preview": {"max_depth": 2, "samples_per_tx": 10**5, "cell_size": [4.0, 4.0]},
+    "standard": {"max_depth": 3, "samples_per_tx": 10**6, "cell_size": [2.0, 2.0]},
+    "final": {"max_depth": 5, "samples_per_tx": 10**7, "cell_size": [1.0, 1.0]},
+}
+DEFAULT_QUALITY = "standard"
+# Progressive maps trace these shares of the tier's samples in turn,
+# accumulating into the stored path gains; the first stage is meant to
+# finish in about a second
+PROGRESSIVE_FRACTIONS = (0.01, 0.1, 1.0)
+_MIN_STAGE_SAMPLES = 10**4
+# Statistics read at most this many values per block and bin dB values at
+# this resolution over these ranges
+_BLOCK_CELLS = 1 << 22
+_HIST_RESOLUTION_DB = 0.05
+_HIST_RANGE_DB = {"path_gain": (-250.0, 50.0), "rss": (-250.0, 100.0), "sinr": (-150.0, 150.0)}
+# Map extent beyond the outermost TX/RX (m) and the height of the map plane
+_MARGIN = 50.0
+_PLANE_HEIGHT = 1.5
+# Cells per transmitter of one map; above it the tier's cell size is
+# doubled until the map fits
+DEFAULT_MAX_CELLS = 1 << 22
+# Tiles are TILE_CELLS x TILE_CELLS cells on a lattice anchored at the
+# world origin, so overlapping layouts share their interior tiles
+TILE_CELLS = 512
+
+_KEY_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+_COLORBAR_LABELS = {
+    "path_gain": "Path gain [dB]",
+    "rss": "Received signal strength (RSS) [dBm]",
+    "sinr": "SINR [dB]",
+}
+
+
+def budget_cell_size(size: Sequence[float], cell_size: Sequence[float], max_cells: int) -> List[float]:
+    """``cell_size`` doubled until a ``size`` map has at most ``max_cells`` cells"""
+    cell_x, cell_y = float(cell_size[0]), float(cell_size[1])
+    while math.ceil(size[0] / cell_x) * math.ceil(size[1] / cell_y) > max(1, int(max_cells)):
+        cell_x, cell_y = 2 * cell_x, 2 * cell_y
+    return [cell_x, cell_y]
+
+
+def map_layout(tx_positions: List[List[float]], rx_positions: List[List[float]],
+               cell_size: Tuple[float, float], area: Optional[Sequence[float]] = None,
+               max_cells: Optional[int] = None, tiled: Optional[bool] = None) -> Dict[str, Any]:
+    """Map plane covering all TX and RX positions plus a margin, or ``area`` = [min_x, min_y, max_x, max_y].
+
+    Cells are coarsened to stay within ``max_cells`` (default
+    ``DEFAULT_MAX_CELLS``). A ``tiled`` map (default: one larger than a
+    tile) is snapped outward to the cell lattice and carries
+    ``tile_cells``; see ``tile_layouts``. A map no wider and no taller
+    than one tile is never tiled, since tiling would only split one trace
+    into several.
+    """
+    if area is not None:
+        min_x, min_y, max_x, max_y = (float(v) for v in area)
+    else:
+        all_points = list(tx_positions) + list(rx_positions)
+        xs = [p[0] for p in all_points]
+        ys = [p[1] for p in all_points]
+        min_x, max_x = min(xs) - _MARGIN, max(xs) + _MARGIN
+        min_y, max_y = min(ys) - _MARGIN, max(ys) + _MARGIN
+    cell_x, cell_y = budget_cell_size([max_x - min_x, max_y - min_y], cell_size, max_cells or DEFAULT_MAX_CELLS)
+    cells_x, cells_y = math.ceil((max_x - min_x) / cell_x), math.ceil((max_y - min_y) / cell_y)
+    if tiled is None:
+        tiled = cells_x * cells_y > TILE_CELLS ** 2
+    tiled = tiled and max(cells_x, cells_y) > TILE_CELLS
+    if tiled:
+        min_x, max_x = math.floor(min_x / cell_x) * cell_x, math.ceil(max_x / cell_x) * cell_x
+        min_y, max_y = math.floor(min_y / cell_y) * cell_y, math.ceil(max_y / cell_y) * cell_y
+    layout = {
+        "center": [(min_x + max_x) / 2, (min_y + max_y) / 2, _PLANE_HEIGHT],
+        "size": [max_x - min_x, max_y - min_y],
+        "origin": [min_x, min_y],
+        "cell_size": [cell_x, cell_y],
+    }
+    if tiled:
+        layout["tile_cells"] = TILE_CELLS
+    return layout
+
+
+def tile_layouts(layout: Dict[str, Any]) -> List[Tuple[Tuple[int, int], Dict[str, Any]]]:
+    """Tiles covering a tiled layout: the (row, column) of each tile's first cell in the map, and its layout.
+
+    Tiles lie on a lattice of ``tile_cells`` cells anchored at the world
+    origin, clipped to the map, so only cells of the map are traced.
+    Interior tiles are whole lattice tiles and shared by every layout that
+    contains them; edge tiles are specific to the map's extent.
+    """
+    tile = layout["tile_cells"]
+    cell_x, cell_y = layout["cell_size"]
+    # Work in whole cells; the layout is snapped to the cell lattice
+    first_x, first_y = round(layout["origin"][0] / cell_x), round(layout["origin"][1] / cell_y)
+    num_y, num_x = map_shape(layout)
+    tiles = []
+    for j in range(math.floor(first_y / tile), math.ceil((first_y + num_y) / tile)):
+        y0, y1 = max(j * tile, first_y), min((j + 1) * tile, first_y + num_y)
+        for i in range(math.floor(first_x / tile), math.ceil((first_x + num_x) / tile)):
+            x0, x1 = max(i * tile, first_x), min((i + 1) * tile, first_x + num_x)
+            origin = [x0 * cell_x, y0 * cell_y]
+            size = [(x1 - x0) * cell_x, (y1 - y0) * cell_y]
+            tiles.append(((y0 - first_y, x0 - first_x), {
+                "center": [origin[0] + size[0] / 2, origin[1] + size[1] / 2, layout["center"][2]],
+                "size": size,
+                "origin": origin,
+                "cell_size": [cell_x, cell_y],
+            }))
+    return tiles
+
+
+def map_shape(layout: Dict[str, Any]) -> Tuple[int, int]:
+    """``(cells_y, cells_x)`` of a layout snapped to the cell lattice, such as a tiled one or a tile"""
+    return (round(layout["size"][1] / layout["cell_size"][1]), round(layout["size"][0] / layout["cell_size"][0]))
+
+
+def solver_params(quality: str = DEFAULT_QUALITY, samples_per_tx: Optional[int] = None) -> Dict[str, Any]:
+    """Solver settings of a quality tier, optionally with fewer samples (a progressive stage)"""
+    if quality not in QUALITY_TIERS:
+        raise ValueError(f"Unknown quality: {quality} (choose from {', '.join(QUALITY_TIERS)})")
+    solver = dict(QUALITY_TIERS[quality])
+    if samples_per_tx is not None:
+        solver["samples_per_tx"] = int(samples_per_tx)
+    return solver
+
+
+def progressive_stages(quality: str = DEFAULT_QUALITY) -> List[int]:
+    """Cumulative samples per transmitter after each progressive stage"""
+    target = solver_params(quality)["samples_per_tx"]
+    return sorted({min(target, max(_MIN_STAGE_SAMPLES, int(target * f))) for f in PROGRESSIVE_FRACTIONS})
+
+
+def _hash(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:32]
+
+
+def _floats(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_floats(v) for v in value]
+    return float(value)
+
+
+def _float_positions(positions: List[List[float]]) -> List[List[float]]:
+    return [[float(x) for x in pos] for pos in positions]
+
+
+def grid_key(tx_positions: List[List[float]], rx_positions: List[List[float]],
+             solver: Dict[str, Any], scene: str = SCENE, **options: Any) -> str:
+    """Content address of one traced map (independent of the rendered metric).
+
+    ``options`` are further inputs of the combined map, such as TX powers
+    or a fixed area; None values are left out so adding an option keeps
+    existing keys.
+    """
+    payload = {"scene": scene, "tx_positions": _float_positions(tx_positions),
+               "rx_positions": _float_positions(rx_positions), "solver": solver}
+    payload.update({name: _floats(value) for name, value in options.items() if value is not None})
+    return _hash(payload)
+
+
+def tx_gain_key(tx_position: List[float], look_at: Optional[List[float]], layout: Dict[str, Any],
+                solver: Dict[str, Any], scene: str = SCENE) -> str:
+    """Content address of one transmitter's path-gain grid over ``layout``.
+
+    The sample count is not part of the key: more samples refine the same
+    entry.
+    """
+    return _hash({"scene": scene, "tx_position": _float_positions([tx_position])[0],
+                  "look_at": _float_positions([look_at])[0] if look_at is not None else None,
+                  "center": layout["center"], "size": layout["size"], "cell_size": layout["cell_size"],
+                  "max_depth": solver["max_depth"]})
+
+
+def combine(gains: np.ndarray, tx_power_dbm: Any, noise_power: float) -> Dict[str, np.ndarray]:
+    """Path gain, RSS and SINR grids of a set of transmitters from their path gains.
+
+    ``gains`` is ``[num_tx, cells_y, cells_x]`` and ``tx_power_dbm`` a
+    scalar or one power per transmitter. RSS is power times path gain (W);
+    the SINR of transmitter i treats every other transmitter as
+    interference plus the thermal ``noise_power`` (W), as ``RadioMapSolver``
+    does.
+    """
+    power = 10 ** ((np.broadcast_to(np.asarray(tx_power_dbm, dtype=np.float64), (len(gains),)) - 30) / 10)
+    rss = gains * power.astype(np.float32)[:, None, None]
+    interference = rss.sum(axis=0, keepdims=True) - rss + np.float32(noise_power)
+    return {"path_gain": gains, "rss": rss, "sinr": rss / interference}
+
+
+class GridStore:
+    """Directory of traced maps, one subdirectory per ``grid_key``.
+
+    Each entry holds ``path_gain.npy``, ``rss.npy`` and ``sinr.npy``
+    (float32, ``[num_tx, cells_y, cells_x]``, linear units) and
+    ``meta.json`` (positions, solver parameters, origin and cell size).
+    Entries are written to a temporary directory and renamed into place,
+    so readers never see a partial map. Path gains of single transmitters
+    live under ``tx/`` as ``<key>.npy`` plus a ``<key>.json`` header that
+    is written last.
+
+    Maps and transmitter gains together are capped at ``max_bytes``:
+    after every save the least recently used are deleted, header first,
+    so a half-deleted entry reads as missing. Loads refresh the header's
+    modification time, which serves as the last access, so the processes
+    sharing the directory (server and ray-tracing workers) need no
+    common index.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 8 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.counters = {"evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        if not _KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Malformed grid key: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path(key), "meta.json"))
+
+    def touch(self, key: str) -> bool:
+        """Record a use of a stored map; False if it is not stored"""
+        if not self.contains(key):
+            return False
+        self._touch(os.path.join(self.path(key), "meta.json"))
+        return True
+
+    def files(self, key: str) -> Dict[str, str]:
+        return {metric: os.path.join(self.path(key), f"{metric}.npy") for metric in METRICS}
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        """``(meta, grids)`` of a stored map, or None; the grids are read-only memory maps"""
+        try:
+            with open(os.path.join(self.path(key), "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            grids = {metric: np.load(path, mmap_mode="r") for metric, path in self.files(key).items()}
+        except (OSError, ValueError):
+            return None
+        self._touch(os.path.join(self.path(key), "meta.json"))
+        return meta, grids
+
+    def open(self, key: str) -> Optional["RadioMapView"]:
+        """Query view of a stored map, or None"""
+        stored = self.load(key)
+        return RadioMapView(*stored) if stored is not None else None
+
+    def describe(self, key: str) -> Dict[str, Any]:
+        """Files and geo-transform of a stored map, for tool results"""
+        with open(os.path.join(self.path(key), "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        files = self.files(key)
+        return {"key": key, "files": files, "shape": list(np.load(files["path_gain"], mmap_mode="r").shape),
+                "origin": meta["origin"], "cell_size": meta["cell_size"],
+                "units": "linear (path gain, SINR) and W (RSS); [num_tx, cells_y, cells_x]"}
+
+    def save(self, key: str, meta: Dict[str, Any], grids: Dict[str, np.ndarray]) -> None:
+        tmp_dir = tempfile.mkdtemp(dir=self.directory, prefix=".tmp-")
+        try:
+            for metric in METRICS:
+                np.save(os.path.join(tmp_dir, f"{metric}.npy"), np.asarray(grids[metric], dtype=np.float32))
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_dir, self.path(key))
+        except OSError:
+            # Another worker stored the same map first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not self.contains(key):
+                raise
+        self.evict(keep=self.path(key))
+
+    def _tx_path(self, key: str) -> str:
+        if not _KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Malformed transmitter key: {key!r}")
+        return os.path.join(self.directory, "tx", key)
+
+    def has_tx(self, key: str) -> bool:
+        return os.path.exists(self._tx_path(key) + ".json")
+
+    def tx_samples(self, key: str) -> int:
+        """Samples per transmitter behind a stored path gain (0 if none)"""
+        try:
+            with open(self._tx_path(key) + ".json", "r", encoding="utf-8") as f:
+                return int(json.load(f)["samples_per_tx"])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def load_tx(self, key: str) -> Tuple[Dict[str, Any], np.ndarray]:
+        """``(meta, path_gain)`` of one transmitter; the grid is a read-only memory map"""
+        with open(self._tx_path(key) + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        gain = np.load(self._tx_path(key) + ".npy", mmap_mode="r")
+        self._touch(self._tx_path(key) + ".json")
+        return meta, gain
+
+    def save_tx(self, key: str, meta: Dict[str, Any], path_gain: np.ndarray) -> None:
+        """Store one transmitter's ``[cells_y, cells_x]`` path gain; the header is written last"""
+        path = self._tx_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for suffix, write in ((".npy", lambda f: np.save(f, np.asarray(path_gain, dtype=np.float32))),
+                              (".json", lambda f: f.write(json.dumps(meta).encode()))):
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path + suffix)
+        self.evict(keep=path)
+
+    @staticmethod
+    def _touch(header: str) -> None:
+        try:
+            os.utime(header)
+        except OSError:
+            pass
+
+    def _entries(self) -> List[Tuple[float, int, str, List[str]]]:
+        """``(last_access, size, path, files)`` of every stored map and transmitter gain.
+
+        ``files`` lists what to delete, the header first; ``path`` is the
+        map directory or the transmitter's path without suffix.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not _KEY_PATTERN.fullmatch(name):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                last_access = os.stat(os.path.join(path, "meta.json")).st_mtime
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+            except OSError:
+                continue
+            entries.append((last_access, size, path, [os.path.join(path, "meta.json"), path]))
+        tx_dir = os.path.join(self.directory, "tx")
+        names = os.listdir(tx_dir) if os.path.isdir(tx_dir) else []
+        for name in names:
+            key, suffix = os.path.splitext(name)
+            if suffix != ".json" or not _KEY_PATTERN.fullmatch(key):
+                continue
+            path = os.path.join(tx_dir, key)
+            try:
+                header = os.stat(path + ".json")
+                size = header.st_size + os.stat(path + ".npy").st_size
+            except OSError:
+                continue
+            entries.append((header.st_mtime, size, path, [path + ".json", path + ".npy"]))
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used maps and transmitter gains, except ``keep``, until the rest fit ``max_bytes``"""
+        entries = self._entries()
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, path, files in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            for file in files:
+                if os.path.isdir(file):
+                    shutil.rmtree(file, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(file)
+                    except OSError:
+                        pass
+            total -= size
+            with self._lock:
+                self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Eviction count of this process plus the number and total size of stored entries"""
+        entries = self._entries()
+        maps = sum(1 for *_, files in entries if files[0].endswith("meta.json"))
+        with self._lock:
+            counters = dict(self.counters)
+        return dict(counters, maps=maps, transmitters=len(entries) - maps,
+                    bytes=sum(size for _, size, _, _ in entries), max_bytes=self.max_bytes)
+
+
+def _normalize_options(tx_positions, tx_power_dbm, area):
+    if isinstance(tx_power_dbm, (list, tuple)):
+        if len(tx_power_dbm) != len(tx_positions):
+            raise ValueError("tx_power_dbm needs one value per transmitter")
+        tx_power_dbm = [float(p) for p in tx_power_dbm]
+    elif tx_power_dbm is not None:
+        tx_power_dbm = float(tx_power_dbm)
+    return tx_power_dbm, [float(v) for v in area] if area is not None else None
+
+
+def plan(tx_positions: List[List[float]], rx_positions: List[List[float]], area: Optional[Sequence[float]] = None,
+         quality: str = DEFAULT_QUALITY, samples_per_tx: Optional[int] = None, max_cells: Optional[int] = None,
+         tiled: Optional[bool] = None) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Solver settings, map layout and the key options that set them apart from the tier defaults"""
+    solver = solver_params(quality, samples_per_tx)
+    layout = map_layout(tx_positions, rx_positions, solver["cell_size"], area, max_cells, tiled)
+    # Left out when at their defaults, so untiled maps within the budget keep their keys
+    options = {"cell_size": layout["cell_size"] if layout["cell_size"] != solver["cell_size"] else None,
+               "tile_cells": layout.get("tile_cells")}
+    return solver, layout, options
+
+
+def layout_key(tx_positions: List[List[float]], rx_positions: List[List[float]], tx_power_dbm: Any = None,
+               area: Optional[Sequence[float]] = None, quality: str = DEFAULT_QUALITY,
+               samples_per_tx: Optional[int] = None, max_cells: Optional[int] = None,
+               tiled: Optional[bool] = None) -> str:
+    """Grid key under which ``assemble`` stores a layout"""
+    tx_positions = _float_positions(tx_positions)
+    tx_power_dbm, area = _normalize_options(tx_positions, tx_power_dbm, area)
+    solver, _, options = plan(tx_positions, rx_positions, area, quality, samples_per_tx, max_cells, tiled)
+    return grid_key(tx_positions, rx_positions, solver, tx_power_dbm=tx_power_dbm, area=area, **options)
+
+
+def _layout_tiles(layout: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [tile for _, tile in tile_layouts(layout)] if "tile_cells" in layout else [layout]
+
+
+def stored_samples(store: GridStore, tx_positions: List[List[float]], rx_positions: List[List[float]],
+                   area: Optional[Sequence[float]] = None, quality: str = DEFAULT_QUALITY,
+                   max_cells: Optional[int] = None, tiled: Optional[bool] = None) -> int:
+    """Fewest samples per transmitter stored for a layout (0 if a transmitter or tile was never traced)"""
+    solver, layout, _ = plan(tx_positions, rx_positions, area, quality, None, max_cells, tiled)
+    look_at = rx_positions[0] if rx_positions else None
+    return min(store.tx_samples(tx_gain_key(pos, look_at, tile, solver))
+               for tile in _layout_tiles(layout) for pos in tx_positions)
+
+
+def assemble(store: GridStore, tx_positions: List[List[float]], rx_positions: List[List[float]],
+             trace: Callable[..., Any], tx_power_dbm: Any = None, area: Optional[Sequence[float]] = None,
+             quality: str = DEFAULT_QUALITY, samples_per_tx: Optional[int] = None, max_cells: Optional[int] = None,
+             tiled: Optional[bool] = None, map_fn: Callable[..., Any] = map) -> Tuple[str, int]:
+    """Store the combined map of a layout, tracing only transmitters not seen before.
+
+    Each transmitter's path gain over the map area is stored on its own,
+    keyed by its position, orientation (it looks at the first receiver),
+    the area, cell size and depth of the ``quality`` tier. ``trace``
+    (see ``load_tx_gains``) must trace and ``save_tx`` the missing ones.
+    The combined path gain, RSS and SINR are then plain array arithmetic
+    (``combine``), so other TX subsets, powers or metrics over the same
+    area cost no ray tracing. ``samples_per_tx`` lowers the tier's sample
+    count for a progressive stage; ``max_cells`` and ``tiled`` are passed
+    to ``map_layout`` and tiles are loaded through ``map_fn`` (see
+    ``load_layout_gains``). Returns the grid key and the number of
+    transmitters traced.
+    """
+    tx_positions = _float_positions(tx_positions)
+    rx_positions = _float_positions(rx_positions)
+    tx_power_dbm, area = _normalize_options(tx_positions, tx_power_dbm, area)
+    solver, layout, options = plan(tx_positions, rx_positions, area, quality, samples_per_tx, max_cells, tiled)
+    key = grid_key(tx_positions, rx_positions, solver, tx_power_dbm=tx_power_dbm, area=area, **options)
+    if store.contains(key):
+        return key, 0
+
+    look_at = rx_positions[0] if rx_positions else None
+    tx_keys, loaded, num_traced = load_layout_gains(store, tx_positions, look_at, layout, solver, trace, map_fn)
+    tx_meta = loaded[0][0]
+    power = tx_meta["tx_power_dbm"] if tx_power_dbm is None else tx_power_dbm
+    grids = combine(np.stack([gain for _, gain in loaded]), power, tx_meta["noise_power"])
+    meta = dict(layout, scene=SCENE, solver=solver, tx_positions=tx_positions, rx_positions=rx_positions,
+                tx_power_dbm=power, noise_power=tx_meta["noise_power"], tx_keys=tx_keys,
+                shape=list(grids["path_gain"].shape))
+    store.save(key, meta, grids)
+    return key, num_traced
+
+
+def load_tx_gains(store: GridStore, tx_positions: List[List[float]], look_at: Optional[List[float]],
+                  layout: Dict[str, Any], solver: Dict[str, Any],
+                  trace: Callable[..., Any]) -> Tuple[List[str], List[Tuple[Dict[str, Any], np.ndarray]], int]:
+    """Keys and stored ``(meta, path_gain)`` of each transmitter over ``layout``.
+
+    Transmitters with fewer than ``solver["samples_per_tx"]`` stored samples
+    are traced first by ``trace(tx_positions, look_at, layout, keys,
+    solver)``, where the solver's ``samples_per_tx`` is the number still
+    missing and ``seed`` differs from earlier runs, so the new samples can
+    be averaged into the stored ones. Transmitters with equal stored
+    counts share one call.
+    """
+    target = solver["samples_per_tx"]
+    tx_keys = [tx_gain_key(pos, look_at, layout, solver) for pos in tx_positions]
+    by_stored: Dict[int, Dict[str, List[float]]] = {}
+    seen = set()
+    for pos, tx_key in zip(tx_positions, tx_keys):
+        if tx_key in seen:
+            continue
+        seen.add(tx_key)
+        stored = store.tx_samples(tx_key)
+        if stored < target:
+            by_stored.setdefault(stored, {})[tx_key] = pos
+    for stored, missing in sorted(by_stored.items()):
+        trace(list(missing.values()), look_at, layout, list(missing),
+              dict(solver, samples_per_tx=target - stored, seed=stored % (1 << 31)))
+    return tx_keys, [store.load_tx(tx_key) for tx_key in tx_keys], sum(len(m) for m in by_stored.values())
+
+
+def load_layout_gains(store: GridStore, tx_positions: List[List[float]], look_at: Optional[List[float]],
+                      layout: Dict[str, Any], solver: Dict[str, Any], trace: Callable[..., Any],
+                      map_fn: Callable[..., Any] = map) -> Tuple[List[Any], List[Tuple[Dict[str, Any], np.ndarray]], int]:
+    """``load_tx_gains`` over a whole layout, stitching the tiles of a tiled one.
+
+    Each tile is a layout of its own, so its gains are stored, traced and
+    reused per tile. Tiles are loaded through ``map_fn``, which may run
+    them concurrently. The stitched ``[cells_y, cells_x]`` gains are in
+    memory; the keys of a transmitter are then one per tile.
+    """
+    if "tile_cells" not in layout:
+        return load_tx_gains(store, tx_positions, look_at, layout, solver, trace)
+    tiles = tile_layouts(layout)
+    results = list(map_fn(lambda tile: load_tx_gains(store, tx_positions, look_at, tile[1], solver, trace), tiles))
+    num_y, num_x = map_shape(layout)
+    gains = np.zeros((len(tx_positions), num_y, num_x), dtype=np.float32)
+    for ((row, col), tile), (_, loaded, _) in zip(tiles, results):
+        tile_y, tile_x = map_shape(tile)
+        for idx, (_, gain) in enumerate(loaded):
+            gains[idx, row:row + tile_y, col:col + tile_x] = gain[:tile_y, :tile_x]
+    loaded = [(dict(results[0][1][idx][0], origin=layout["origin"], center=layout["center"], size=layout["size"],
+                    samples_per_tx=min(r[1][idx][0]["samples_per_tx"] for r in results)), gains[idx])
+              for idx in range(len(tx_positions))]
+    tx_keys = [[r[0][idx] for r in results] for idx in range(len(tx_positions))]
+    return tx_keys, loaded, max(r[2] for r in results)
+
+
+class RadioMapView:
+    """Per-point lookups and coverage statistics over a memory-mapped map.
+
+    Cell ``[iy, ix]`` covers ``origin + [ix, iy] * cell_size`` to one cell
+    further. Values are best-server (maximum over transmitters) in dB, or
+    dBm for RSS. Statistics walk the grid in row blocks of at most
+    ``_BLOCK_CELLS`` values, so only those pages of the ``.npy`` files are
+    read and memory does not grow with the map.
+    """
+
+    def __init__(self, meta: Dict[str, Any], grids: Dict[str, np.ndarray]):
+        self.meta = meta
+        self.grids = grids
+        self.origin = meta["origin"]
+        self.cell_size = meta["cell_size"]
+        self.shape = grids["path_gain"].shape
+
+    def _check_metric(self, metric: str) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric} (choose from {', '.join(METRICS)})")
+
+    def _blocks(self, metric: str):
+        num_tx, num_y, num_x = self.shape
+        rows = max(1, _BLOCK_CELLS // (num_tx * num_x))
+        for start in range(0, num_y, rows):
+            yield to_db(np.max(self.grids[metric][:, start:start + rows], axis=0), metric)
+
+    def cell_index(self, points: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Row and column of each ``[x, y(, z)]`` point, and whether it lies on the map"""
+        if len(points) and isinstance(points[0], (int, float)):
+            points = [points]
+        points = np.array([[p[0], p[1]] for p in points], dtype=np.float64).reshape(-1, 2)
+        ix = np.floor((points[:, 0] - self.origin[0]) / self.cell_size[0]).astype(np.int64)
+        iy = np.floor((points[:, 1] - self.origin[1]) / self.cell_size[1]).astype(np.int64)
+        inside = (ix >= 0) & (ix < self.shape[2]) & (iy >= 0) & (iy < self.shape[1])
+        return iy, ix, inside
+
+    def sample(self, metric: str, points: Any) -> List[Optional[float]]:
+        """Best-server value at each point; None off the map, -inf without coverage"""
+        self._check_metric(metric)
+        iy, ix, inside = self.cell_index(points)
+        values = np.full(len(iy), np.nan)
+        if inside.any():
+            # Fancy indexing touches only the requested cells of the memory map
+            values[inside] = to_db(np.max(self.grids[metric][:, iy[inside], ix[inside]], axis=0), metric)
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    def statistics(self, metric: str, percentiles: Sequence[float] = (5, 50, 95),
+                   thresholds: Sequence[float] = (), cdf_points: int = 21) -> Dict[str, Any]:
+        """Coverage above each threshold plus percentiles and CDF of the covered cells.
+
+        Percentiles and the CDF come from a histogram with
+        ``_HIST_RESOLUTION_DB`` bins, so they are exact to that resolution.
+        """
+        self._check_metric(metric)
+        thresholds = [float(t) for t in thresholds]
+        lo, hi = _HIST_RANGE_DB[metric]
+        edges = np.linspace(lo, hi, int(round((hi - lo) / _HIST_RESOLUTION_DB)) + 1)
+        counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        above = np.zeros(len(thresholds), dtype=np.int64)
+        total = covered = 0
+        value_sum = 0.0
+        value_min, value_max = math.inf, -math.inf
+        for block in self._blocks(metric):
+            finite = block[np.isfinite(block)]
+            total += block.size
+            covered += finite.size
+            if finite.size == 0:
+                continue
+            value_sum += float(finite.sum())
+            value_min = min(value_min, float(finite.min()))
+            value_max = max(value_max, float(finite.max()))
+            counts += np.histogram(np.clip(finite, edges[0], edges[-1]), bins=edges)[0]
+            for i, threshold in enumerate(thresholds):
+                above[i] += np.count_nonzero(finite >= threshold)
+
+        result = {
+            "metric": metric,
+            "unit": "dBm" if metric == "rss" else "dB",
+            "num_cells": int(total),
+            "covered_fraction": covered / total if total else 0.0,
+            "coverage": {format(t, "g"): int(n) / total if total else 0.0 for t, n in zip(thresholds, above)},
+        }
+        if covered == 0:
+            return result
+        cum = np.cumsum(counts) / covered
+
+        def percentile(q):
+            # Upper edge of the first bin reaching the quantile, within the observed range
+            index = min(int(np.searchsorted(cum, q / 100)), len(counts) - 1)
+            return min(value_max, max(value_min, float(edges[index + 1])))
+
+        result.update({
+            "mean": value_sum / covered,
+            "min": value_min,
+            "max": value_max,
+            "percentiles": {format(float(q), "g"): percentile(float(q)) for q in percentiles},
+        })
+        cdf_values = np.linspace(value_min, value_max, max(2, int(cdf_points)))
+        bins = np.clip(np.searchsorted(edges, cdf_values, side="right") - 1, 0, len(counts) - 1)
+        cdf = cum[bins]
+        cdf[-1] = 1.0
+        result["cdf"] = {"values": cdf_values.tolist(), "probability": cdf.tolist()}
+        return result
+
+
+_DEFAULT_STORE: Optional[GridStore] = None
+_DEFAULT_STORE_LOCK = threading.Lock()
+
+
+def default_grid_store() -> GridStore:
+    """Store under ``SIONNA_TOOLS_RADIOMAP_DIR`` (default ``.cache/radiomaps`` in the repository)
+    capped at ``SIONNA_TOOLS_RADIOMAP_MB`` megabytes (default 8192)"""
+    global _DEFAULT_STORE
+    with _DEFAULT_STORE_LOCK:
+        if _DEFAULT_STORE is None:
+            directory = os.environ.get("SIONNA_TOOLS_RADIOMAP_DIR",
+                                       os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "radiomaps"))
+            max_bytes = int(float(os.environ.get("SIONNA_TOOLS_RADIOMAP_MB", "8192")) * (1 << 20))
+            _DEFAULT_STORE = GridStore(directory, max_bytes)
+    return _DEFAULT_STORE
+
+
+def to_db(values: np.ndarray, metric: str) -> np.ndarray:
+    """Path gain and SINR in dB, RSS in dBm; cells without coverage become -inf"""
+    with np.errstate(divide="ignore"):
+        db = 10 * np.log10(values)
+    return db + 30 if metric == "rss" else db
+
+
+def render(meta: Dict[str, Any], grids: Dict[str, np.ndarray], metric: str, output_path: str) -> str:
+    """Plot the best-server ``metric`` over all transmitters with TX/RX markers.
+
+    Mirrors ``RadioMap.show`` (maximum over transmitters, cell-index image
+    with origin at the lower left) and labels the axes in metres. Uses a
+    bare ``Figure`` rather than pyplot, so it is safe to call from server
+    threads.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (choose from {', '.join(METRICS)})")
+    values = to_db(np.max(grids[metric], axis=0), metric)
+    finite = values[np.isfinite(values)]
+
+    fig = Figure(figsize=(9, 6))
+    ax = fig.add_subplot()
+    image = ax.imshow(values, origin="lower",
+                      vmin=finite.min() if finite.size else None, vmax=finite.max() if finite.size else None)
+    fig.colorbar(image, ax=ax, label=_COLORBAR_LABELS[metric])
+
+    origin_x, origin_y = meta["origin"]
+    cell_size_x, cell_size_y = meta["cell_size"]
+
+    # Convert world coordinates (meters) into map cell coordinates
+    def world_to_cell(position):
+        return (
+            (position[0] - origin_x) / cell_size_x,
+            (position[1] - origin_y) / cell_size_y,
+        )
+
+    for idx, tx_pos in enumerate(meta["tx_positions"]):
+        tx_cell = world_to_cell(tx_pos)
+        ax.scatter(tx_cell[0], tx_cell[1], color="blue", marker="^", s=250,
+                   label=f"Transmitter {idx+1}: {tuple(tx_pos)}", edgecolors='white', linewidths=2, zorder=10)
+    for idx, rx_pos in enumerate(meta["rx_positions"]):
+        rx_cell = world_to_cell(rx_pos)
+        ax.scatter(rx_cell[0], rx_cell[1], color="red", marker="o", s=200,
+                   label=f"Receiver {idx+1}: {tuple(rx_pos)}", edgecolors='white', linewidths=2, zorder=10)
+
+    # Replace axis labels with world coordinates (meters)
+    ax.set_xlabel("X position (m)")
+    ax.set_ylabel("Y position (m)")
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda val, pos: f"{origin_x + val*cell_size_x:.0f}"))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda val, pos: f"{origin_y + val*cell_size_y:.0f}"))
+
+    # Reserve space on the right for colorbar + legend
+    fig.subplots_adjust(right=0.7)
+    ax.legend(
+        loc="upper left",
+        bbox_to_anchor=(1.25, 1.0),
+        borderaxespad=0.0,
+        title="Nodes",
+        framealpha=0.95,
+    )
+
+    # Progressive maps re-render the same file while clients may read it
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        fig.savefig(f, format=os.path.splitext(output_path)[1][1:] or "png")
+    os.replace(tmp_path, output_path)
+    return output_path
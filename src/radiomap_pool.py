@@ -0,0 +1,207 @@
+"""Pool of long-lived radio-map worker processes.
+
+Each worker imports Sionna RT once, keeps its scene loaded and serves
+``scripts/run_radiomap.py`` functions sent over a pipe, so a request
+pays for ray tracing only. Idle workers wait in a queue; a job that
+exceeds its timeout kills its worker, and workers are replaced after a
+fixed number of jobs to bound memory growth in the RT stack. Replacements
+start in the background, so the next job rarely waits for a scene load.
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import io
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import traceback
+from typing import Any, Dict, Optional, Tuple
+
+_SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+
+def _worker_main(conn, scripts_dir: str) -> None:
+    """Load the RT stack and scene, then answer ``(function, kwargs)`` jobs until told to stop"""
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    sys.path.insert(0, scripts_dir)
+    try:
+        import run_radiomap
+        run_radiomap.get_scene()
+    except Exception:
+        conn.send(("error", traceback.format_exc(), ""))
+        return
+    conn.send(("ready", None, ""))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        function, kwargs = job
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                value = getattr(run_radiomap, function)(**kwargs)
+            conn.send(("ok", value, output.getvalue()))
+        except Exception:
+            conn.send(("error", traceback.format_exc(), output.getvalue()))
+
+
+class _Worker:
+    def __init__(self, context, scripts_dir):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, scripts_dir), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs = 0
+
+    def stop(self, kill: bool = False) -> None:
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5)
+        self.conn.close()
+
+
+class RadioMapPool:
+    """Warm ``run_radiomap`` workers shared by all radio-map tools.
+
+    ``timeout`` bounds each job in seconds (``None`` waits forever),
+    ``startup_timeout`` bounds the import and scene load of a fresh worker,
+    and ``max_jobs`` is the number of jobs after which a worker is recycled.
+    Workers import ``run_radiomap`` from ``scripts_dir``.
+    """
+
+    def __init__(self, num_workers: int = 1, timeout: Optional[float] = 600.0,
+                 startup_timeout: Optional[float] = 300.0, max_jobs: int = 50, scripts_dir: str = _SCRIPTS_DIR):
+        self.num_workers = max(1, int(num_workers))
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.max_jobs = max(1, int(max_jobs))
+        self.scripts_dir = scripts_dir
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.RLock()
+        self._started = False
+        self.counters = {"jobs": 0, "errors": 0, "timeouts": 0, "crashes": 0,
+                         "recycled": 0, "workers_started": 0}
+
+    def start(self) -> None:
+        """Spawn the workers; they load Sionna RT and the scene in the background"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for _ in range(self.num_workers):
+                self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        with self._lock:
+            self.counters["workers_started"] += 1
+        return _Worker(self._context, self.scripts_dir)
+
+    def _wait_ready(self, worker: _Worker) -> None:
+        if worker.ready:
+            return
+        if not worker.conn.poll(self.startup_timeout):
+            raise TimeoutError(f"Radio-map worker did not start within {self.startup_timeout:.0f} s")
+        try:
+            status, value, _ = worker.conn.recv()
+        except EOFError:
+            raise RuntimeError(f"Radio-map worker exited during startup (exit code {worker.process.exitcode})") from None
+        if status != "ready":
+            raise RuntimeError(f"Radio-map worker failed to start:\n{value}")
+        worker.ready = True
+
+    def run(self, function: str, timeout: Optional[float] = None, **kwargs: Any) -> Tuple[Any, str]:
+        """Call ``run_radiomap.<function>(**kwargs)`` on an idle worker.
+
+        Returns the function's value and everything it printed. Blocks
+        until a worker is free; raises ``TimeoutError`` if the job runs
+        longer than ``timeout`` (default: the pool's) and ``RuntimeError``
+        if it fails or the worker dies.
+        """
+        self.start()
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._idle.get()
+        # Until a reply arrives the worker is presumed hung or dead
+        replace, kill = True, True
+        try:
+            self._wait_ready(worker)
+            worker.conn.send((function, kwargs))
+            if not worker.conn.poll(timeout):
+                with self._lock:
+                    self.counters["timeouts"] += 1
+                raise TimeoutError(f"Radio-map job {function} did not finish within {timeout:.0f} s")
+            try:
+                status, value, output = worker.conn.recv()
+            except EOFError:
+                with self._lock:
+                    self.counters["crashes"] += 1
+                worker.process.join(1)
+                raise RuntimeError(f"Radio-map worker exited during {function} "
+                                   f"(exit code {worker.process.exitcode})") from None
+            worker.jobs += 1
+            replace, kill = worker.jobs >= self.max_jobs, False
+            with self._lock:
+                self.counters["jobs"] += 1
+                self.counters["recycled"] += int(replace)
+                self.counters["errors"] += int(status != "ok")
+        finally:
+            if replace:
+                worker.stop(kill)
+                worker = self._spawn()
+            self._idle.put(worker)
+        if status != "ok":
+            raise RuntimeError(f"Radio-map job {function} failed:\n{value}")
+        return value, output
+
+    def close(self) -> None:
+        """Stop every idle worker"""
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, num_workers=self.num_workers, started=self._started,
+                        idle_workers=self._idle.qsize())
+
+
+def _env_seconds(name: str, default: str) -> Optional[float]:
+    value = float(os.environ.get(name, default))
+    return value if value > 0 else None
+
+
+_DEFAULT_POOL: Optional[RadioMapPool] = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def default_pool() -> RadioMapPool:
+    """Pool sized by ``SIONNA_TOOLS_RADIOMAP_WORKERS`` (default 1), with the job
+    timeout ``SIONNA_TOOLS_RADIOMAP_TIMEOUT`` (seconds, default 600, 0 for none)
+    and recycling after ``SIONNA_TOOLS_RADIOMAP_MAX_JOBS`` jobs (default 50)"""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = RadioMapPool(
+                num_workers=int(os.environ.get("SIONNA_TOOLS_RADIOMAP_WORKERS", "1")),
+                timeout=_env_seconds("SIONNA_TOOLS_RADIOMAP_TIMEOUT", "600"),
+                max_jobs=int(os.environ.get("SIONNA_TOOLS_RADIOMAP_MAX_JOBS", "50")),
+            )
+            atexit.register(_DEFAULT_POOL.close)
+    return _DEFAULT_POOL
@@ -0,0 +1,156 @@
+"""Content-addressed cache for tool results.
+
+Entries are keyed by a SHA-256 of the tool name, its normalized arguments
+and a code version, so any change to the simulation sources invalidates
+them. A small in-memory LRU tier sits in front of a size-capped on-disk
+tier of JSON files whose modification time records the last use.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+def _normalize(value: Any) -> Any:
+    """JSON-compatible form in which equal arguments compare equal (15 == 15.0, tuples == lists)"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if hasattr(value, "tolist"):
+        return _normalize(value.tolist())
+    return value
+
+
+def code_version(paths: Iterable[str]) -> str:
+    """Hash of the source files a tool result depends on"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(tool: str, arguments: Dict[str, Any], version: str) -> str:
+    """Content address of one tool call"""
+    payload = json.dumps({"tool": tool, "arguments": _normalize(arguments), "version": version},
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Two-tier LRU cache of JSON-serializable tool results.
+
+    ``memory_entries`` bounds the in-memory tier; ``disk_bytes`` bounds the
+    files under ``directory`` (``None`` disables the disk tier). Entries
+    evicted from memory stay on disk, and disk hits are promoted back into
+    memory.
+    """
+
+    def __init__(self, directory: Optional[str], memory_entries: int = 256, disk_bytes: int = 512 << 20):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+                         "memory_evictions": 0, "disk_evictions": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached result for ``key``, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return self._memory[key]
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.counters["disk_hits"] += 1
+                    self._remember(key, value)
+                return value
+        with self._lock:
+            self.counters["misses"] += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` in both tiers, evicting least recently used entries"""
+        with self._lock:
+            self.counters["stores"] += 1
+            self._remember(key, value)
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, default=_normalize)
+        os.replace(tmp_path, self._path(key))
+        self._evict_disk()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.counters["memory_evictions"] += 1
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used files until the tier fits ``disk_bytes``"""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.counters["disk_evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, "*.json")):
+                os.remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the current size of each tier"""
+        with self._lock:
+            stats = dict(self.counters, memory_entries=len(self._memory))
+        if self.directory:
+            files = glob.glob(os.path.join(self.directory, "*.json"))
+            stats["disk_entries"] = len(files)
+            stats["disk_bytes"] = sum(os.path.getsize(path) for path in files if os.path.exists(path))
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,120 @@
+"""Persistent Monte Carlo counters for resumable BER sweeps.
+
+Each simulated configuration (tool, constellation or antennas, channel,
+estimator) owns one JSON file holding, per SNR point, the accumulated
+error statistics and the number of bits they cover. Runs read the
+counters, simulate only the missing bits and write the merged totals
+back after every batch, so a longer run extends a shorter one and an
+interrupted run resumes where it stopped. The files are capped in total
+size; the least recently used configurations are dropped first.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _snr_str(snr_db: float) -> str:
+    return format(float(snr_db), "g")
+
+
+class SampleStore:
+    """Per-(configuration, SNR) error statistics ``acc`` and bit counts on disk.
+
+    ``acc`` is ``[bit_errors, 0, 0]`` for plain Monte Carlo and
+    ``[bit_errors, sum_x, sum_x2]`` for importance sampling; both are sums
+    over independent samples, so merging runs is plain addition. Reads and
+    writes refresh a file's modification time, and once the files exceed
+    ``max_bytes`` the least recently used are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.counters = {"evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, config: Dict[str, Any]) -> str:
+        key = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:24]
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with open(self._path(config), "r", encoding="utf-8") as f:
+                points = json.load(f)["points"]
+            os.utime(self._path(config))
+        except (OSError, ValueError, KeyError):
+            return {}
+        return points
+
+    def get(self, config: Dict[str, Any], snr_db: float) -> Tuple[List[float], int]:
+        """Stored ``(acc, num_bits)`` of one point; zeros if it was never simulated"""
+        point = self._read(config).get(_snr_str(snr_db))
+        if point is None:
+            return [0.0, 0.0, 0.0], 0
+        return list(point["acc"]), int(point["num_bits"])
+
+    def put(self, config: Dict[str, Any], totals: Dict[float, Tuple[List[float], int]]) -> None:
+        """Overwrite the totals of the given SNR points, keeping the others"""
+        with self._lock:
+            points = self._read(config)
+            for snr_db, (acc, num_bits) in totals.items():
+                points[_snr_str(snr_db)] = {"acc": [float(x) for x in acc], "num_bits": int(num_bits)}
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"config": config, "points": points}, f)
+            os.replace(tmp_path, self._path(config))
+            self._evict(keep=self._path(config))
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self, keep: str) -> None:
+        """Delete the least recently used files other than ``keep`` until the rest fit ``max_bytes``"""
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Eviction count plus the number and total size of stored configurations"""
+        files = self._files()
+        return dict(self.counters, configurations=len(files), bytes=sum(size for _, size, _ in files),
+                    max_bytes=self.max_bytes)
+
+
+_DEFAULT_STORE: Optional[SampleStore] = None
+
+
+def default_store() -> SampleStore:
+    """Store under ``SIONNA_TOOLS_SAMPLE_DIR`` (default ``.cache/samples`` in the repository)
+    capped at ``SIONNA_TOOLS_SAMPLE_MB`` megabytes (default 64)"""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        directory = os.environ.get("SIONNA_TOOLS_SAMPLE_DIR",
+                                   os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "samples"))
+        max_bytes = int(float(os.environ.get("SIONNA_TOOLS_SAMPLE_MB", "64")) * (1 << 20))
+        _DEFAULT_STORE = SampleStore(directory, max_bytes)
+    return _DEFAULT_STORE
@@ -1,13 +1,21 @@
 """Sionna simulation tools wrapper"""
 import os
-import subprocess
 import json
-import tempfile
+import functools
+import math
+import threading
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from statistics import NormalDist
 import numpy as np
-import tensorflow as tf
-from sionna.phy.mapping import Constellation
-from sionna.phy.channel.awgn import AWGN
-from sionna.phy.channel.rayleigh_block_fading import RayleighBlockFading
+import analytic_ber
+from backends import get_backend, is_log_scale, mimo_chunk_symbols
+from sample_store import default_store
+from radiomap_pool import default_pool
+from artifact_store import artifact_key, default_artifact_store
+import radio_maps
+import placement
 
 
 import ast
@@ -39,117 +47,687 @@ def _to_float_triplet(pos):
     return [float(pos[0]), float(pos[1]), float(pos[2])]
 
 
-def _positions_slug(prefix, positions):
-    normalized = [_to_float_triplet(pos) for pos in positions]
-    parts = ["{}_{}_{}".format(pos[0], pos[1], pos[2]) for pos in normalized]
-    return f"{prefix}{'__'.join(parts)}"
-def simulate_constellation(modulation="qam", bits_per_symbol=2, num_symbols=2000, snr_db_list=[-5, 15]):
-    """Generate constellation with AWGN at different SNR levels"""
-    bits_per_symbol = int(bits_per_symbol)
-    num_symbols = int(num_symbols)
-    snr_db_list = [float(snr) for snr in snr_db_list]
+_MAX_BATCH_SYMBOLS = 1 << 20
+_HYBRID_TARGET_ERRORS = 100
+_BER_METHODS = ("montecarlo", "analytic", "hybrid")
+_MIMO_DETECTORS = ("mrc", "zf", "mmse", "ml")
+# ML searches all 4 ** num_tx_ant QPSK vectors
+_ML_MAX_TX_ANT = 4
+# Adaptive SNR grids: coarse spacing, finest spacing (dB), change of the
+# log10-BER slope (decades per dB) at a point that triggers refinement,
+# point budget, and the fewest errors a simulated BER needs to count as
+# resolved
+_ADAPTIVE_COARSE_STEP = 4.0
+_ADAPTIVE_MIN_STEP = 0.5
+_ADAPTIVE_SLOPE_TOL = 0.2
+_ADAPTIVE_MAX_POINTS = 24
+_ADAPTIVE_MIN_ERRORS = 20
+# Transmitters traced per radio-map worker job, and the most candidate
+# sites a placement search may trace
+_TRACE_BATCH_TX = 16
+_MAX_PLACEMENT_CANDIDATES = 256
+# Transmitters per PathSolver job of evaluate_links, and the most links
+# one call may evaluate
+_LINK_BATCH_TX = 32
+_MAX_LINKS = 1 << 16
+_DEFAULT_WORKERS = int(os.environ.get("SIONNA_TOOLS_WORKERS", "1"))
+_POOLS = {}
+_POOL_LOCK = threading.Lock()
+
 
+def _normalize_modulation(modulation, bits_per_symbol):
+    """Map QPSK/PSK/BPSK aliases onto Sionna's qam/pam constellations"""
     mod_lower = modulation.lower()
     if mod_lower in ["qpsk", "psk"]:
-        modulation = "qam"
-        bits_per_symbol = 2
-    elif mod_lower == "bpsk":
-        modulation = "pam"
-        bits_per_symbol = 1
-    
-    const = Constellation(modulation, num_bits_per_symbol=bits_per_symbol, normalize=True)
-    awgn = AWGN()
-    idx = tf.random.uniform([num_symbols], minval=0, maxval=const.num_points, dtype=tf.int32)
-    tx = tf.gather(const.points, idx)
-    
+        return "qam", 2
+    if mod_lower == "bpsk":
+        return "pam", 1
+    return mod_lower, int(bits_per_symbol)
+
+
+def _init_worker(threads):
+    """Share the cores between pool workers instead of letting each claim all of them"""
+    for var in ("TF_NUM_INTRAOP_THREADS", "OMP_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
+
+
+def _process_pool(num_workers):
+    """Long-lived spawn pool per worker count, so compiled kernels stay warm between sweeps"""
+    with _POOL_LOCK:
+        pool = _POOLS.get(num_workers)
+        if pool is None:
+            threads = max(1, (os.cpu_count() or 1) // num_workers)
+            pool = ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_worker, initargs=(threads,))
+            _POOLS[num_workers] = pool
+    return pool
+
+
+def _call_with_kwargs(fn, kwargs):
+    return fn(**kwargs)
+
+
+def _map_tasks(fn, tasks, num_workers=None):
+    """Run ``fn(**task)`` for every task and return the results in task order.
+
+    With more than one worker the tasks run on a process pool; each task
+    carries its own seed, so the results equal a serial run.
+    """
+    num_workers = min(int(num_workers or _DEFAULT_WORKERS), len(tasks))
+    if num_workers <= 1:
+        return [fn(**task) for task in tasks]
+    return list(_process_pool(num_workers).map(functools.partial(_call_with_kwargs, fn), tasks))
+
+
+def _task_seeds(seed, num_tasks):
+    """Independent, reproducible RNG seeds for ``num_tasks`` tasks derived from ``seed``"""
+    return [[int(x) for x in child.generate_state(4)] for child in np.random.SeedSequence(seed).spawn(num_tasks)]
+
+
+def warm_kernels(shapes=None, backend=None):
+    """Compile the simulation kernels of ``backend`` for common request shapes.
+
+    Called by the MCP server at startup so the first interactive request
+    does not pay the tracing cost. Returns the number of kernels warmed.
+    """
+    return get_backend(backend).warm_kernels(shapes)
+
+
+def _cluster_statistics(points, acc, extent, bins):
+    """EVM, MER, per-point centroid/covariance and density from streamed accumulators"""
+    count = acc["count"]
+    num_symbols = count.sum()
+    ref_power = float(np.sum(count * np.abs(points)**2))
+    levels = []
+    for k in range(len(acc["error_power"])):
+        error_power = float(acc["error_power"][k])
+        clusters = []
+        for m, point in enumerate(points):
+            n = count[m]
+            mean_re, mean_im, sq_re, sq_im, cross = acc["sums"][k, m] / n if n else (np.nan,) * 5
+            clusters.append({
+                "point": [float(point.real), float(point.imag)],
+                "count": int(n),
+                "centroid": [float(mean_re), float(mean_im)],
+                "covariance": [[float(sq_re - mean_re**2), float(cross - mean_re * mean_im)],
+                               [float(cross - mean_re * mean_im), float(sq_im - mean_im**2)]],
+            })
+        levels.append({
+            "num_symbols": int(num_symbols),
+            "evm_rms_percent": 100 * math.sqrt(error_power / ref_power) if ref_power else 0.0,
+            "mer_db": 10 * math.log10(ref_power / error_power) if error_power else math.inf,
+            "clusters": clusters,
+            "histogram": {"extent": float(extent[k]), "bins": int(bins), "counts": acc["histogram"][k].astype(np.int64)},
+        })
+    return levels
+
+
+def simulate_constellation(modulation="qam", bits_per_symbol=2, num_symbols=2000, snr_db_list=[-5, 15], seed=None,
+                           backend=None, statistics=False, return_samples=True, histogram_bins=64):
+    """Generate constellation with AWGN at different SNR levels
+
+    ``backend`` selects "tensorflow" or "numpy" kernels (default from the
+    ``SIONNA_TOOLS_BACKEND`` environment variable, else "tensorflow").
+
+    With ``statistics`` every SNR level also reports the data-aided EVM and
+    MER, the centroid and covariance of the cluster around each
+    constellation point and a ``histogram_bins`` x ``histogram_bins``
+    density over ``[-extent, extent]^2``. These are accumulated over
+    chunks of at most ``_MAX_BATCH_SYMBOLS`` symbols drawn separately from
+    the returned samples, so with ``return_samples=False`` memory and
+    response size do not depend on ``num_symbols``.
+    """
+    modulation, bits_per_symbol = _normalize_modulation(modulation, bits_per_symbol)
+    num_symbols = int(num_symbols)
+    snr_db_list = [float(snr) for snr in snr_db_list]
+    engine = get_backend(backend)
+    seeds = engine.seed_stream(seed)
+    sigma = np.array([math.sqrt(1 / 10**(snr / 10)) for snr in snr_db_list])
+    points = engine.constellation_points(modulation, bits_per_symbol)
+
     results = {
-        "constellation": const.points.numpy(),
+        "constellation": points,
         "modulation": f"{2**bits_per_symbol}-{modulation.upper()}",
-        "snr_levels": {}
     }
-    
-    for snr in snr_db_list:
-        snr_lin = 10**(snr/10)
-        no = tf.constant(1/snr_lin, dtype=tf.float32)
-        rx = awgn(tx, no)
-        results["snr_levels"][snr] = rx.numpy()
-    
+    if return_samples:
+        kernel = engine.constellation_kernel(modulation, bits_per_symbol, num_symbols, len(snr_db_list))
+        rx = kernel(sigma, next(seeds))
+        results["snr_levels"] = {snr: rx[i] for i, snr in enumerate(snr_db_list)}
+
+    if statistics:
+        bins = int(histogram_bins)
+        # The density covers the outermost points plus four noise standard deviations
+        extent = float(np.max(np.abs(np.concatenate([points.real, points.imag])))) + 4 * sigma * math.sqrt(0.5)
+        chunk = max(1, min(num_symbols, _MAX_BATCH_SYMBOLS))
+        kernel = engine.constellation_stats_kernel(modulation, bits_per_symbol, chunk, len(snr_db_list), bins)
+        acc = None
+        for start in range(0, num_symbols, chunk):
+            out = kernel(sigma, extent, min(chunk, num_symbols - start), next(seeds))
+            acc = out if acc is None else {name: acc[name] + out[name] for name in acc}
+        if acc is not None:
+            results["statistics"] = dict(zip(snr_db_list, _cluster_statistics(points, acc, extent, bins)))
+
     return results
 
-def simulate_ber(modulation="qam", bits_per_symbol=2, snr_db_list=[-5, 15], num_bits=100000, channels=["awgn", "rayleigh"]):
-    """Simulate BER for different channels"""
-    mod_lower = modulation.lower()
-    if mod_lower in ["qpsk", "psk"]:
-        modulation = "qam"
-        bits_per_symbol = 2
-    elif mod_lower == "bpsk":
-        modulation = "pam"
-        bits_per_symbol = 1
-    
-    const = Constellation(modulation, num_bits_per_symbol=bits_per_symbol, normalize=True)
-    awgn = AWGN()
-    rayleigh = RayleighBlockFading(num_rx=1, num_rx_ant=1, num_tx=1, num_tx_ant=1)
-    
-    results = {"modulation": f"{2**bits_per_symbol}-{modulation.upper()}", "ber": {}}
-    
-    def demodulate(rx):
-        rx = tf.reshape(rx, [-1,1])
-        distances = tf.abs(rx - const.points[None,:])**2
-        return tf.argmin(distances, axis=1)
-    
-    for snr_db in snr_db_list:
-        num_symbols = num_bits // bits_per_symbol
-        idx = tf.random.uniform([num_symbols], minval=0, maxval=const.num_points, dtype=tf.int32)
-        tx = tf.gather(const.points, idx)
-        
-        snr_lin = 10**(snr_db/10)
-        no = tf.constant(1/snr_lin, dtype=tf.float32)
-        
+def _wilson_interval(errors, trials, confidence=0.95):
+    """Wilson score interval for an error probability estimated from counts."""
+    if trials <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = errors / trials
+    denom = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _point_stats(bit_errors, num_bits, confidence):
+    ci_low, ci_high = _wilson_interval(bit_errors, num_bits, confidence)
+    return {
+        "ber": float(bit_errors / num_bits) if num_bits else 0.0,
+        "bit_errors": int(bit_errors),
+        "num_bits": int(num_bits),
+        # The Wilson lower bound of zero errors is 0 up to rounding
+        "ci_low": float(ci_low) if bit_errors else 0.0,
+        "ci_high": float(ci_high),
+    }
+
+
+def _is_point_stats(bit_errors, sum_x, sum_x2, num_bits, bits_per_symbol, confidence, log_scale=0.0):
+    """BER, estimator variance and normal-approximation bounds of an IS estimate.
+
+    ``sum_x`` and ``sum_x2`` count weights in units of ``exp(log_scale)``
+    (see ``backends.is_log_scale``). The bounds follow from the relative
+    error, which does not depend on that unit; a variance too small for
+    float64 is reported as NaN, and an unresolved estimate gets ``[0, 1]``.
+    """
+    num_symbols = num_bits // bits_per_symbol
+    if num_symbols == 0:
+        return {"ber": 0.0, "bit_errors": 0, "num_bits": 0, "variance": 0.0, "ci_low": 0.0, "ci_high": 1.0}
+    mean = sum_x / num_symbols
+    scaled_variance = max(sum_x2 / num_symbols - mean**2, 0.0) / num_symbols / bits_per_symbol**2
+    ber = math.exp(log_scale) * mean / bits_per_symbol
+    variance = math.exp(2 * log_scale) * scaled_variance
+    if bit_errors and variance == 0.0:
+        variance = math.nan
+    ci_low, ci_high = 0.0, 1.0
+    if ber > 0 and scaled_variance > 0:
+        relative_half = NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(scaled_variance) / (mean / bits_per_symbol)
+        ci_low, ci_high = max(0.0, ber * (1 - relative_half)), min(1.0, ber * (1 + relative_half))
+    return {
+        "ber": float(ber),
+        "bit_errors": int(bit_errors),
+        "num_bits": int(num_bits),
+        "variance": float(variance),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+    }
+
+
+def _is_bias(modulation, bits_per_symbol, snr_db):
+    """Noise and fading scales ``(noise_scale, fade_scale)`` for IS at ``snr_db``.
+
+    The noise variance is inflated so a biased noise sample reaches half the
+    minimum distance of the constellation about once per standard deviation.
+    The fading power is shrunk by ``fade_scale``, the exponential tilt that
+    matches the Chernoff bound ``exp(-c |h|^2 / 2)`` of the conditional error
+    probability, which keeps the biased draws on the deep fades that
+    dominate the error rate for any number of combined branches.
+    """
+    d_min = _min_distance(modulation, bits_per_symbol)
+    c = max(1.0, d_min**2 * 10**(snr_db / 10) / 2)
+    return c, 1 + c / 2
+
+
+@functools.lru_cache(maxsize=None)
+def _min_distance(modulation, bits_per_symbol):
+    points = get_backend("numpy").constellation_points(modulation, bits_per_symbol)
+    distances = np.abs(points[:, None] - points[None, :])
+    return float(distances[~np.eye(len(points), dtype=bool)].min())
+
+
+def _beyond_budget(predicted_ber, target_errors, max_bits):
+    """Whether ``max_bits`` would show fewer than ``target_errors`` errors at ``predicted_ber``.
+
+    Hybrid runs answer such points from the closed form instead of
+    spending the whole budget on a count of (almost surely) zero.
+    """
+    return predicted_ber * max_bits < target_errors
+
+
+def _target_reached(stats, target_errors, target_ci_width):
+    if target_errors is not None and stats["bit_errors"] >= target_errors:
+        return True
+    if target_ci_width is not None and stats["bit_errors"] > 0 and stats["ber"] > 0:
+        # A zero width means the spread could not be resolved, not that it is nil
+        width = (stats["ci_high"] - stats["ci_low"]) / stats["ber"]
+        return 0.0 < width <= target_ci_width
+    return False
+
+
+def _resume_seed(seed, stored_bits):
+    """Seed for the samples added on top of ``stored_bits`` earlier ones.
+
+    A fixed ``seed`` would otherwise replay the stored samples; deriving
+    the stream from the amount already simulated keeps extensions
+    reproducible and independent of what they extend.
+    """
+    if seed is None or not stored_bits:
+        return seed
+    return [int(x) for x in np.random.SeedSequence(seed, spawn_key=(int(stored_bits),)).generate_state(4)]
+
+
+def _snr_key(snr_db):
+    """Integral SNRs stay ints so fixed and adaptive grids share result keys"""
+    snr_db = round(float(snr_db), 6)
+    return int(snr_db) if snr_db.is_integer() else snr_db
+
+
+def _is_resolved(stats):
+    """Whether a point's BER is precise enough to judge the curve's shape"""
+    return "bit_errors" not in stats or "variance" in stats or stats["bit_errors"] >= _ADAPTIVE_MIN_ERRORS
+
+
+def _adaptive_snr_points(evaluate, snr_range, ber_floor, seed=None):
+    """Place SNR points where a BER curve bends and evaluate them.
+
+    ``evaluate(snr_db_list, seed)`` simulates a batch of points and returns
+    ``{snr: (stats, ...)}`` with one stats dict per curve. A coarse grid over
+    ``snr_range`` is extended in ascending batches until every curve falls
+    below ``ber_floor``. Then the intervals next to each point where the
+    log-BER slope changes by more than ``_ADAPTIVE_SLOPE_TOL`` decades
+    per dB are halved. The slope change of a smooth curve shrinks with
+    the spacing, so a waterfall is refined down to a finite step, while
+    the tolerance itself does not depend on the spacing and a coarse grid
+    cannot hide a bend. Points below ``ber_floor`` and simulated points
+    with fewer than ``_ADAPTIVE_MIN_ERRORS`` errors do not count as bends.
+    Halving stops at ``_ADAPTIVE_MIN_STEP``, when nothing changes or
+    ``_ADAPTIVE_MAX_POINTS`` are spent. Every batch draws its own seed
+    spawned from ``seed``. Returns the evaluated SNRs in ascending order.
+    """
+    lo, hi = sorted(float(x) for x in snr_range)
+    seeds = np.random.SeedSequence(seed)
+    points = {}
+
+    def run(snrs):
+        batch_seed = [int(x) for x in seeds.spawn(1)[0].generate_state(4)]
+        points.update(evaluate(sorted(snrs), batch_seed))
+
+    def below_floor(snr):
+        return max(stats["ber"] for stats in points[snr]) < ber_floor
+
+    num_coarse = max(1, int(math.ceil((hi - lo) / _ADAPTIVE_COARSE_STEP - 1e-9)))
+    coarse = [_snr_key(lo + (hi - lo) * i / num_coarse) for i in range(num_coarse + 1)]
+    for start in range(0, len(coarse), 2):
+        run(coarse[start:start + 2])
+        if below_floor(max(points)):
+            break
+
+    while len(points) < _ADAPTIVE_MAX_POINTS:
+        snrs = sorted(points)
+        logs = [[math.log10(stats["ber"]) if stats["ber"] > 0 and _is_resolved(stats) else None
+                 for stats in points[snr]] for snr in snrs]
+        new = set()
+        for i in range(1, len(snrs) - 1):
+            a, b, c = snrs[i - 1:i + 2]
+            bends = any(None not in (lo_k, mid_k, hi_k) and mid_k >= math.log10(ber_floor)
+                        and abs((hi_k - mid_k) / (c - b) - (mid_k - lo_k) / (b - a)) > _ADAPTIVE_SLOPE_TOL
+                        for lo_k, mid_k, hi_k in zip(logs[i - 1], logs[i], logs[i + 1]))
+            if not bends:
+                continue
+            for x, y in ((a, b), (b, c)):
+                if (y - x) / 2 >= _ADAPTIVE_MIN_STEP and not (below_floor(x) and below_floor(y)):
+                    new.add(_snr_key((x + y) / 2))
+        new = sorted(new - set(points))[:_ADAPTIVE_MAX_POINTS - len(points)]
+        if not new:
+            break
+        run(new)
+    return sorted(points)
+
+
+def simulate_ber(modulation="qam", bits_per_symbol=2, snr_db_list=[-5, 15], num_bits=100000, channels=["awgn", "rayleigh"],
+                 target_errors=None, target_ci_width=None, max_bits=None, batch_bits=10000, confidence=0.95, seed=None,
+                 importance_sampling=False, method="montecarlo", backend=None, adaptive_snr=False, snr_range=None,
+                 ber_floor=1e-5, resume=False):
+    """Simulate BER for different channels
+
+    All SNR points are evaluated together by one compiled kernel on shared
+    symbol, fading and noise draws; only the noise scaling differs per
+    point. By default every point uses exactly ``num_bits``. Setting
+    ``target_errors`` and/or ``target_ci_width`` (confidence-interval width
+    relative to the estimate) switches to early stopping: bits are simulated
+    in batches of ``batch_bits`` and a point stops accumulating once a
+    target is met, or when ``max_bits`` (default ``num_bits``) is spent.
+
+    With ``importance_sampling`` the noise (AWGN) or fading (Rayleigh) is
+    drawn from a biased distribution and errors are reweighted, which
+    resolves error rates far below ``1 / num_bits``. Each point then also
+    reports the estimator ``variance`` in ``results["stats"]``, and
+    ``target_errors`` counts the observed (unweighted) errors.
+
+    ``method="analytic"`` returns the closed-form BER of square QAM and PAM
+    without simulating. ``method="hybrid"`` simulates, but gives each point
+    the bit budget needed for ``target_errors`` (default 100) errors at its
+    predicted BER, capped by ``max_bits``; points whose budget would be
+    capped are not simulated (unless ``importance_sampling`` is set) and
+    report the closed form with ``"method": "analytic"``. Constellations
+    without a closed form fall back to plain Monte Carlo.
+
+    ``backend`` selects "tensorflow" or "numpy" kernels; both give
+    statistically identical results.
+
+    With ``adaptive_snr`` the SNR points are placed automatically over
+    ``snr_range`` (default: the span of ``snr_db_list``): a coarse grid is
+    refined where the log-BER slope changes and is not extended past the
+    point where every channel is below ``ber_floor``.
+
+    With ``resume`` the error and bit counts of every (channel, SNR) point
+    are kept in the sample store (``sample_store.default_store``). A run
+    starts from the stored counts and only simulates the bits still
+    missing from its budget, so repeated requests cost nothing, larger
+    budgets add samples, and interrupted runs continue from their last
+    batch. Stats then report the reused bits as ``resumed_bits``.
+    """
+    if method not in _BER_METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if adaptive_snr:
+        options = dict(modulation=modulation, bits_per_symbol=bits_per_symbol, num_bits=num_bits, channels=channels,
+                       target_errors=target_errors, target_ci_width=target_ci_width, max_bits=max_bits,
+                       batch_bits=batch_bits, confidence=confidence, importance_sampling=importance_sampling,
+                       method=method, backend=backend, resume=resume)
+        results = {}
+
+        def evaluate(snrs, batch_seed):
+            batch = simulate_ber(snr_db_list=snrs, seed=batch_seed, **options)
+            if not results:
+                results.update(batch, ber={}, stats={})
+            results["ber"].update(batch["ber"])
+            results["stats"].update(batch["stats"])
+            return {snr: tuple(batch["stats"][snr].values()) for snr in snrs}
+
+        snrs = _adaptive_snr_points(evaluate, snr_range or (min(snr_db_list), max(snr_db_list)), ber_floor, seed)
+        results["ber"] = {snr: results["ber"][snr] for snr in snrs}
+        results["stats"] = {snr: results["stats"][snr] for snr in snrs}
+        return results
+    modulation, bits_per_symbol = _normalize_modulation(modulation, bits_per_symbol)
+    snr_db_list = sorted(snr_db_list)
+    channels = [ch for ch in ["awgn", "rayleigh"] if ch in channels]
+
+    results = {"modulation": f"{2**bits_per_symbol}-{modulation.upper()}", "ber": {}, "stats": {}}
+    if method == "analytic":
+        for snr_db in snr_db_list:
+            results["ber"][snr_db] = {}
+            results["stats"][snr_db] = {}
+            for ch in channels:
+                ber = analytic_ber.predict_ber(ch, modulation, bits_per_symbol, snr_db)
+                results["ber"][snr_db][ch] = ber
+                results["stats"][snr_db][ch] = {"ber": ber, "method": "analytic"}
+        return results
+
+    predicted = None
+    if method == "hybrid" and analytic_ber.is_supported(modulation, bits_per_symbol):
+        predicted = np.array([[analytic_ber.predict_ber(ch, modulation, bits_per_symbol, snr_db)
+                               for snr_db in snr_db_list] for ch in channels])
+        if target_errors is None and target_ci_width is None:
+            target_errors = _HYBRID_TARGET_ERRORS
+    if target_errors is None and target_ci_width is None:
+        batch_bits = max_bits = int(num_bits)
+    max_bits = int(max_bits or num_bits)
+
+    # Every batch has the same shape so the kernel is traced once; the
+    # last, shorter batch masks its tail through num_valid. Large fixed
+    # budgets are split into batches of at most _MAX_BATCH_SYMBOLS.
+    batch_symbols = max(1, min(int(batch_bits), max_bits) // bits_per_symbol)
+    batch_symbols = min(batch_symbols, _MAX_BATCH_SYMBOLS)
+    sigma = np.array([math.sqrt(1 / 10**(snr / 10)) for snr in snr_db_list])
+
+    # acc[:, c, i] holds the error statistics of channel c at SNR point i
+    acc = np.zeros((3, len(channels), len(snr_db_list)))
+    spent_bits = np.zeros((len(channels), len(snr_db_list)), dtype=np.int64)
+    store_configs = []
+    if resume:
+        store = default_store()
+        store_configs = [{"tool": "simulate_ber", "modulation": modulation, "bits_per_symbol": bits_per_symbol,
+                          "channel": ch, "importance_sampling": bool(importance_sampling)} for ch in channels]
+        if importance_sampling:
+            # AWGN sums count weights in units of is_log_scale; older entries used plain weights
+            for config in store_configs:
+                config["weight_unit"] = "is_log_scale"
+        for c, config in enumerate(store_configs):
+            for i, snr_db in enumerate(snr_db_list):
+                acc[:, c, i], spent_bits[c, i] = store.get(config, snr_db)
+    resumed_bits = spent_bits.copy()
+
+    engine = get_backend(backend)
+    seeds = engine.seed_stream(_resume_seed(seed, spent_bits.sum()))
+    if importance_sampling:
+        kernel = engine.ber_is_kernel(modulation, bits_per_symbol, batch_symbols, len(snr_db_list), tuple(channels))
+        noise_scale, fade_scale = np.array([_is_bias(modulation, bits_per_symbol, snr) for snr in snr_db_list]).T
+        run_batch = lambda num_symbols: kernel(sigma, noise_scale, fade_scale, num_symbols, next(seeds))
+        # log_scale[c, i] is the weight unit of channel c at SNR point i
+        log_scale = np.array([[is_log_scale(s) if ch == "awgn" else 0.0 for s in noise_scale] for ch in channels])
+    else:
+        kernel = engine.ber_kernel(modulation, bits_per_symbol, batch_symbols, len(snr_db_list), tuple(channels))
+        run_batch = lambda num_symbols: kernel(sigma, num_symbols, next(seeds))[None]
+
+    def point_stats(acc, num_bits, c, i):
+        if importance_sampling:
+            return _is_point_stats(acc[0], acc[1], acc[2], num_bits, bits_per_symbol, confidence, log_scale[c, i])
+        return _point_stats(acc[0], num_bits, confidence)
+
+    budget = np.full(spent_bits.shape, max_bits, dtype=np.int64)
+    if predicted is not None:
+        budget = np.vectorize(analytic_ber.required_bits)(
+            predicted, target_errors or _HYBRID_TARGET_ERRORS, batch_symbols * bits_per_symbol, max_bits)
+    done = np.zeros(spent_bits.shape, dtype=bool)
+    analytic = np.zeros(spent_bits.shape, dtype=bool)
+    if predicted is not None and not importance_sampling:
+        analytic = _beyond_budget(predicted, target_errors or _HYBRID_TARGET_ERRORS, max_bits)
+        done |= analytic
+    for c, i in zip(*np.nonzero((spent_bits > 0) & ~analytic)):
+        done[c, i] = (spent_bits[c, i] >= budget[c, i]
+                      or _target_reached(point_stats(acc[:, c, i], spent_bits[c, i], c, i), target_errors, target_ci_width))
+    # Stored points have fewer bits left to simulate than fresh ones
+    max_new_bits = max_bits - int(spent_bits[~done].min()) if not done.all() else 0
+    used_bits = 0
+    while (max_new_bits - used_bits >= bits_per_symbol or used_bits == 0) and not done.all():
+        left_bits = max_new_bits - used_bits
+        if resume:
+            # Points share every batch, so a stored point must not run past its budget
+            left_bits = min(left_bits, int((budget - spent_bits)[~done].min()))
+        num_symbols = max(1, min(batch_symbols, left_bits // bits_per_symbol))
+        batch = run_batch(num_symbols)
+        used_bits += num_symbols * bits_per_symbol
+        acc[:len(batch), ~done] += batch[:, ~done]
+        spent_bits[~done] += num_symbols * bits_per_symbol
+        for c, config in enumerate(store_configs):
+            if not done[c].all():
+                store.put(config, {snr_db: (acc[:, c, i], spent_bits[c, i])
+                                   for i, snr_db in enumerate(snr_db_list) if not done[c, i]})
+        for c, i in zip(*np.nonzero(~done)):
+            done[c, i] = (spent_bits[c, i] >= budget[c, i]
+                          or _target_reached(point_stats(acc[:, c, i], spent_bits[c, i], c, i), target_errors, target_ci_width))
+
+    for i, snr_db in enumerate(snr_db_list):
         results["ber"][snr_db] = {}
-        
-        if "awgn" in channels:
-            rx_awgn = awgn(tx, no)
-            idx_awgn = tf.cast(demodulate(rx_awgn), tf.int32)
-            idx_cast = tf.cast(idx, tf.int32)
-            ser = tf.reduce_mean(tf.cast(idx_awgn != idx_cast, tf.float32)).numpy()
-            results["ber"][snr_db]["awgn"] = min(ser * bits_per_symbol, 0.5)
-        
-        if "rayleigh" in channels:
-            h, _ = rayleigh(batch_size=num_symbols, num_time_steps=1)
-            h = tf.squeeze(h)
-            rx_rayleigh = awgn(h * tx, no) / h
-            idx_rayleigh = tf.cast(demodulate(rx_rayleigh), tf.int32)
-            idx_cast = tf.cast(idx, tf.int32)
-            ser = tf.reduce_mean(tf.cast(idx_rayleigh != idx_cast, tf.float32)).numpy()
-            results["ber"][snr_db]["rayleigh"] = min(ser * bits_per_symbol, 0.5)
+        results["stats"][snr_db] = {}
+        for c, ch in enumerate(channels):
+            if analytic[c, i]:
+                stats = {"ber": float(predicted[c, i]), "method": "analytic"}
+            else:
+                stats = point_stats(acc[:, c, i], int(spent_bits[c, i]), c, i)
+            if predicted is not None:
+                stats["predicted_ber"] = float(predicted[c, i])
+            if resume:
+                stats["resumed_bits"] = int(resumed_bits[c, i])
+            results["ber"][snr_db][ch] = stats["ber"]
+            results["stats"][snr_db][ch] = stats
     
     return results
 
-def simulate_radio_map(tx_position=[0,0,0], rx_position=[100,0,0], metric="rss"):
-    """Generate radio coverage map using ray tracing (runs external script)"""
-    tx_position = _to_float_triplet(tx_position)
-    rx_position = _to_float_triplet(rx_position)
-    script_path = os.path.join(os.path.dirname(__file__), "..", "scripts", "run_radiomap.py")
-    result = subprocess.run(["python3", script_path, metric, 
-                           str(tx_position[0]), str(tx_position[1]), str(tx_position[2]),
-                           str(rx_position[0]), str(rx_position[1]), str(rx_position[2])],
-                          capture_output=True, text=True)
-    
-    filename = f"radiomap_{metric}_{_positions_slug('tx', [tx_position])}_{_positions_slug('rx', [rx_position])}.png"
-    abs_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "outputs", filename))
+def _map_on_workers(function, items):
+    """``map`` with one thread per radio-map worker, so each item's jobs can run on its own worker"""
+    items = list(items)
+    num_workers = default_pool().num_workers
+    if len(items) <= 1 or num_workers == 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(min(num_workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+
+def _trace_on_worker(tx_positions, look_at, layout, keys, solver):
+    """Trace path gains in batches of ``_TRACE_BATCH_TX`` transmitters, spread over the radio-map workers"""
+    pool = default_pool()
+    batches = [(tx_positions[i:i + _TRACE_BATCH_TX], keys[i:i + _TRACE_BATCH_TX])
+               for i in range(0, len(keys), _TRACE_BATCH_TX)]
+
+    def run(batch):
+        pool.run("trace_tx_gains", tx_positions=batch[0], look_at=look_at, layout=layout, keys=batch[1], solver=solver)
+
+    _map_on_workers(run, batches)
+
+
+# Background refinements of progressive maps by target grid key: the
+# plots to re-render after each stage, as {artifact key: (metric, params)}
+_REFINEMENTS = {}
+_REFINEMENTS_LOCK = threading.Lock()
+
+
+def _render_plot(grid_key, meta, grids, metric, plot_key, params):
+    """Render a radio-map plot of the grids stored under ``grid_key`` into the artifact store; returns its path"""
+    return default_artifact_store().put("radiomap", plot_key, lambda path: radio_maps.render(meta, grids, metric, path),
+                                        dict(params, rendered_grid_key=grid_key))
+
+
+def _refine_radio_map(target_key, layout_args, layout_options, stages):
+    """Trace the remaining progressive ``stages`` and re-render every registered plot after each"""
+    store = radio_maps.default_grid_store()
+    rendered = {}
+    try:
+        for samples in stages:
+            key, _ = radio_maps.assemble(store, *layout_args, samples_per_tx=samples, **layout_options)
+            meta, grids = store.load(key)
+            with _REFINEMENTS_LOCK:
+                plots = dict(_REFINEMENTS[target_key])
+            for plot_key, (metric, params) in plots.items():
+                _render_plot(key, meta, grids, metric, plot_key, params)
+                rendered[plot_key] = samples
+    except Exception:
+        traceback.print_exc()
+    finally:
+        with _REFINEMENTS_LOCK:
+            plots = _REFINEMENTS.pop(target_key)
+    # Plots registered while the last stage was rendering
+    stored = store.load(target_key)
+    for plot_key, (metric, params) in plots.items():
+        if stored is not None and rendered.get(plot_key) != stages[-1]:
+            _render_plot(target_key, *stored, metric, plot_key, params)
+
+
+def _radio_map_job(tx_positions, rx_positions, metric, tx_power_dbm=None, area=None,
+                   quality=radio_maps.DEFAULT_QUALITY, progressive=False, max_cells=None, tiled=None):
+    """Render ``metric`` for a layout, ray tracing on a warm worker only the transmitters not stored yet.
+
+    The plot is an artifact keyed by the metric and the layout's grid key
+    (``artifact_store``), so equal requests share one file and a plot of a
+    stored layout is served without rendering. With ``progressive``, a
+    layout not stored at ``quality`` is rendered from its best stored
+    progressive stage (tracing the first, low-sample stage if there is
+    none), and a background thread traces the remaining stages,
+    accumulating samples into the stored path gains and re-rendering the
+    plot after each. ``max_cells`` and ``tiled`` set the map resolution
+    and tiling (``radio_maps.map_layout``); tiles are traced concurrently
+    across the workers. Returns the result fields shared by the radio-map
+    tools.
+    """
+    store = radio_maps.default_grid_store()
+    layout_args = (tx_positions, rx_positions, _trace_on_worker, tx_power_dbm, area, quality)
+    layout_options = {"max_cells": max_cells, "tiled": tiled, "map_fn": _map_on_workers}
+    target_key = radio_maps.layout_key(tx_positions, rx_positions, tx_power_dbm, area, quality,
+                                       max_cells=max_cells, tiled=tiled)
+    plot_key = artifact_key("radiomap", {"metric": metric, "grid_key": target_key})
+    plot_params = {"metric": metric, "grid_key": target_key, "tx_positions": tx_positions,
+                   "rx_positions": rx_positions, "tx_power_dbm": tx_power_dbm, "area": area, "quality": quality,
+                   "max_cells": max_cells, "tiled": tiled}
+    was_stored = store.contains(target_key)
+    samples, remaining = None, []
+    if progressive and not was_stored:
+        stages = radio_maps.progressive_stages(quality)
+        stored = radio_maps.stored_samples(store, tx_positions, rx_positions, area, quality, max_cells, tiled)
+        samples = max([s for s in stages if s <= stored], default=stages[0])
+        remaining = [s for s in stages if s > samples]
+    key, num_traced = radio_maps.assemble(store, *layout_args, samples_per_tx=samples, **layout_options)
+    meta, grids = store.load(key)
+    # A plot rendered from an earlier progressive stage is not reused
+    plot = default_artifact_store().get(plot_key)
+    if plot is not None and plot["params"].get("rendered_grid_key") == key:
+        plot_path = plot["path"]
+    else:
+        plot_path = _render_plot(key, meta, grids, metric, plot_key, plot_params)
+
+    if remaining:
+        with _REFINEMENTS_LOCK:
+            plots = _REFINEMENTS.get(target_key)
+            if plots is None:
+                plots = _REFINEMENTS[target_key] = {}
+                threading.Thread(target=_refine_radio_map, args=(target_key, layout_args, layout_options, remaining),
+                                 name=f"refine-{target_key[:8]}", daemon=True).start()
+            plots[plot_key] = (metric, plot_params)
     return {
-        "tx_position": tx_position,
-        "rx_position": rx_position,
-        "metric": metric,
-        "output": result.stdout,
-        "plot_path": abs_path,
-        "relative_plot_path": os.path.join("outputs", filename),
-        "cwd_plot_path": os.path.join(os.getcwd(), "outputs", filename),
+        "output": f"Saved: {plot_path}\n",
+        "grid_key": key,
+        "grid_cached": was_stored,
+        "traced_transmitters": num_traced,
+        "grid": store.describe(key),
+        "quality": quality,
+        "samples_per_tx": meta["solver"]["samples_per_tx"],
+        "target_samples_per_tx": radio_maps.solver_params(quality)["samples_per_tx"],
+        "refining": bool(remaining),
+        "target_grid_key": target_key,
+        "tiles": len(radio_maps.tile_layouts(meta)) if "tile_cells" in meta else 1,
+        "plot_key": plot_key,
+        "plot_path": plot_path,
+        "relative_plot_path": os.path.relpath(plot_path, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")),
+        "cwd_plot_path": os.path.abspath(plot_path),
     }
 
 
-def simulate_multi_radio_map(tx_positions, rx_positions=None, metric="rss"):
-    """Generate radio coverage map for multiple transmitters"""
+def simulate_radio_map(tx_position=[0,0,0], rx_position=[100,0,0], metric="rss",
+                       quality=radio_maps.DEFAULT_QUALITY, progressive=False, max_cells=None, tiled=None):
+    """Generate radio coverage map using ray tracing (runs on a warm worker process).
+
+    The traced grids are stored by layout, so asking for another ``metric``
+    of the same positions re-renders them without ray tracing. ``quality``
+    is a tier of ``radio_maps.QUALITY_TIERS`` (preview, standard, final);
+    ``progressive`` returns a low-sample map at once and refines the plot
+    in the background (see ``_radio_map_job``). ``max_cells`` caps the
+    cells of the map (default ``radio_maps.DEFAULT_MAX_CELLS``) by
+    coarsening its resolution, and ``tiled`` splits it into tiles traced
+    in parallel and cached one by one (default: maps larger than a tile).
+    """
+    tx_position = _to_float_triplet(tx_position)
+    rx_position = _to_float_triplet(rx_position)
+    fields = _radio_map_job([tx_position], [rx_position], metric, quality=quality, progressive=progressive,
+                            max_cells=max_cells, tiled=tiled)
+    return dict({"tx_position": tx_position, "rx_position": rx_position, "metric": metric}, **fields)
+
+
+def simulate_multi_radio_map(tx_positions, rx_positions=None, metric="rss", tx_power_dbm=None, area=None,
+                             quality=radio_maps.DEFAULT_QUALITY, progressive=False, max_cells=None, tiled=None):
+    """Generate radio coverage map for multiple transmitters.
+
+    Every transmitter's path gain is traced once and stored on its own, so
+    any subset of known transmitters, per-TX powers (``tx_power_dbm``,
+    scalar or one per TX, default the transmitter's 44 dBm) and metrics
+    are combined by array arithmetic without ray tracing. ``area`` =
+    [min_x, min_y, max_x, max_y] fixes the map extent, so that subsets of
+    a layout reuse each other's transmitters. ``quality``,
+    ``progressive``, ``max_cells`` and ``tiled`` work as in
+    ``simulate_radio_map``; widely spread transmitters are what tiling is
+    for.
+    """
     if not tx_positions:
         raise ValueError("tx_positions must contain at least one transmitter")
     if rx_positions is None or len(rx_positions) == 0:
@@ -160,26 +738,206 @@ def simulate_multi_radio_map(tx_positions, rx_positions=None, metric="rss"):
         rx_positions = _parse_positions_string(rx_positions)
     tx_positions = [_to_float_triplet(pos) for pos in tx_positions]
     rx_positions = [_to_float_triplet(pos) for pos in rx_positions]
-    script_path = os.path.join(os.path.dirname(__file__), "..", "scripts", "run_radiomap.py")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode="w", encoding="utf-8") as tmp:
-        json.dump({"tx_positions": tx_positions, "rx_positions": rx_positions, "metric": metric}, tmp)
-        tmp_path = tmp.name
+    fields = _radio_map_job(tx_positions, rx_positions, metric, tx_power_dbm, area, quality, progressive,
+                            max_cells, tiled)
+    return dict({"tx_positions": tx_positions, "rx_positions": rx_positions, "metric": metric}, **fields)
+
+def _candidate_sites(area, spacing, height):
+    """Centres of a ``spacing`` grid over ``area`` at ``height``"""
+    xs = np.arange(area[0] + spacing / 2, area[2], spacing)
+    ys = np.arange(area[1] + spacing / 2, area[3], spacing)
+    return [[float(x), float(y), float(height)] for y in ys for x in xs]
+
+
+def optimize_tx_placement(area, num_tx=4, objective="mean_sinr", candidate_positions=None, candidate_spacing=50.0,
+                          tx_height=10.0, rx_positions=None, sinr_threshold_db=0.0, tx_power_dbm=None,
+                          max_passes=10, max_cells=1 << 16, num_workers=None, quality=radio_maps.DEFAULT_QUALITY):
+    """Choose ``num_tx`` transmitter sites out of a candidate set to maximize a coverage objective.
+
+    Candidates are ``candidate_positions`` or the centres of a
+    ``candidate_spacing`` grid over ``area`` = [min_x, min_y, max_x, max_y]
+    at ``tx_height``. Each candidate's path gain over ``area`` is traced
+    once (in batches across the radio-map workers) and stored, so repeated
+    or refined searches trace nothing. A greedy pass adds the best site
+    until ``num_tx`` are placed, or stops earlier when another site would
+    lower the ``objective`` (interference can outweigh coverage; the
+    result then carries a ``warning``), and local search applies the best
+    single-site swap until none improves it (see
+    ``placement.PlacementSearch``). The search scores a strided subset of
+    at most ``max_cells`` cells, candidates are scored concurrently on
+    ``num_workers`` threads, and the result reports the objective of the
+    chosen layout on the full map together with its SINR radio map.
+    Transmitters look at the first of ``rx_positions`` (default: the
+    centre of ``area``); ``quality`` is the radio-map tier the candidates
+    are traced at, so a ``preview`` search is a cheap first pass.
+    """
+    area = [float(v) for v in area]
+    if len(area) != 4 or area[2] <= area[0] or area[3] <= area[1]:
+        raise ValueError("area must be [min_x, min_y, max_x, max_y] with max > min")
+    if isinstance(candidate_positions, str):
+        candidate_positions = _parse_positions_string(candidate_positions)
+    if candidate_positions:
+        candidates = [_to_float_triplet(pos) for pos in candidate_positions]
+    else:
+        candidates = _candidate_sites(area, float(candidate_spacing), float(tx_height))
+    if len(candidates) > _MAX_PLACEMENT_CANDIDATES:
+        raise ValueError(f"{len(candidates)} candidate sites exceed the limit of {_MAX_PLACEMENT_CANDIDATES}; "
+                         "increase candidate_spacing")
+    num_tx = int(num_tx)
+    if not 1 <= num_tx <= len(candidates):
+        raise ValueError(f"num_tx must be between 1 and the number of candidates ({len(candidates)})")
+    if isinstance(rx_positions, str):
+        rx_positions = _parse_positions_string(rx_positions)
+    if rx_positions:
+        rx_positions = [_to_float_triplet(pos) for pos in rx_positions]
+    else:
+        rx_positions = [[(area[0] + area[2]) / 2, (area[1] + area[3]) / 2, 1.5]]
+
+    store = radio_maps.default_grid_store()
+    solver, layout, _ = radio_maps.plan(candidates, rx_positions, area, quality)
+    _, loaded, num_traced = radio_maps.load_layout_gains(store, candidates, rx_positions[0], layout, solver,
+                                                         _trace_on_worker, _map_on_workers)
+    tx_meta = loaded[0][0]
+    power_dbm = tx_meta["tx_power_dbm"] if tx_power_dbm is None else float(tx_power_dbm)
+    stride = placement.cell_stride(loaded[0][1].shape, max_cells)
+    power = np.float32(10 ** ((power_dbm - 30) / 10))
+    rss = np.stack([np.asarray(gain[::stride, ::stride]).ravel() * power for _, gain in loaded])
+
+    num_workers = int(num_workers or _DEFAULT_WORKERS)
+    executor = ThreadPoolExecutor(num_workers) if num_workers > 1 else None
     try:
-        result = subprocess.run(["python3", script_path, "--config", tmp_path],
-                                capture_output=True, text=True)
+        search = placement.PlacementSearch(rss, tx_meta["noise_power"], objective, float(sinr_threshold_db), executor)
+        sites, trace = search.greedy(num_tx)
+        greedy_value = search.score(sites)
+        sites, swaps = search.local_search(sites, int(max_passes))
+        trace += swaps
     finally:
-        os.unlink(tmp_path)
-    filename = f"radiomap_{metric}_{_positions_slug('tx', tx_positions)}_{_positions_slug('rx', rx_positions)}.png"
-    abs_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "outputs", filename))
-    return {
+        if executor is not None:
+            executor.shutdown()
+
+    best = [candidates[i] for i in sites]
+    for step in trace:
+        step["position"] = candidates[step["site"]]
+        if "removed" in step:
+            step["removed_position"] = candidates[step["removed"]]
+    # Score the chosen layout on every cell, not just the searched subset
+    full = placement.PlacementSearch(
+        np.stack([np.asarray(loaded[i][1]).ravel() * power for i in sites]),
+        tx_meta["noise_power"], objective, float(sinr_threshold_db))
+    radio_map = simulate_multi_radio_map(best, rx_positions, metric="sinr", tx_power_dbm=tx_power_dbm, area=area,
+                                         quality=quality)
+    result = {
+        "tx_positions": best,
+        "num_tx": len(sites),
+        "requested_num_tx": num_tx,
+        "objective": objective,
+        "objective_value": full.score(range(len(sites))),
+        "search_objective_value": search.score(sites),
+        "greedy_objective_value": greedy_value,
+        "trace": trace,
+        "num_candidates": len(candidates),
+        "evaluations": search.evaluations,
+        "cell_stride": stride,
+        "traced_transmitters": num_traced,
+        "grid_key": radio_map["grid_key"],
+        "plot_path": radio_map["plot_path"],
+        "relative_plot_path": radio_map["relative_plot_path"],
+        "cwd_plot_path": radio_map["cwd_plot_path"],
+    }
+    if len(sites) < num_tx:
+        result["warning"] = (f"Placed {len(sites)} of {num_tx} transmitters: the best further site lowers "
+                             f"{objective} from {greedy_value:.4g} to {trace[len(sites)]['objective']:.4g}")
+    return result
+
+
+def query_radio_map(grid_key, metric="sinr", points=None, percentiles=[5, 50, 95], thresholds=None, cdf_points=21):
+    """Values at points and coverage statistics of a stored radio map.
+
+    ``grid_key`` comes from a ``simulate_radio_map`` or
+    ``simulate_multi_radio_map`` result. ``points`` are ``[x, y(, z)]``
+    positions in metres; ``thresholds`` (dB, dBm for RSS) give the share
+    of map cells at or above each. Works on memory maps of the stored
+    grids, so no ray tracing or full map load is needed.
+    """
+    view = radio_maps.default_grid_store().open(grid_key)
+    if view is None:
+        raise ValueError(f"No stored radio map with key {grid_key}; run simulate_radio_map first")
+    if isinstance(points, str):
+        points = _parse_positions_string(points)
+    result = {"grid_key": grid_key}
+    result.update(view.statistics(metric, percentiles=percentiles, thresholds=thresholds or (),
+                                  cdf_points=cdf_points))
+    if points:
+        result["points"] = {"positions": points, "values": view.sample(metric, points)}
+    return result
+
+
+def evaluate_links(tx_positions, rx_positions, pairs=None, tx_power_dbm=None, max_depth=5,
+                   samples_per_src=10**6, seed=41):
+    """Path gain, RSS, SNR and delay spread of TX-RX links from batched ``PathSolver`` runs.
+
+    Much cheaper than a radio map when only given receivers matter: every
+    transmitter and receiver is placed in the warm worker scene and one
+    solve (per ``_LINK_BATCH_TX`` transmitters, spread over the radio-map
+    workers) traces all their links. Metrics are ``[num_tx, num_rx]``
+    arrays, or one value per ``pairs`` entry ``[tx_index, rx_index]``.
+    ``tx_power_dbm`` is a scalar or one power per transmitter (default
+    the transmitter's 44 dBm); SNR is against the scene's thermal noise.
+    Links without paths have -inf dB and NaN delays.
+    """
+    if isinstance(tx_positions, str):
+        tx_positions = _parse_positions_string(tx_positions)
+    if isinstance(rx_positions, str):
+        rx_positions = _parse_positions_string(rx_positions)
+    if not tx_positions or not rx_positions:
+        raise ValueError("tx_positions and rx_positions must each contain at least one position")
+    tx_positions = [_to_float_triplet(pos) for pos in tx_positions]
+    rx_positions = [_to_float_triplet(pos) for pos in rx_positions]
+    if len(tx_positions) * len(rx_positions) > _MAX_LINKS:
+        raise ValueError(f"{len(tx_positions)} x {len(rx_positions)} links exceed the limit of {_MAX_LINKS}")
+    if pairs is not None:
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        if ((pairs < 0) | (pairs >= [len(tx_positions), len(rx_positions)])).any():
+            raise ValueError("pairs must hold [tx_index, rx_index] within tx_positions and rx_positions")
+
+    pool = default_pool()
+
+    def solve(batch):
+        value, _ = pool.run("evaluate_links", tx_positions=batch, rx_positions=rx_positions,
+                            max_depth=int(max_depth), samples_per_src=int(samples_per_src), seed=int(seed))
+        return value
+
+    solved = _map_on_workers(solve, [tx_positions[i:i + _LINK_BATCH_TX]
+                                     for i in range(0, len(tx_positions), _LINK_BATCH_TX)])
+    links = {name: np.concatenate([batch[name] for batch in solved])
+             for name in ("path_gain", "mean_delay", "delay_spread", "num_paths")}
+    if pairs is not None:
+        links = {name: values[pairs[:, 0], pairs[:, 1]] for name, values in links.items()}
+
+    power_dbm = solved[0]["tx_power_dbm"] if tx_power_dbm is None else tx_power_dbm
+    power_dbm = np.broadcast_to(np.asarray(power_dbm, dtype=np.float64), (len(tx_positions),))
+    link_power_dbm = power_dbm[pairs[:, 0]] if pairs is not None else power_dbm[:, None]
+    noise_power_dbm = 10 * np.log10(solved[0]["noise_power"]) + 30
+    path_gain_db = radio_maps.to_db(links["path_gain"], "path_gain")
+    rss_dbm = path_gain_db + link_power_dbm
+    result = {
         "tx_positions": tx_positions,
         "rx_positions": rx_positions,
-        "metric": metric,
-        "output": result.stdout,
-        "plot_path": abs_path,
-        "relative_plot_path": os.path.join("outputs", filename),
-        "cwd_plot_path": os.path.join(os.getcwd(), "outputs", filename),
+        "tx_power_dbm": power_dbm.tolist(),
+        "noise_power_dbm": float(noise_power_dbm),
+        "links": {
+            "path_gain_db": path_gain_db.astype(np.float32),
+            "rss_dbm": rss_dbm.astype(np.float32),
+            "snr_db": (rss_dbm - noise_power_dbm).astype(np.float32),
+            "mean_delay_ns": (links["mean_delay"] * 1e9).astype(np.float32),
+            "delay_spread_ns": (links["delay_spread"] * 1e9).astype(np.float32),
+            "num_paths": links["num_paths"].astype(np.int32),
+        },
     }
+    if pairs is not None:
+        result["pairs"] = pairs.tolist()
+    return result
+
 
 def list_available_tools():
     """List all available simulation tools"""
@@ -188,109 +946,290 @@ def list_available_tools():
         "simulate_ber": "Calculate Bit Error Rate for different channels",
         "simulate_radio_map": "Generate radio coverage map using ray tracing",
         "simulate_multi_radio_map": "Generate radio map for multiple transmitters and receivers",
+        "query_radio_map": "Point values, percentiles, CDF and coverage of a stored radio map",
+        "optimize_tx_placement": "Search candidate sites for the transmitter layout that maximizes SINR, coverage or throughput",
+        "evaluate_links": "Path gain, RSS, SNR and delay spread of specific TX-RX links (no radio map)",
         "simulate_ber_mimo": "Simulate BER for MIMO systems with configurable antennas",
         "compare_mimo_performance": "Compare SISO vs MIMO performance with BER plots"
     }
 
-def simulate_ber_mimo(num_tx_ant=1, num_rx_ant=1, num_bits=100000):
+def _detector_stats(engine, seeds, detector, num_tx_ant, num_rx_ant, snr_dbs, budgets, chunk_symbols,
+                    stored=None, save=None):
+    """Spatial-multiplexing BER statistics of all SNR points from shared channel draws.
+
+    ``budgets`` caps the bits counted per point. Points share every chunk,
+    so a chunk is never longer than the smallest budget still open, and
+    each point stops accumulating exactly at its own.
+    ``stored`` holds ``(bit_errors, num_bits)`` per point to continue from,
+    and ``save(bit_errors, num_bits)`` is called after every chunk.
+    """
+    bits_per_use = 2 * num_tx_ant
+    budget_uses = np.asarray(budgets, dtype=np.int64) // bits_per_use
+    bit_errors = np.zeros(len(snr_dbs), dtype=np.int64)
+    spent_uses = np.zeros(len(snr_dbs), dtype=np.int64)
+    if stored is not None:
+        bit_errors[:] = [errors for errors, _ in stored]
+        spent_uses[:] = [bits // bits_per_use for _, bits in stored]
+    max_uses = int((budget_uses - spent_uses).max(initial=0))
+    chunk = mimo_chunk_symbols(max_uses, num_rx_ant, num_tx_ant, chunk_symbols, detector, len(snr_dbs))
+    kernel = engine.detector_kernel(chunk, num_rx_ant, num_tx_ant, detector, len(snr_dbs))
+    sigma = np.array([math.sqrt(1.0 / 10 ** (snr_db / 10)) for snr_db in snr_dbs])
+    active = spent_uses < budget_uses
+    while active.any():
+        num_valid = min(chunk, int((budget_uses - spent_uses)[active].min()))
+        batch = kernel(sigma, num_valid, next(seeds))
+        bit_errors[active] += batch[active].astype(np.int64)
+        spent_uses[active] += num_valid
+        if save is not None:
+            save(bit_errors, spent_uses * bits_per_use)
+        active = spent_uses < budget_uses
+    return [_point_stats(int(errors), int(uses) * bits_per_use, 0.95)
+            for errors, uses in zip(bit_errors, spent_uses)]
+
+
+def simulate_ber_mimo(num_tx_ant=1, num_rx_ant=1, num_bits=100000, seed=None, importance_sampling=False,
+                      return_stats=False, method="montecarlo", backend=None, chunk_symbols=None, detector="mrc",
+                      snr_db_list=None, adaptive_snr=False, snr_range=None, ber_floor=1e-5, resume=False):
     """
     Simulate BER for MIMO Rayleigh fading channel with QPSK modulation.
+
+    Symbols are simulated in fixed-size chunks with running error counts,
+    so peak memory depends on ``chunk_symbols`` and the antenna counts but
+    not on ``num_bits``.
     Args:
         num_tx_ant: number of transmit antennas
         num_rx_ant: number of receive antennas
         num_bits: total bits to transmit
+        seed: optional seed for reproducible results
+        importance_sampling: bias the combined channel towards deep fades and
+            the noise towards the decision boundary, then reweight errors, to
+            resolve very small BERs
+        return_stats: also return per-point statistics
+        method: "montecarlo", "analytic" (closed-form MRC BER, single TX
+            antenna only) or "hybrid" (simulate each SNR point with about
+            100 expected errors at the analytic BER, at most num_bits;
+            points needing more report the analytic BER instead, unless
+            importance_sampling is set)
+        backend: "tensorflow" or "numpy" simulation kernels
+        chunk_symbols: symbols per chunk (default: about 4M channel
+            coefficients per chunk)
+        detector: "mrc" (the same symbol on every transmit antenna, combined
+            on the first one), or "zf", "mmse", "ml" (one independent QPSK
+            stream per transmit antenna, ML for at most 4 antennas); the
+            spatial-multiplexing detectors evaluate all SNR points on
+            shared channels and factorize each channel once
+        snr_db_list: SNR points in dB (default 0 to 20 in steps of 2)
+        adaptive_snr: place the SNR points automatically over snr_range
+            (default [0, 20]), refining where the log-BER slope changes
+            and stopping once the BER is below ber_floor
+        resume: continue from the error and bit counts stored for this
+            antenna/detector configuration and simulate only the missing
+            bits of each SNR point, saving the totals after every chunk
     Returns:
-        ber_dict: dictionary mapping SNR(dB) -> BER
+        ber_dict: dictionary mapping SNR(dB) -> BER, or with return_stats
+        {"ber": ber_dict, "stats": {SNR(dB): {...}}}; importance sampling
+        stats include the estimator variance
     """
-    const_points = tf.constant([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j], dtype=tf.complex64) / tf.cast(tf.sqrt(2.0), tf.complex64)
+    if method not in _BER_METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    if method == "analytic" and int(num_tx_ant) != 1:
+        raise ValueError("Analytic MIMO BER is only available for num_tx_ant=1 (MRC)")
+    if detector not in _MIMO_DETECTORS:
+        raise ValueError(f"Unknown detector: {detector} (choose from {', '.join(_MIMO_DETECTORS)})")
+    if detector != "mrc" and importance_sampling:
+        raise ValueError("Importance sampling is only available with the MRC detector")
+    if detector == "zf" and int(num_rx_ant) < int(num_tx_ant):
+        raise ValueError("ZF detection needs num_rx_ant >= num_tx_ant")
+    if detector == "ml" and int(num_tx_ant) > _ML_MAX_TX_ANT:
+        raise ValueError(f"ML detection is limited to num_tx_ant <= {_ML_MAX_TX_ANT}")
+    if adaptive_snr:
+        options = dict(num_tx_ant=num_tx_ant, num_rx_ant=num_rx_ant, num_bits=num_bits,
+                       importance_sampling=importance_sampling, method=method, backend=backend,
+                       chunk_symbols=chunk_symbols, detector=detector, resume=resume)
+        stats_dict = {}
+
+        def evaluate(snrs, batch_seed):
+            batch = simulate_ber_mimo(snr_db_list=snrs, seed=batch_seed, return_stats=True, **options)["stats"]
+            stats_dict.update(batch)
+            return {snr: (stats,) for snr, stats in batch.items()}
 
+        snrs = _adaptive_snr_points(evaluate, snr_range or (0, 20), ber_floor, seed)
+        ber_dict = {snr: stats_dict[snr]["ber"] for snr in snrs}
+        if return_stats:
+            return {"ber": ber_dict, "stats": {snr: stats_dict[snr] for snr in snrs}}
+        return ber_dict
     bits_per_symbol = 2
-    snr_dbs = range(0, 21, 2)  # 0~20dB, step 2
+    snr_dbs = range(0, 21, 2) if snr_db_list is None else [_snr_key(snr) for snr in snr_db_list]
     ber_dict = {}
+    stats_dict = {}
+    num_symbols = num_bits // bits_per_symbol
+    num_bits = num_symbols * bits_per_symbol
+    # stored[snr] = (error statistics [3], bits) already simulated
+    stored = {snr_db: (np.zeros(3), 0) for snr_db in snr_dbs}
+    if resume and method != "analytic":
+        store = default_store()
+        store_config = {"tool": "simulate_ber_mimo", "num_tx_ant": int(num_tx_ant), "num_rx_ant": int(num_rx_ant),
+                        "detector": detector, "importance_sampling": bool(importance_sampling)}
+        for snr_db in snr_dbs:
+            acc, bits = store.get(store_config, snr_db)
+            stored[snr_db] = (np.array(acc), bits)
+    engine = get_backend(backend)
+    seeds = engine.seed_stream(_resume_seed(seed, sum(bits for _, bits in stored.values())))
 
-    for snr_db in snr_dbs:
-        # SNR in linear scale
-        snr_lin = 10 ** (snr_db / 10)
-        no = tf.constant(1.0 / snr_lin, dtype=tf.float32)
-        num_symbols = num_bits // bits_per_symbol
-
-        # Generate random QPSK symbols
-        idx = tf.random.uniform([num_symbols], 0, 4, dtype=tf.int32)
-        tx = tf.gather(const_points, idx)  # shape [num_symbols]
-
-        tx = tf.tile(tx[:, None], [1, num_tx_ant])  # [num_symbols, num_tx_ant]
+    if detector != "mrc" and method != "analytic":
+        predicted = [None] * len(snr_dbs)
+        budgets = [num_bits] * len(snr_dbs)
+        if method == "hybrid" and int(num_tx_ant) == 1:
+            # With one transmit antenna every detector reduces to MRC
+            predicted = [analytic_ber.ber_rayleigh("qam", bits_per_symbol, snr_db, int(num_rx_ant)) for snr_db in snr_dbs]
+            budgets = [0 if _beyond_budget(p, _HYBRID_TARGET_ERRORS, num_bits)
+                       else analytic_ber.required_bits(p, _HYBRID_TARGET_ERRORS, 1, num_bits) for p in predicted]
+        save = None
+        if resume:
+            save = lambda errors, bits: store.put(store_config, {
+                snr_db: ([errors[i], 0, 0], bits[i]) for i, snr_db in enumerate(snr_dbs)})
+        all_stats = _detector_stats(engine, seeds, detector, int(num_tx_ant), int(num_rx_ant), snr_dbs, budgets,
+                                    chunk_symbols, [(int(stored[snr_db][0][0]), stored[snr_db][1]) for snr_db in snr_dbs],
+                                    save)
+        for snr_db, stats, point_predicted, budget in zip(snr_dbs, all_stats, predicted, budgets):
+            if budget == 0:
+                stats = {"ber": point_predicted, "method": "analytic"}
+            if point_predicted is not None:
+                stats["predicted_ber"] = point_predicted
+            if resume:
+                stats["resumed_bits"] = int(stored[snr_db][1])
+            ber_dict[snr_db] = stats["ber"]
+            stats_dict[snr_db] = stats
+        if return_stats:
+            return {"ber": ber_dict, "stats": stats_dict}
+        return ber_dict
 
-        # Rayleigh fading channel
-        h_real = tf.random.normal([num_symbols, num_rx_ant, num_tx_ant], dtype=tf.float32)
-        h_imag = tf.random.normal([num_symbols, num_rx_ant, num_tx_ant], dtype=tf.float32)
-        h = tf.complex(h_real, h_imag) / tf.cast(tf.sqrt(2.0), tf.complex64)
-
-        noise_real = tf.random.normal([num_symbols, num_rx_ant], dtype=tf.float32)
-        noise_imag = tf.random.normal([num_symbols, num_rx_ant], dtype=tf.float32)
-        noise = tf.complex(noise_real, noise_imag) * tf.cast(tf.sqrt(no / 2), tf.complex64)
-
-        tx = tf.reshape(tx, [num_symbols, num_tx_ant])
-        y = tf.squeeze(tf.matmul(h, tx[:, :, None]), axis=-1) + noise
-
-        # Maximal Ratio Combining (MRC)
-        h_total = h[:, :, 0]  # [num_symbols, num_rx_ant]
-        h_power = tf.reduce_sum(tf.abs(h_total)**2, axis=1, keepdims=True)  # Total channel power
-        h_conj = tf.math.conj(h_total)
-        # MRC: sum weighted by conjugate channel, then normalize by total power
-        combined = tf.reduce_sum(h_conj * y, axis=1) / tf.cast(tf.squeeze(h_power), tf.complex64)
-
-        # Hard decision (QPSK)
-        rx_bits_i = tf.cast(tf.math.real(combined) < 0, tf.int32)
-        rx_bits_q = tf.cast(tf.math.imag(combined) < 0, tf.int32)
-        rx_bits = tf.reshape(tf.stack([rx_bits_i, rx_bits_q], axis=1), [-1])
-
-        # Original bits
-        tx_bits = tf.reshape(tf.stack([(idx // 2) % 2, idx % 2], axis=1), [-1])
-
-        # Compute BER
-        bit_errors = tf.reduce_sum(tf.cast(rx_bits != tx_bits, tf.float32))
-        ber = bit_errors / tf.cast(num_bits, tf.float32)
-        ber_dict[snr_db] = ber.numpy()
+    for snr_db in snr_dbs:
+        predicted = None
+        if method != "montecarlo" and int(num_tx_ant) == 1:
+            predicted = analytic_ber.ber_rayleigh("qam", bits_per_symbol, snr_db, int(num_rx_ant))
+        if method == "analytic" or (predicted is not None and not importance_sampling
+                                    and _beyond_budget(predicted, _HYBRID_TARGET_ERRORS, num_bits)):
+            ber_dict[snr_db] = predicted
+            stats_dict[snr_db] = {"ber": predicted, "method": "analytic"}
+            if method == "hybrid":
+                stats_dict[snr_db]["predicted_ber"] = predicted
+            continue
+        point_bits = num_bits
+        if predicted is not None:
+            # Power-of-two symbol counts keep the number of compiled shapes small
+            needed = analytic_ber.required_bits(predicted, _HYBRID_TARGET_ERRORS, 1, num_bits)
+            point_bits = min(num_bits, 2 ** math.ceil(math.log2(max(1, needed // bits_per_symbol))) * bits_per_symbol)
+        acc, resumed_bits = stored[snr_db]
+        acc = acc.copy()
+        point_symbols = max(0, point_bits - resumed_bits) // bits_per_symbol
+        chunk = mimo_chunk_symbols(point_symbols, int(num_rx_ant), int(num_tx_ant), chunk_symbols)
+        kernel = engine.mimo_kernel(chunk, int(num_rx_ant), int(num_tx_ant), bool(importance_sampling))
+        # Noise standard deviation for unit-energy symbols
+        sigma = math.sqrt(1.0 / 10 ** (snr_db / 10))
+        fade_scale = noise_scale = 1.0
+        if importance_sampling:
+            # Each extra branch adds a factor |h|^2 to the fade density, which
+            # the inflated noise along the combining direction compensates.
+            fade_scale = _is_bias("qam", bits_per_symbol, snr_db)[1]
+            noise_scale = 1 + (int(num_rx_ant) - 1) / 2
+        spent_bits = resumed_bits
+        for start in range(0, point_symbols, chunk):
+            num_valid = min(chunk, point_symbols - start)
+            acc[:3 if importance_sampling else 1] += kernel(sigma, fade_scale, noise_scale, num_valid, next(seeds))
+            spent_bits += num_valid * bits_per_symbol
+            if resume:
+                store.put(store_config, {snr_db: (acc, spent_bits)})
+        if importance_sampling:
+            stats = _is_point_stats(acc[0], acc[1], acc[2], spent_bits, bits_per_symbol, 0.95)
+        else:
+            stats = _point_stats(int(acc[0]), spent_bits, 0.95)
+        if predicted is not None:
+            stats["predicted_ber"] = predicted
+        if resume:
+            stats["resumed_bits"] = int(resumed_bits)
+        ber_dict[snr_db] = stats["ber"]
+        stats_dict[snr_db] = stats
 
+    if return_stats:
+        return {"ber": ber_dict, "stats": stats_dict}
     return ber_dict
 
-def compare_mimo_performance(siso_config=[1,1], mimo_config=[2,2], num_bits=100000):
+def compare_mimo_performance(siso_config=[1,1], mimo_config=[2,2], num_bits=100000, seed=None, importance_sampling=False,
+                             method="montecarlo", backend=None, num_workers=None, chunk_symbols=None,
+                             detector="mrc", resume=False):
     """
     Compare SISO vs MIMO performance by running both simulations.
     Args:
         siso_config: [num_tx_ant, num_rx_ant] for SISO (default [1,1])
         mimo_config: [num_tx_ant, num_rx_ant] for MIMO (default [2,2])
         num_bits: total bits to transmit
+        seed: optional seed; each configuration draws from its own stream derived from it
+        importance_sampling: use the importance-sampling estimator
+        method: BER method passed to simulate_ber_mimo
+        backend: "tensorflow" or "numpy" simulation kernels
+        num_workers: processes to run the two configurations on
+            (default SIONNA_TOOLS_WORKERS, else 1)
+        chunk_symbols: symbols per simulation chunk, bounds memory per worker
+        detector: MIMO detector passed to simulate_ber_mimo
+        resume: extend the stored counts of each configuration instead of
+            starting over (see simulate_ber_mimo)
     Returns:
         dict with both results and labels
     """
-    siso_ber = simulate_ber_mimo(num_tx_ant=siso_config[0], num_rx_ant=siso_config[1], num_bits=num_bits)
-    mimo_ber = simulate_ber_mimo(num_tx_ant=mimo_config[0], num_rx_ant=mimo_config[1], num_bits=num_bits)
+    configs = [("siso", siso_config), ("mimo", mimo_config)]
+    tasks = [
+        dict(num_tx_ant=config[0], num_rx_ant=config[1], num_bits=num_bits, seed=task_seed,
+             importance_sampling=importance_sampling, return_stats=True, method=method, backend=backend,
+             chunk_symbols=chunk_symbols, detector=detector, resume=resume)
+        for (_, config), task_seed in zip(configs, _task_seeds(seed, len(configs)))
+    ]
+    results = {}
+    for (name, config), sim in zip(configs, _map_tasks(simulate_ber_mimo, tasks, num_workers)):
+        results[name] = {"config": f"{config[0]}x{config[1]}", "ber": sim["ber"]}
+        if importance_sampling:
+            results[name]["variance"] = {snr: stats["variance"] for snr, stats in sim["stats"].items()}
     
-    return {
-        "siso": {"config": f"{siso_config[0]}x{siso_config[1]}", "ber": siso_ber},
-        "mimo": {"config": f"{mimo_config[0]}x{mimo_config[1]}", "ber": mimo_ber}
-    }
+    return results
 
-def sweep_tx_antennas(tx_antenna_list=[1,2,4,8], num_rx_ant=16, num_bits=200000):
+def sweep_tx_antennas(tx_antenna_list=[1,2,4,8], num_rx_ant=16, num_bits=200000, seed=None, importance_sampling=False,
+                      method="montecarlo", backend=None, num_workers=None, chunk_symbols=None,
+                      detector="mrc", resume=False):
     """
     Sweep through different transmit antenna configurations to find optimal setup.
     Args:
         tx_antenna_list: list of transmit antenna counts to test
         num_rx_ant: fixed number of receive antennas
         num_bits: total bits to transmit per configuration
+        seed: optional seed; each configuration draws from its own stream derived from it
+        importance_sampling: use the importance-sampling estimator
+        method: BER method passed to simulate_ber_mimo
+        backend: "tensorflow" or "numpy" simulation kernels
+        num_workers: processes to spread the configurations over
+            (default SIONNA_TOOLS_WORKERS, else 1)
+        chunk_symbols: symbols per simulation chunk, bounds memory per worker
+        detector: MIMO detector passed to simulate_ber_mimo
+        resume: extend the stored counts of each configuration instead of
+            starting over (see simulate_ber_mimo)
     Returns:
         dict with results for each configuration and best config at 10 dB
     """
     results = {}
+    tasks = [
+        dict(num_tx_ant=num_tx, num_rx_ant=num_rx_ant, num_bits=num_bits, seed=task_seed,
+             importance_sampling=importance_sampling, return_stats=True, method=method, backend=backend,
+             chunk_symbols=chunk_symbols, detector=detector, resume=resume)
+        for num_tx, task_seed in zip(tx_antenna_list, _task_seeds(seed, len(tx_antenna_list)))
+    ]
     
-    for num_tx in tx_antenna_list:
-        ber_dict = simulate_ber_mimo(num_tx_ant=num_tx, num_rx_ant=num_rx_ant, num_bits=num_bits)
+    for num_tx, sim in zip(tx_antenna_list, _map_tasks(simulate_ber_mimo, tasks, num_workers)):
         results[f"{num_tx}x{num_rx_ant}"] = {
             "num_tx_ant": num_tx,
             "num_rx_ant": num_rx_ant,
-            "ber": ber_dict
+            "ber": sim["ber"]
         }
+        if importance_sampling:
+            results[f"{num_tx}x{num_rx_ant}"]["variance"] = {snr: stats["variance"] for snr, stats in sim["stats"].items()}
     
     # Find best configuration at 10 dB
     best_config = None
@@ -94,7 +94,7 @@ class TaskDecomposer:
 
         task_type = decomposition.get("task_type")
         if task_type == "multi_tx_optimization":
-            lines.append("- TOOL: Use simulate_multi_radio_map with the transmitter list above.")
+            lines.append("- TOOL: Use optimize_tx_placement over an area covering the transmitter list above.")
             if "rx_position" in parameters:
                 lines.append(f"- RECEIVER_HINT: Use receiver position {parameters['rx_position']} unless user specifies otherwise.")
         elif task_type == "antenna_sweep":
@@ -205,6 +205,9 @@ class TaskDecomposer:
         elif task_type == "radiomap":
             instructions.append("Invoke `simulate_radio_map` with the provided TX/RX positions or reasonable defaults.")
             instructions.append("Explain the selected metric (RSS/path_gain/SINR) and highlight TX/RX markers.")
+            instructions.append("For values at specific positions or coverage percentages, call `query_radio_map` with the map's grid_key.")
+            instructions.append("If only metrics at given receiver positions are needed (path gain, SNR, delay spread) and no map, call `evaluate_links` instead.")
+            instructions.append("Use quality='preview' for quick looks and 'final' only when high fidelity is requested; progressive=true returns a first map immediately and refines it in the background.")
         elif task_type == "mimo_comparison":
             instructions.append("Use `compare_mimo_performance` to contrast SISO and MIMO BER trends.")
             instructions.append("Discuss how antenna counts influence diversity gain.")
@@ -213,10 +216,9 @@ class TaskDecomposer:
             instructions.append("Analyze BER performance across different antenna counts and identify the optimal configuration.")
             instructions.append("Explain the trade-off between antenna count and BER performance.")
         elif task_type == "multi_tx_optimization":
-            instructions.append("This is an optimization problem: propose several 4-transmitter layouts before running simulations.")
-            instructions.append("Call `simulate_multi_radio_map` with a list of transmitter coordinates (e.g., [[x1,y1,z1], ...]) and representative receiver/user points to evaluate SINR/coverage.")
-            instructions.append("If needed, run additional single-transmitter maps to gain intuition before refining the multi-TX layout.")
-            instructions.append("Summarize the trade-offs and recommend the configuration that maximizes average throughput/coverage.")
+            instructions.append("This is an optimization problem: call `optimize_tx_placement` with the service area [min_x, min_y, max_x, max_y], the number of transmitters and the objective (mean_sinr, coverage or throughput) instead of guessing layouts.")
+            instructions.append("Use `query_radio_map` with the result's grid_key to report mean SINR, percentiles and coverage of the chosen layout.")
+            instructions.append("Summarize the objective trace and trade-offs, and recommend the configuration that maximizes average throughput/coverage.")
         else:
             instructions.append("Provide a clear explanation or choose the most relevant simulation tool if one applies.")
         return instructions
@@ -14,6 +14,7 @@ from agent import SionnaAgent
 from utils.plotting import plot_constellation, plot_ber, plot_ber_mimo, plot_mimo_comparison, plot_antenna_sweep
 from PIL import Image
 import io
+import numpy as np
 
 
 class ChatInterface:
@@ -44,19 +45,14 @@ class ChatInterface:
                 
                 if tool_name == "simulate_constellation":
                     response += f"Generated {sim_result['modulation']} constellation\n"
-                    import numpy as np
-                    sim_result['constellation'] = np.array(
-                        [complex(x[0], x[1]) for x in sim_result['constellation']]
-                    )
-                    for snr in sim_result['snr_levels']:
-                        sim_result['snr_levels'][snr] = np.array(
-                            [complex(x[0], x[1]) for x in sim_result['snr_levels'][snr]]
-                        )
-                    fig = plot_constellation(sim_result)
-                    buf = io.BytesIO()
-                    fig.savefig(buf, format='png')
-                    buf.seek(0)
-                    plots.append(Image.open(buf))
+                    for snr, stats in sim_result.get("statistics", {}).items():
+                        response += f"SNR {snr} dB: EVM {stats['evm_rms_percent']:.2f}%, MER {stats['mer_db']:.2f} dB\n"
+                    if sim_result.get("snr_levels"):
+                        fig = plot_constellation(sim_result)
+                        buf = io.BytesIO()
+                        fig.savefig(buf, format='png')
+                        buf.seek(0)
+                        plots.append(Image.open(buf))
                 
                 elif tool_name == "simulate_ber":
                     response += f"Calculated BER for {sim_result['modulation']}\n"
@@ -69,19 +65,39 @@ class ChatInterface:
                 elif tool_name == "simulate_radio_map":
                     plot_path = sim_result.get("cwd_plot_path") or sim_result.get("plot_path") or sim_result.get("relative_plot_path")
                     response += f"Generated radio map: {plot_path}\n"
+                    if sim_result.get("refining"):
+                        response += f"Preview with {sim_result['samples_per_tx']:.0e} samples per transmitter; refining to {sim_result['target_samples_per_tx']:.0e} in the background\n"
                     if plot_path and os.path.exists(plot_path):
                         plots.append(Image.open(plot_path))
                 
                 elif tool_name == "simulate_multi_radio_map":
                     plot_path = sim_result.get("cwd_plot_path") or sim_result.get("plot_path") or sim_result.get("relative_plot_path")
                     response += f"Generated multi-transmitter radio map: {plot_path}\n"
+                    if sim_result.get("refining"):
+                        response += f"Preview with {sim_result['samples_per_tx']:.0e} samples per transmitter; refining to {sim_result['target_samples_per_tx']:.0e} in the background\n"
                     if plot_path and os.path.exists(plot_path):
                         plots.append(Image.open(plot_path))
                 
+                elif tool_name == "optimize_tx_placement":
+                    plot_path = sim_result.get("cwd_plot_path") or sim_result.get("plot_path") or sim_result.get("relative_plot_path")
+                    response += f"Optimized {len(sim_result['tx_positions'])}-transmitter layout ({sim_result['objective']} = {sim_result['objective_value']:.3f}): {sim_result['tx_positions']}\n"
+                    if sim_result.get("warning"):
+                        response += f"{sim_result['warning']}\n"
+                    if plot_path and os.path.exists(plot_path):
+                        plots.append(Image.open(plot_path))
+                
+                elif tool_name == "evaluate_links":
+                    links = sim_result["links"]
+                    snr = np.asarray(links["snr_db"], dtype=float)
+                    response += f"Evaluated {snr.size} links ({len(sim_result['tx_positions'])} TX, {len(sim_result['rx_positions'])} RX)\n"
+                    covered = snr[np.isfinite(snr)]
+                    if covered.size:
+                        response += f"SNR min/median/max: {covered.min():.1f} / {np.median(covered):.1f} / {covered.max():.1f} dB; {snr.size - covered.size} links without paths\n"
+                
                 elif tool_name == "simulate_ber_mimo":
                     config = f"{params.get('num_tx_ant', 1)}x{params.get('num_rx_ant', 1)}"
                     response += f"Calculated MIMO BER for {config} configuration\n"
-                    fig = plot_ber_mimo(sim_result, f"MIMO ({config})")
+                    fig = plot_ber_mimo(sim_result.get("ber", sim_result), f"MIMO ({config})")
                     buf = io.BytesIO()
                     fig.savefig(buf, format='png')
                     buf.seek(0)
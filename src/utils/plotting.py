@@ -25,22 +25,22 @@ def plot_constellation(result):
     plt.tight_layout()
     return fig
 
+def _sorted_snr_items(ber_dict):
+    """(SNR, value) pairs in SNR order; JSON keys like "10" or "13.75" become numbers"""
+    return sorted((float(k) if isinstance(k, str) else k, v) for k, v in ber_dict.items())
+
 def plot_ber(result):
     """Generate BER curve plot"""
-    snr_list = sorted([int(k) if isinstance(k, str) else k for k in result['ber'].keys()])
-    
     fig = plt.figure(figsize=(8, 6))
     for channel in ['awgn', 'rayleigh']:
         snr_vals = []
         ber_vals = []
-        for snr in snr_list:
-            # Try both integer and string keys
-            ber_data = result['ber'].get(snr) or result['ber'].get(str(snr))
+        for snr, ber_data in _sorted_snr_items(result['ber']):
             if ber_data:
                 ber = ber_data.get(channel)
                 if ber is not None:
                     snr_vals.append(snr)
-                    ber_vals.append(max(ber, 1e-6))
+                    ber_vals.append(ber if ber > 0 else 1e-6)
         if ber_vals:
             plt.semilogy(snr_vals, ber_vals, 'o-', label=channel.upper())
     
@@ -55,8 +55,7 @@ def plot_ber(result):
 def plot_ber_mimo(ber_dict, config_label):
     """Generate BER plot for MIMO simulation"""
     fig = plt.figure(figsize=(8, 6))
-    snr_vals = sorted([int(k) if isinstance(k, str) else k for k in ber_dict.keys()])
-    ber_vals = [ber_dict[snr] if snr in ber_dict else ber_dict[str(snr)] for snr in snr_vals]
+    snr_vals, ber_vals = zip(*_sorted_snr_items(ber_dict))
     plt.semilogy(snr_vals, ber_vals, 'o-', label=config_label)
     plt.xlabel("SNR (dB)")
     plt.ylabel("BER")
@@ -0,0 +1,22 @@
+"""Shared test setup: the flat ``src`` modules on the path and the NumPy backend.
+
+TensorFlow and Sionna are not needed; every simulation runs on the NumPy
+kernels, and the sample store writes to a per-test directory.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SIONNA_TOOLS_BACKEND", "numpy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import sample_store  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Sample store used by ``resume`` runs, isolated under ``tmp_path``"""
+    samples = sample_store.SampleStore(str(tmp_path / "samples"))
+    monkeypatch.setattr(sample_store, "_DEFAULT_STORE", samples)
+    return samples
@@ -0,0 +1,49 @@
+"""NumPy simulation kernels."""
+import numpy as np
+import pytest
+
+import backends
+
+numpy_backend = backends.get_backend("numpy")
+
+
+def test_backend_names():
+    assert backends.backend_name("tf") == "tensorflow"
+    with pytest.raises(ValueError):
+        backends.backend_name("jax")
+
+
+@pytest.mark.parametrize("modulation, bits_per_symbol", [("qam", 2), ("qam", 4), ("pam", 2)])
+def test_constellations_have_unit_energy(modulation, bits_per_symbol):
+    points = numpy_backend.constellation_points(modulation, bits_per_symbol)
+    assert len(points) == 2 ** bits_per_symbol
+    assert np.mean(np.abs(points) ** 2) == pytest.approx(1.0)
+
+
+def test_ber_kernel_masks_invalid_tail():
+    kernel = numpy_backend.ber_kernel("qam", 2, 1000, 2, ("awgn",))
+    seeds = numpy_backend.seed_stream(1)
+    # Hopeless SNR: every valid symbol carries errors, the masked tail none
+    errors = kernel(np.array([10.0, 10.0]), 10, next(seeds))
+    assert errors.shape == (1, 2)
+    assert (errors <= 20).all() and (errors > 0).all()
+
+
+def test_seed_stream_is_reproducible():
+    kernel = numpy_backend.ber_kernel("qam", 2, 1000, 1, ("awgn", "rayleigh"))
+    first = kernel(np.array([0.5]), 1000, next(numpy_backend.seed_stream(3)))
+    second = kernel(np.array([0.5]), 1000, next(numpy_backend.seed_stream(3)))
+    np.testing.assert_array_equal(first, second)
+
+
+def test_mimo_chunk_symbols_bounds_elements():
+    assert backends.mimo_chunk_symbols(100, 4, 4) == 100
+    chunk = backends.mimo_chunk_symbols(1 << 30, 4, 4)
+    assert chunk * 16 <= backends.MIMO_CHUNK_ELEMENTS
+    assert backends.mimo_chunk_symbols(1 << 30, 4, 4, detector="ml", num_snr=11) * 11 * 4 ** 4 \
+        <= backends.MIMO_CHUNK_ELEMENTS
+
+
+def test_is_log_scale_is_unit_without_bias():
+    assert backends.is_log_scale(1.0) == 0.0
+    assert backends.is_log_scale(1000.0) < 0.0
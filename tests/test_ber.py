@@ -0,0 +1,160 @@
+"""BER estimators of ``sionna_tools`` on the NumPy backend."""
+import math
+
+import numpy as np
+import pytest
+
+import analytic_ber
+import sionna_tools
+
+
+def test_wilson_interval_brackets_estimate():
+    low, high = sionna_tools._wilson_interval(50, 10000)
+    assert isinstance(low, float) and isinstance(high, float)
+    assert low < 50 / 10000 < high
+
+
+def test_point_stats_without_errors():
+    stats = sionna_tools._point_stats(0, 10000, 0.95)
+    assert stats["ber"] == 0.0
+    assert stats["ci_low"] == 0.0
+    assert 0.0 < stats["ci_high"] < 1e-3
+
+
+def test_analytic_matches_closed_form():
+    results = sionna_tools.simulate_ber(snr_db_list=[0, 10], method="analytic")
+    assert results["ber"][10]["awgn"] == pytest.approx(analytic_ber.ber_awgn("qam", 2, 10))
+    assert results["stats"][0]["rayleigh"]["method"] == "analytic"
+
+
+def test_montecarlo_matches_closed_form():
+    results = sionna_tools.simulate_ber(snr_db_list=[0, 4], num_bits=200000, seed=1)
+    for snr in (0, 4):
+        for ch in ("awgn", "rayleigh"):
+            stats = results["stats"][snr][ch]
+            assert stats["num_bits"] == 200000
+            expected = analytic_ber.predict_ber(ch, "qam", 2, snr)
+            assert stats["ci_low"] <= expected <= stats["ci_high"]
+
+
+def test_seed_is_reproducible():
+    first = sionna_tools.simulate_ber(snr_db_list=[2], num_bits=20000, seed=7)
+    second = sionna_tools.simulate_ber(snr_db_list=[2], num_bits=20000, seed=7)
+    assert first["ber"] == second["ber"]
+
+
+def test_early_stopping_on_target_errors():
+    results = sionna_tools.simulate_ber(snr_db_list=[0, 8], channels=["awgn"], target_errors=100,
+                                        max_bits=1000000, batch_bits=10000, seed=3)
+    low, high = results["stats"][0]["awgn"], results["stats"][8]["awgn"]
+    assert low["bit_errors"] >= 100 and low["num_bits"] < high["num_bits"]
+    assert high["num_bits"] <= 1000000
+
+
+def test_early_stopping_on_ci_width():
+    results = sionna_tools.simulate_ber(snr_db_list=[0], channels=["awgn"], target_ci_width=0.5,
+                                        max_bits=1000000, batch_bits=10000, seed=3)
+    stats = results["stats"][0]["awgn"]
+    assert (stats["ci_high"] - stats["ci_low"]) / stats["ber"] <= 0.5
+    assert stats["num_bits"] < 1000000
+
+
+def test_hybrid_reports_unreachable_points_analytically():
+    results = sionna_tools.simulate_ber(snr_db_list=[0, 20], channels=["awgn"], num_bits=100000,
+                                        method="hybrid", seed=2)
+    assert results["stats"][20]["awgn"]["method"] == "analytic"
+    simulated = results["stats"][0]["awgn"]
+    assert "method" not in simulated and simulated["num_bits"] <= 100000
+    assert simulated["predicted_ber"] == pytest.approx(analytic_ber.ber_awgn("qam", 2, 0))
+
+
+@pytest.mark.parametrize("channel", ["awgn", "rayleigh"])
+def test_importance_sampling_resolves_small_ber(channel):
+    snr = 12 if channel == "awgn" else 40
+    results = sionna_tools.simulate_ber(snr_db_list=[snr], channels=[channel], num_bits=20000,
+                                        importance_sampling=True, seed=5)
+    stats = results["stats"][snr][channel]
+    expected = analytic_ber.predict_ber(channel, "qam", 2, snr)
+    assert expected * 20000 < 1
+    assert stats["ber"] == pytest.approx(expected, rel=0.3)
+    assert stats["ci_low"] < stats["ber"] < stats["ci_high"]
+    assert stats["variance"] > 0
+
+
+def test_importance_sampling_at_very_high_snr():
+    stats = sionna_tools.simulate_ber(snr_db_list=[30], channels=["awgn"], num_bits=100000,
+                                      importance_sampling=True, seed=5)["stats"][30]["awgn"]
+    # The weights of a BER near 1e-219 must neither underflow nor give a zero-width interval
+    expected = analytic_ber.ber_awgn("qam", 2, 30)
+    assert math.log10(stats["ber"]) == pytest.approx(math.log10(expected), abs=1)
+    assert stats["ci_low"] < stats["ber"] < stats["ci_high"]
+
+
+def test_resume_extends_stored_counts(store):
+    options = dict(snr_db_list=[0, 2], channels=["awgn"], seed=4, resume=True)
+    sionna_tools.simulate_ber(num_bits=40000, **options)
+    results = sionna_tools.simulate_ber(num_bits=100000, **options)
+    for snr in (0, 2):
+        stats = results["stats"][snr]["awgn"]
+        assert stats["resumed_bits"] == 40000
+        assert stats["num_bits"] == 100000
+    repeated = sionna_tools.simulate_ber(num_bits=100000, **options)
+    assert repeated["ber"] == results["ber"]
+
+
+def test_mimo_mrc_matches_closed_form():
+    stats = sionna_tools.simulate_ber_mimo(1, 2, num_bits=200000, snr_db_list=[0, 4], seed=6,
+                                           backend="numpy", return_stats=True)["stats"]
+    for snr in (0, 4):
+        expected = analytic_ber.ber_rayleigh("qam", 2, snr, 2)
+        assert stats[snr]["ci_low"] <= expected <= stats[snr]["ci_high"]
+
+
+@pytest.mark.parametrize("detector", ["zf", "mmse", "ml"])
+def test_mimo_detectors_agree_with_single_stream(detector):
+    # With one transmit antenna every detector reduces to MRC
+    stats = sionna_tools.simulate_ber_mimo(1, 2, num_bits=100000, snr_db_list=[2], seed=6, detector=detector,
+                                           return_stats=True)["stats"][2]
+    assert stats["num_bits"] == 100000
+    assert stats["ci_low"] <= analytic_ber.ber_rayleigh("qam", 2, 2, 2) <= stats["ci_high"]
+
+
+def test_adaptive_snr_stops_below_floor():
+    results = sionna_tools.simulate_ber(channels=["awgn"], method="analytic", adaptive_snr=True,
+                                        snr_range=[-5, 30], ber_floor=1e-6)
+    snrs = sorted(results["ber"])
+    assert snrs[0] == -5 and snrs[-1] < 30
+    assert results["ber"][snrs[-1]]["awgn"] < 1e-6
+    assert np.all(np.diff(snrs) > 0)
+
+
+def test_mimo_detector_hybrid_keeps_point_budgets():
+    stats = sionna_tools.simulate_ber_mimo(1, 2, num_bits=100000, detector="zf", method="hybrid", seed=6,
+                                           return_stats=True)["stats"]
+    simulated = [point for point in stats.values() if "num_bits" in point]
+    assert simulated
+    for point in simulated:
+        budget = analytic_ber.required_bits(point["predicted_ber"], 100, 1, 100000)
+        assert budget - 4 < point["num_bits"] <= budget
+
+
+@pytest.mark.parametrize("detector", ["zf", "mmse", "ml"])
+def test_mimo_detector_resume_stops_at_budget(store, detector):
+    options = dict(num_tx_ant=2, num_rx_ant=2, detector=detector, seed=8, resume=True, return_stats=True)
+    sionna_tools.simulate_ber_mimo(num_bits=100000, snr_db_list=[0, 4], **options)
+    # The new point at 2 dB needs the full budget, the stored ones only the other half
+    stats = sionna_tools.simulate_ber_mimo(num_bits=200000, snr_db_list=[0, 2, 4], **options)["stats"]
+    config = {"tool": "simulate_ber_mimo", "num_tx_ant": 2, "num_rx_ant": 2, "detector": detector,
+              "importance_sampling": False}
+    for snr in (0, 2, 4):
+        assert stats[snr]["num_bits"] == 200000
+        assert store.get(config, snr)[1] == 200000
+    assert stats[0]["resumed_bits"] == 100000 and stats[2]["resumed_bits"] == 0
+
+
+def test_adaptive_snr_refines_montecarlo_waterfall():
+    results = sionna_tools.simulate_ber(snr_db_list=[-5, 15], num_bits=100000, adaptive_snr=True, seed=1)
+    snrs = sorted(results["ber"])
+    coarse = [-5, -1, 3, 7, 11, 15]
+    assert set(coarse) <= set(snrs)
+    assert [snr for snr in snrs if snr not in coarse and 3 < snr < 11]
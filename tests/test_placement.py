@@ -0,0 +1,58 @@
+"""Greedy and swap search of ``placement.PlacementSearch``."""
+import numpy as np
+import pytest
+
+import placement
+
+
+def _disjoint_rss(num_sites, cells_per_site=4, power=1.0):
+    """Each site covers its own block of cells and nothing else"""
+    rss = np.zeros((num_sites, num_sites * cells_per_site), dtype=np.float32)
+    for site in range(num_sites):
+        rss[site, site * cells_per_site:(site + 1) * cells_per_site] = power
+    return rss
+
+
+def test_unknown_objective():
+    with pytest.raises(ValueError):
+        placement.PlacementSearch(_disjoint_rss(2), 1e-3, "capacity")
+
+
+def test_greedy_adds_best_sites():
+    rss = _disjoint_rss(3)
+    rss[1] *= 2
+    search = placement.PlacementSearch(rss, 1e-3, "throughput")
+    sites, trace = search.greedy(2)
+    assert sites[0] == 1 and len(sites) == 2
+    assert [step["move"] for step in trace] == ["add", "add"]
+    assert search.score(sites) == pytest.approx(trace[-1]["objective"])
+
+
+def test_greedy_stops_when_a_site_lowers_the_objective():
+    # Both sites cover the same cells, so the second only adds interference
+    rss = np.ones((2, 4), dtype=np.float32)
+    search = placement.PlacementSearch(rss, 1e-3, "coverage", threshold_db=10.0)
+    sites, trace = search.greedy(2)
+    assert len(sites) == 1
+    assert trace[-1]["move"] == "stop" and trace[-1]["objective"] < search.score(sites)
+
+
+def test_local_search_swaps_in_better_site():
+    rss = _disjoint_rss(3)
+    rss[2] *= 0.5
+    search = placement.PlacementSearch(rss, 1e-3, "mean_sinr")
+    sites, trace = search.local_search([2])
+    assert sites in ([0], [1])
+    assert trace[0]["move"] == "swap" and trace[0]["removed"] == 2
+
+
+def test_cell_stride():
+    assert placement.cell_stride([10, 10], 1000) == 1
+    assert placement.cell_stride([100, 100], 100) == 10
+
+
+def test_local_search_with_every_candidate_placed():
+    search = placement.PlacementSearch(_disjoint_rss(3), 1e-3, "coverage")
+    sites, trace = search.greedy(3)
+    assert sorted(sites) == [0, 1, 2]
+    assert search.local_search(sites) == (sites, [])
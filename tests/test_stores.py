@@ -0,0 +1,106 @@
+"""Result cache, sample store, artifact store and array codec."""
+import os
+
+import numpy as np
+
+import array_codec
+import artifact_store
+import result_cache
+import sample_store
+
+
+def test_cache_key_normalizes_arguments():
+    version = "v1"
+    key = result_cache.cache_key("simulate_ber", {"snr_db_list": [0, 15.0], "seed": 1}, version)
+    assert key == result_cache.cache_key("simulate_ber", {"seed": 1, "snr_db_list": (0, 15)}, version)
+    assert key != result_cache.cache_key("simulate_ber", {"seed": 1, "snr_db_list": [0, 15]}, "v2")
+
+
+def test_code_version_tracks_file_contents(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("a = 1\n")
+    before = result_cache.code_version([str(path)])
+    path.write_text("a = 2\n")
+    assert result_cache.code_version([str(path)]) != before
+
+
+def test_result_cache_promotes_disk_hits(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path), memory_entries=1)
+    cache.put("a", {"ber": 1})
+    cache.put("b", {"ber": 2})
+    assert cache.get("a") == {"ber": 1}
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1 and stats["misses"] == 1 and stats["memory_evictions"] >= 1
+
+
+def test_result_cache_evicts_least_recently_used_files(tmp_path):
+    cache = result_cache.ResultCache(str(tmp_path), memory_entries=0, disk_bytes=0)
+    cache.put("a", {"x": "y" * 100})
+    cache.put("b", {"x": "y" * 100})
+    assert cache.get("a") is None
+    assert cache.stats()["disk_evictions"] >= 1
+
+
+def test_sample_store_round_trip(tmp_path):
+    store = sample_store.SampleStore(str(tmp_path))
+    config = {"tool": "simulate_ber", "channel": "awgn"}
+    assert store.get(config, 0) == ([0.0, 0.0, 0.0], 0)
+    store.put(config, {0: ([5, 0, 0], 1000), 2.5: ([1, 0, 0], 2000)})
+    store.put(config, {0: ([7, 0, 0], 3000)})
+    assert store.get(config, 0) == ([7.0, 0.0, 0.0], 3000)
+    assert store.get(config, 2.5) == ([1.0, 0.0, 0.0], 2000)
+    assert store.get({"tool": "simulate_ber", "channel": "rayleigh"}, 0)[1] == 0
+
+
+def test_sample_store_keeps_latest_configuration_over_quota(tmp_path):
+    store = sample_store.SampleStore(str(tmp_path), max_bytes=1)
+    store.put({"channel": "awgn"}, {0: ([1, 0, 0], 10)})
+    store.put({"channel": "rayleigh"}, {0: ([2, 0, 0], 20)})
+    assert store.get({"channel": "awgn"}, 0)[1] == 0
+    assert store.get({"channel": "rayleigh"}, 0) == ([2.0, 0.0, 0.0], 20)
+    assert store.stats()["evictions"] == 1
+
+
+def _write(text):
+    def write(path):
+        with open(path, "w") as f:
+            f.write(text)
+    return write
+
+
+def test_artifact_store_put_get_touch(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path))
+    key = artifact_store.artifact_key("radiomap", {"metric": "sinr"})
+    assert store.get(key) is None
+    path = store.put("radiomap", key, _write("plot"), {"metric": "sinr"})
+    assert os.path.isabs(path) and open(path).read() == "plot"
+    assert store.get(key)["params"] == {"metric": "sinr"}
+    assert store.touch(path)
+    assert not store.touch(os.path.join(str(tmp_path), "radiomap", "other.png"))
+
+
+def test_artifact_store_evicts_to_quota(tmp_path):
+    store = artifact_store.ArtifactStore(str(tmp_path), max_bytes=150)
+    first = store.put("radiomap", "a", _write("x" * 100), {})
+    store.put("radiomap", "b", _write("x" * 100), {})
+    assert not os.path.exists(first) and store.get("a") is None
+    assert store.get("b") is not None and store.stats()["evictions"] == 1
+
+
+def test_array_codec_round_trip():
+    array = (np.arange(6) + 1j * np.arange(6)).reshape(2, 3)
+    for compress in (False, True):
+        encoded = array_codec.encode_array(array, compress)
+        assert array_codec.is_encoded(encoded)
+        decoded = array_codec.decode_array(encoded)
+        assert decoded.dtype == np.complex64
+        np.testing.assert_array_equal(decoded, array)
+
+
+def test_array_codec_formats():
+    document = {"samples": array_codec.encode_array(np.array([1 + 2j, 3 - 4j])), "label": "x"}
+    assert array_codec.format_arrays(document, "lists") == {"samples": [[1.0, 2.0], [3.0, -4.0]], "label": "x"}
+    zipped = array_codec.format_arrays(document, "zlib")
+    assert zipped["samples"]["__ndarray__"]["encoding"] == "base64+zlib"
+    np.testing.assert_array_equal(array_codec.decode_arrays(zipped)["samples"], [1 + 2j, 3 - 4j])